@@ -0,0 +1,20 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from fastapi.testclient import TestClient
+
+from src.main import app, quantum
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Cliente de prueba compartido; el lifespan arranca el pool de entropía en segundo plano."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def bit_engine():
+    """Motor de bits sin pool, para medir el coste real del simulador."""
+    return quantum.engine
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Load generator for the quantum random number API.
+
+Fires concurrent requests at `/api/v1/random` (or the batch endpoint) for a
+fixed duration and prints a JSON summary with throughput and latency
+percentiles, so results can be stored and compared across releases.
+
+By default the app runs in process; pass --url to target a running server:
+
+    python benchmarks/load.py --concurrency 32 --duration 10
+    python benchmarks/load.py --url http://localhost:8002 --batch 100 --output results.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+# Make `src` importable when running from the benchmarks directory or the service root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def worker(client: httpx.AsyncClient, path: str, payload, deadline: float, latencies: List[float], errors: Dict[str, int]):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.post(path, json=payload)
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+        except httpx.HTTPError as exc:
+            errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+
+
+@contextlib.asynccontextmanager
+async def open_client(url: str):
+    if url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+            yield client
+        return
+
+    from src.main import app
+
+    # Run the app's lifespan so the entropy pool worker is active, as in production
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            yield client
+
+
+async def run(args) -> Dict:
+    from src.sampling import combination_bits, expected_bits
+
+    spec = {
+        "min_value": args.min_value,
+        "max_value": args.max_value,
+        "count": args.count,
+        "unique": args.unique,
+        "algorithm": args.algorithm,
+    }
+    if args.batch:
+        path, payload, draws_per_request = "/api/v1/random/batch", [spec] * args.batch, args.batch
+    else:
+        path, payload, draws_per_request = "/api/v1/random", spec, 1
+
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    async with open_client(args.url) as client:
+        # Warm up connections, caches and the entropy pool
+        await client.post(path, json=payload)
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            worker(client, path, payload, deadline, latencies, errors) for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    draws = len(latencies) * draws_per_request
+    if args.algorithm == "combination":
+        bits_per_draw = combination_bits(args.min_value, args.max_value, args.count)
+    else:
+        bits_per_draw = expected_bits(args.min_value, args.max_value, args.count, args.unique)
+    return {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "target": args.url or "in-process",
+        "seed": args.seed,
+        "endpoint": path,
+        "spec": spec,
+        "batch": args.batch,
+        "concurrency": args.concurrency,
+        "duration_seconds": round(elapsed, 3),
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 2),
+        "draws_per_second": round(draws / elapsed, 2),
+        "numbers_per_second": round(draws * args.count / elapsed, 2),
+        "estimated_bits_per_second": round(draws * bits_per_draw / elapsed, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p90": round(percentile(latencies, 0.90) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the quantum random number API")
+    parser.add_argument("--url", default="", help="Base URL of a running server (default: run the app in process)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument("--min-value", type=int, default=1)
+    parser.add_argument("--max-value", type=int, default=90)
+    parser.add_argument("--count", type=int, default=6)
+    parser.add_argument("--repeat", dest="unique", action="store_false", help="Allow repeated numbers")
+    parser.add_argument("--algorithm", choices=("sequential", "combination"), default="sequential")
+    parser.add_argument("--batch", type=int, default=0, help="Send N draws per request to the batch endpoint")
+    parser.add_argument("--seed", type=int, help="Seed the in-process simulator for reproducible runs")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+    if args.seed is not None:
+        # Read by the service settings when the app is imported
+        os.environ["QUANTUM_SIMULATOR_SEED"] = str(args.seed)
+
+    results = asyncio.run(run(args))
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
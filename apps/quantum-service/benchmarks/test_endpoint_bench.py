@@ -0,0 +1,25 @@
+"""
+Benchmarks for the HTTP endpoints, in process through TestClient.
+"""
+
+LOTTERY_DRAW = {"min_value": 1, "max_value": 90, "count": 6, "unique": True}
+
+
+def test_bench_random_endpoint(benchmark, client):
+    """Round-trip latency of a 6-of-90 draw."""
+    response = benchmark(client.post, "/api/v1/random", json=LOTTERY_DRAW)
+    assert response.status_code == 200
+
+
+def test_bench_batch_endpoint(benchmark, client):
+    """Round-trip latency of 100 draws in one batch."""
+    benchmark.extra_info["draws_per_round"] = 100
+    response = benchmark(client.post, "/api/v1/random/batch", json=[LOTTERY_DRAW] * 100)
+    assert response.status_code == 200
+
+
+def test_bench_bytes_endpoint(benchmark, client):
+    """Round-trip latency of 1 MiB of raw entropy."""
+    benchmark.extra_info["bits_per_round"] = 8 * 1024 * 1024
+    response = benchmark(client.get, "/api/v1/random/bytes", params={"length": 1024 * 1024})
+    assert len(response.content) == 1024 * 1024
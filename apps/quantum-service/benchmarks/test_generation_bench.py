@@ -0,0 +1,62 @@
+"""
+Benchmarks for the bit generation and sampling hot paths.
+
+Run with:
+    python -m pytest benchmarks --benchmark-json=benchmark-results.json
+"""
+
+import pytest
+
+from src.main import (
+    RandomNumberRequest,
+    draw_numbers,
+    generate_quantum_random_bit,
+    generate_quantum_random_number,
+)
+
+# (min_value, max_value) pairs from a small lottery up to a 48-bit range
+RANGES = [(1, 90), (1, 10_000), (0, 2 ** 48)]
+COUNTS = [6, 1_000, 100_000]
+
+
+def test_bench_engine_bytes(benchmark, bit_engine):
+    """Throughput of one simulator job producing 64 KiB."""
+    num_bytes = 64 * 1024
+    benchmark.extra_info["bits_per_round"] = num_bytes * 8
+    result = benchmark(bit_engine.generate_bytes, num_bytes)
+    assert len(result) == num_bytes
+
+
+def test_bench_random_bit(benchmark):
+    """Latency of a single bit through the entropy pool."""
+    benchmark.extra_info["bits_per_round"] = 1
+    assert benchmark(generate_quantum_random_bit) in (0, 1)
+
+
+def test_bench_random_number(benchmark):
+    """Latency of a single number in a lottery-sized range."""
+    number = benchmark(generate_quantum_random_number, 1, 90)
+    assert 1 <= number <= 90
+
+
+@pytest.mark.parametrize("unique", [False, True], ids=["repeat", "unique"])
+@pytest.mark.parametrize("count", COUNTS)
+@pytest.mark.parametrize("value_range", RANGES, ids=lambda r: f"range{r[1] - r[0] + 1}")
+def test_bench_draw(benchmark, value_range, count, unique):
+    """Draw throughput across range sizes, counts and uniqueness."""
+    min_value, max_value = value_range
+    if unique and count > max_value - min_value + 1:
+        pytest.skip("more unique numbers than the range holds")
+    request = RandomNumberRequest(min_value=min_value, max_value=max_value, count=count, unique=unique)
+    benchmark.extra_info["numbers_per_round"] = count
+    numbers, _ = benchmark(draw_numbers, request)
+    assert len(numbers) == count
+
+
+@pytest.mark.parametrize("algorithm", ["sequential", "combination"])
+def test_bench_lottery_ticket(benchmark, algorithm):
+    """One 6-of-90 ticket, drawn number by number or as a single combination rank."""
+    request = RandomNumberRequest(min_value=1, max_value=90, count=6, unique=True, algorithm=algorithm)
+    benchmark.extra_info["numbers_per_round"] = 6
+    numbers, _ = benchmark(draw_numbers, request)
+    assert len(set(numbers)) == 6
@@ -2,36 +2,28 @@ import httpx
 import time
 import json
 
-def test_random_number_api():
+from quantum_client import QuantumClient, QuantumServiceError
+
+BASE_URL = "http://localhost:8000"
+
+def test_random_number_api(client: QuantumClient):
     """Test the random number API endpoint."""
-    url = "http://localhost:8000/api/v1/random"
-    payload = {
-        "min_value": 1,
-        "max_value": 90,
-        "count": 6,
-        "unique": True
-    }
-    
     try:
-        print(f"Calling POST {url} with payload: {payload}")
-        response = httpx.post(url, json=payload)
-        print(f"Status code: {response.status_code}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            print("\nSuccessful API response:")
-            print(f"Numbers: {result['numbers']}")
-            print(f"Source: {result['source']}")
-            print(f"Request ID: {result['request_id']}")
-            print(f"Timestamp: {result['timestamp']}")
-        else:
-            print(f"Error: {response.text}")
+        print(f"Calling POST {BASE_URL}/api/v1/random for 6 unique numbers between 1 and 90")
+        result = client.random(min_value=1, max_value=90, count=6, unique=True)
+        print("\nSuccessful API response:")
+        print(f"Numbers: {result.numbers}")
+        print(f"Source: {result.source}")
+        print(f"Request ID: {result.request_id}")
+        print(f"Timestamp: {result.timestamp}")
+    except QuantumServiceError as e:
+        print(f"Error: {e}")
     except Exception as e:
         print(f"Error connecting to API: {e}")
 
 def test_quantum_circuit_info():
     """Test the quantum circuit info endpoint."""
-    url = "http://localhost:8000/api/v1/quantum-circuit"
+    url = f"{BASE_URL}/api/v1/quantum-circuit"
     
     try:
         print(f"\nCalling GET {url}")
@@ -53,7 +45,7 @@ def test_quantum_circuit_info():
 
 def view_api_docs():
     """Get the OpenAPI schema and print available routes."""
-    url = "http://localhost:8000/openapi.json"
+    url = f"{BASE_URL}/openapi.json"
     
     try:
         print(f"\nCalling GET {url}")
@@ -80,8 +72,9 @@ if __name__ == "__main__":
     # First check available routes
     view_api_docs()
     
-    # Test random number generation
-    test_random_number_api()
+    # Test random number generation over a pooled connection
+    with QuantumClient(BASE_URL) as client:
+        test_random_number_api(client)
     
     # Test quantum circuit info
     test_quantum_circuit_info()
\ No newline at end of file
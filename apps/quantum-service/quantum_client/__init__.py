@@ -0,0 +1,39 @@
+"""
+Python client for the quantum random number service.
+
+    from quantum_client import QuantumClient
+
+    with QuantumClient("http://localhost:8002") as client:
+        ticket = client.random(1, 90, count=6)
+        print(ticket.numbers)
+"""
+
+from .client import (
+    AsyncByteBuffer,
+    AsyncDrawBuffer,
+    AsyncNumberBuffer,
+    AsyncQuantumClient,
+    ByteBuffer,
+    Draw,
+    DrawBuffer,
+    DrawSpec,
+    NumberBuffer,
+    QuantumClient,
+    QuantumServiceError,
+    RetryPolicy,
+)
+
+__all__ = [
+    "AsyncByteBuffer",
+    "AsyncDrawBuffer",
+    "AsyncNumberBuffer",
+    "AsyncQuantumClient",
+    "ByteBuffer",
+    "Draw",
+    "DrawBuffer",
+    "DrawSpec",
+    "NumberBuffer",
+    "QuantumClient",
+    "QuantumServiceError",
+    "RetryPolicy",
+]
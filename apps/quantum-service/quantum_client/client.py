@@ -0,0 +1,465 @@
+"""
+Synchronous and asynchronous clients for the quantum random number API.
+
+Both keep one pooled `httpx` client open for their lifetime, so calls reuse
+keep-alive connections, and retry transient failures (connection errors and
+429/502/503/504 responses) with exponential backoff, honouring `Retry-After`.
+
+Draws are the exception: a draw that reached the server may have been made
+and recorded even if its response was lost, and retrying it would quietly
+replace one result with another. `random` and `random_batch` therefore only
+retry when the request can't have been processed: connection failures, and
+429 and 503, which the service sends before drawing anything. Read timeouts,
+other transport errors and 502/504 are raised to the caller.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+
+DEFAULT_BASE_URL = "http://localhost:8002"
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+# Failures after which a draw is known not to have been made
+DRAW_RETRY_STATUS_CODES = (429, 503)
+DRAW_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+class QuantumServiceError(Exception):
+    """Raised when the service answers with an error that retrying did not fix."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class Draw:
+    numbers: List[int]
+    source: str
+    timestamp: str
+    request_id: str
+
+
+@dataclass
+class DrawSpec:
+    """Parameters of a draw, as accepted by `/api/v1/random`."""
+
+    min_value: int = 1
+    max_value: int = 100
+    count: int = 1
+    unique: bool = True
+    algorithm: str = "sequential"
+    # Bypass the server's DRBG output mode and draw from raw quantum bits
+    raw_quantum: bool = False
+
+    def to_json(self) -> Dict:
+        return {
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "count": self.count,
+            "unique": self.unique,
+            "algorithm": self.algorithm,
+            "raw_quantum": self.raw_quantum,
+        }
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter; `Retry-After` from the server takes precedence."""
+
+    def __init__(self, max_retries: int = 3, backoff: float = 0.1, max_backoff: float = 5.0):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5), self.max_backoff)
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+
+def _check(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        raise QuantumServiceError(response.status_code, str(detail))
+    return response
+
+
+def _retry_rules(draw: bool):
+    """The transport errors and status codes worth retrying."""
+    if draw:
+        return DRAW_RETRY_ERRORS, DRAW_RETRY_STATUS_CODES
+    return httpx.TransportError, RETRY_STATUS_CODES
+
+
+def _draws(payload) -> List[Draw]:
+    return [Draw(**item) for item in payload]
+
+
+class QuantumClient:
+    """Blocking client. Use as a context manager, or call `close()` when done.
+
+    Pass `http_client` to reuse an existing `httpx.Client` (for example a
+    Starlette `TestClient`); it is then not closed by this client.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        retry: Optional[RetryPolicy] = None,
+        http_client: Optional[httpx.Client] = None,
+    ):
+        self._owns_client = http_client is None
+        self._http = http_client or httpx.Client(base_url=base_url, timeout=timeout, limits=_limits(max_connections))
+        self.retry = retry or RetryPolicy()
+
+    def __enter__(self) -> "QuantumClient":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._owns_client:
+            self._http.close()
+
+    def _request(self, method: str, path: str, draw: bool = False, **kwargs) -> httpx.Response:
+        retry_errors, retry_status_codes = _retry_rules(draw)
+        for attempt in range(self.retry.max_retries + 1):
+            last_attempt = attempt == self.retry.max_retries
+            try:
+                response = self._http.request(method, path, **kwargs)
+            except retry_errors:
+                if last_attempt:
+                    raise
+                time.sleep(self.retry.delay(attempt))
+                continue
+            if response.status_code in retry_status_codes and not last_attempt:
+                time.sleep(self.retry.delay(attempt, response))
+                continue
+            return _check(response)
+
+    def health(self) -> Dict:
+        return self._request("GET", "/health").json()
+
+    def ready(self) -> bool:
+        """Whether the service has finished loading its quantum backends."""
+        try:
+            self._http.get("/ready").raise_for_status()
+        except httpx.HTTPError:
+            return False
+        return True
+
+    def random(
+        self,
+        min_value: int = 1,
+        max_value: int = 100,
+        count: int = 1,
+        unique: bool = True,
+        algorithm: str = "sequential",
+        raw_quantum: bool = False,
+    ) -> Draw:
+        """Make one draw. Only retried if it can't have reached the server; see the module docstring."""
+        spec = DrawSpec(min_value, max_value, count, unique, algorithm, raw_quantum)
+        return Draw(**self._request("POST", "/api/v1/random", json=spec.to_json(), draw=True).json())
+
+    def random_batch(self, specs: Sequence[DrawSpec]) -> List[Draw]:
+        """Make several draws in one round-trip. Results come back in the order of `specs`.
+
+        Retried like `random`.
+        """
+        response = self._request("POST", "/api/v1/random/batch", json=[spec.to_json() for spec in specs], draw=True)
+        return _draws(response.json())
+
+    def random_bytes(self, length: int) -> bytes:
+        """Fetch `length` raw random bytes."""
+        return self._request("GET", "/api/v1/random/bytes", params={"length": length}).content
+
+    def stream_numbers(self, min_value: int, max_value: int, count: int, unique: bool = False) -> Iterator[int]:
+        """Stream `count` numbers without holding them all in memory on either side."""
+        spec = DrawSpec(min_value, max_value, count, unique)
+        with self._http.stream("POST", "/api/v1/random/stream", json=spec.to_json()) as response:
+            if response.status_code >= 400:
+                response.read()
+                _check(response)
+            for line in response.iter_lines():
+                if line:
+                    yield int(line)
+
+    def draws(self, spec: DrawSpec, prefetch: int = 100) -> "DrawBuffer":
+        """Buffer of draws with `spec`, fetched `prefetch` at a time through the batch endpoint."""
+        return DrawBuffer(self, spec, prefetch)
+
+    def numbers(self, min_value: int, max_value: int, prefetch: int = 1000) -> "NumberBuffer":
+        """Buffer of independent numbers in [min_value, max_value], fetched `prefetch` at a time."""
+        return NumberBuffer(self, min_value, max_value, prefetch)
+
+    def byte_buffer(self, chunk_size: int = 64 * 1024) -> "ByteBuffer":
+        """Buffer of raw bytes, fetched `chunk_size` bytes at a time."""
+        return ByteBuffer(self, chunk_size)
+
+
+class DrawBuffer:
+    """Hands out draws one at a time from batches fetched ahead of time."""
+
+    def __init__(self, client: QuantumClient, spec: DrawSpec, prefetch: int = 100):
+        if prefetch <= 0:
+            raise ValueError("prefetch must be positive")
+        self.client = client
+        self.spec = spec
+        self.prefetch = prefetch
+        self._draws: List[Draw] = []
+
+    def __iter__(self) -> Iterator[Draw]:
+        while True:
+            yield self.next()
+
+    def next(self) -> Draw:
+        if not self._draws:
+            self._draws = self.client.random_batch([self.spec] * self.prefetch)
+            self._draws.reverse()
+        return self._draws.pop()
+
+
+class NumberBuffer:
+    """Hands out independent numbers in a range one at a time, fetched in bulk."""
+
+    def __init__(self, client: QuantumClient, min_value: int, max_value: int, prefetch: int = 1000):
+        if prefetch <= 0:
+            raise ValueError("prefetch must be positive")
+        self.client = client
+        self.min_value = min_value
+        self.max_value = max_value
+        self.prefetch = prefetch
+        self._numbers: List[int] = []
+
+    def __iter__(self) -> Iterator[int]:
+        while True:
+            yield self.next()
+
+    def next(self) -> int:
+        if not self._numbers:
+            draw = self.client.random(self.min_value, self.max_value, count=self.prefetch, unique=False)
+            self._numbers = draw.numbers[::-1]
+        return self._numbers.pop()
+
+
+class ByteBuffer:
+    """Serves reads of any size from large prefetched chunks of random bytes."""
+
+    def __init__(self, client: QuantumClient, chunk_size: int = 64 * 1024):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.client = client
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+
+    def read(self, size: int) -> bytes:
+        if len(self._buffer) < size:
+            self._buffer += self.client.random_bytes(max(self.chunk_size, size - len(self._buffer)))
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class AsyncQuantumClient:
+    """asyncio client. Use as an async context manager, or await `aclose()` when done.
+
+    Pass `http_client` to reuse an existing `httpx.AsyncClient` (for example
+    one with an `ASGITransport`); it is then not closed by this client.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        retry: Optional[RetryPolicy] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self._owns_client = http_client is None
+        self._http = http_client or httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=_limits(max_connections))
+        self.retry = retry or RetryPolicy()
+
+    async def __aenter__(self) -> "AsyncQuantumClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._owns_client:
+            await self._http.aclose()
+
+    async def _request(self, method: str, path: str, draw: bool = False, **kwargs) -> httpx.Response:
+        retry_errors, retry_status_codes = _retry_rules(draw)
+        for attempt in range(self.retry.max_retries + 1):
+            last_attempt = attempt == self.retry.max_retries
+            try:
+                response = await self._http.request(method, path, **kwargs)
+            except retry_errors:
+                if last_attempt:
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))
+                continue
+            if response.status_code in retry_status_codes and not last_attempt:
+                await asyncio.sleep(self.retry.delay(attempt, response))
+                continue
+            return _check(response)
+
+    async def health(self) -> Dict:
+        return (await self._request("GET", "/health")).json()
+
+    async def ready(self) -> bool:
+        """Whether the service has finished loading its quantum backends."""
+        try:
+            (await self._http.get("/ready")).raise_for_status()
+        except httpx.HTTPError:
+            return False
+        return True
+
+    async def random(
+        self,
+        min_value: int = 1,
+        max_value: int = 100,
+        count: int = 1,
+        unique: bool = True,
+        algorithm: str = "sequential",
+        raw_quantum: bool = False,
+    ) -> Draw:
+        """Make one draw. Only retried if it can't have reached the server; see the module docstring."""
+        spec = DrawSpec(min_value, max_value, count, unique, algorithm, raw_quantum)
+        return Draw(**(await self._request("POST", "/api/v1/random", json=spec.to_json(), draw=True)).json())
+
+    async def random_batch(self, specs: Sequence[DrawSpec]) -> List[Draw]:
+        """Make several draws in one round-trip. Results come back in the order of `specs`.
+
+        Retried like `random`.
+        """
+        response = await self._request("POST", "/api/v1/random/batch", json=[spec.to_json() for spec in specs], draw=True)
+        return _draws(response.json())
+
+    async def random_bytes(self, length: int) -> bytes:
+        """Fetch `length` raw random bytes."""
+        return (await self._request("GET", "/api/v1/random/bytes", params={"length": length})).content
+
+    async def stream_numbers(self, min_value: int, max_value: int, count: int, unique: bool = False) -> AsyncIterator[int]:
+        """Stream `count` numbers without holding them all in memory on either side."""
+        spec = DrawSpec(min_value, max_value, count, unique)
+        async with self._http.stream("POST", "/api/v1/random/stream", json=spec.to_json()) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                _check(response)
+            async for line in response.aiter_lines():
+                if line:
+                    yield int(line)
+
+    def draws(self, spec: DrawSpec, prefetch: int = 100) -> "AsyncDrawBuffer":
+        """Buffer of draws with `spec`, refilled in the background through the batch endpoint."""
+        return AsyncDrawBuffer(self, spec, prefetch)
+
+    def numbers(self, min_value: int, max_value: int, prefetch: int = 1000) -> "AsyncNumberBuffer":
+        """Buffer of independent numbers in [min_value, max_value], fetched `prefetch` at a time."""
+        return AsyncNumberBuffer(self, min_value, max_value, prefetch)
+
+    def byte_buffer(self, chunk_size: int = 64 * 1024) -> "AsyncByteBuffer":
+        """Buffer of raw bytes, fetched `chunk_size` bytes at a time."""
+        return AsyncByteBuffer(self, chunk_size)
+
+
+class AsyncDrawBuffer:
+    """Hands out prefetched draws, fetching the next batch once half of the current one is used."""
+
+    def __init__(self, client: AsyncQuantumClient, spec: DrawSpec, prefetch: int = 100):
+        if prefetch <= 0:
+            raise ValueError("prefetch must be positive")
+        self.client = client
+        self.spec = spec
+        self.prefetch = prefetch
+        self._draws: List[Draw] = []
+        self._refill: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def __aiter__(self) -> "AsyncDrawBuffer":
+        return self
+
+    async def __anext__(self) -> Draw:
+        return await self.next()
+
+    def _start_refill(self):
+        if self._refill is None:
+            self._refill = asyncio.ensure_future(self.client.random_batch([self.spec] * self.prefetch))
+
+    async def next(self) -> Draw:
+        async with self._lock:
+            if not self._draws:
+                self._start_refill()
+                refill, self._refill = self._refill, None
+                self._draws = (await refill)[::-1]
+            draw = self._draws.pop()
+            # Fetch the next batch in the background before this one runs out
+            if len(self._draws) <= self.prefetch // 2:
+                self._start_refill()
+            return draw
+
+
+class AsyncNumberBuffer:
+    """Hands out independent numbers in a range one at a time, fetched in bulk."""
+
+    def __init__(self, client: AsyncQuantumClient, min_value: int, max_value: int, prefetch: int = 1000):
+        if prefetch <= 0:
+            raise ValueError("prefetch must be positive")
+        self.client = client
+        self.min_value = min_value
+        self.max_value = max_value
+        self.prefetch = prefetch
+        self._numbers: List[int] = []
+        self._lock = asyncio.Lock()
+
+    def __aiter__(self) -> "AsyncNumberBuffer":
+        return self
+
+    async def __anext__(self) -> int:
+        return await self.next()
+
+    async def next(self) -> int:
+        async with self._lock:
+            if not self._numbers:
+                draw = await self.client.random(self.min_value, self.max_value, count=self.prefetch, unique=False)
+                self._numbers = draw.numbers[::-1]
+            return self._numbers.pop()
+
+
+class AsyncByteBuffer:
+    """Serves reads of any size from large prefetched chunks of random bytes."""
+
+    def __init__(self, client: AsyncQuantumClient, chunk_size: int = 64 * 1024):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.client = client
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._lock = asyncio.Lock()
+
+    async def read(self, size: int) -> bytes:
+        async with self._lock:
+            if len(self._buffer) < size:
+                self._buffer += await self.client.random_bytes(max(self.chunk_size, size - len(self._buffer)))
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            return data
@@ -0,0 +1,155 @@
+"""
+Admission control based on the entropy a request will consume.
+
+Before any work starts, each request's cost is estimated in random bits
+(including the bits rejection sampling is expected to discard). Requests
+over the per-request limit are refused outright, and every client draws its
+costs from a token bucket refilled at a fixed number of bits per second, so
+one heavy caller can't starve everybody else's lottery draws.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .metrics import ADMISSION_REJECTIONS
+from .sampling import combination_bits, expected_bits
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is refused by admission control."""
+
+    status_code = 429
+
+    def __init__(self, detail: str, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class RequestTooExpensive(AdmissionRejected):
+    """The request costs more than any single request may."""
+
+    status_code = 413
+
+
+class RateLimited(AdmissionRejected):
+    """The client has used up its entropy budget for now."""
+
+    status_code = 429
+
+
+@dataclass(frozen=True)
+class Cost:
+    # Expected random bits consumed, including rejected candidates
+    bits: int
+    # Expected share of candidate values discarded by rejection sampling
+    rejection_rate: float
+
+
+def _rejection_rate(outcomes: int) -> float:
+    if outcomes <= 1:
+        return 0.0
+    bits = (outcomes - 1).bit_length()
+    return 1 - outcomes / (1 << bits)
+
+
+def estimate_cost(min_value: int, max_value: int, count: int, unique: bool = True, algorithm: str = "sequential") -> Cost:
+    """Estimate the cost of a draw before running it."""
+    if algorithm == "combination":
+        outcomes = math.comb(max_value - min_value + 1, count)
+        return Cost(combination_bits(min_value, max_value, count), _rejection_rate(outcomes))
+    return Cost(
+        expected_bits(min_value, max_value, count, unique),
+        _rejection_rate(max_value - min_value + 1),
+    )
+
+
+class TokenBucket:
+    """Holds up to `capacity` tokens, refilled continuously at `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float, now: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def consume(self, amount: float, now: Optional[float] = None) -> float:
+        """Take `amount` tokens. Returns 0 on success, or the seconds until they'd be available."""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if amount <= self.tokens:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Per-request cost limit plus a per-client token bucket of random bits.
+
+    A `client_rate` of 0 disables the rate limit. Buckets are kept for the
+    `max_clients` most recently seen clients.
+    """
+
+    def __init__(
+        self,
+        max_request_bits: int,
+        client_rate: float = 0.0,
+        client_burst: Optional[float] = None,
+        max_clients: int = 10_000,
+    ):
+        self.max_request_bits = max_request_bits
+        self.client_rate = client_rate
+        self.client_burst = client_burst if client_burst is not None else max_request_bits
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.rejected = 0
+
+    def _reject(self, exc: AdmissionRejected, reason: str):
+        with self._lock:
+            self.rejected += 1
+        ADMISSION_REJECTIONS.inc(reason=reason)
+        raise exc
+
+    def admit(self, client_id: str, bits: int):
+        """Charge `bits` to `client_id`, raising AdmissionRejected if the request may not run."""
+        if bits > self.max_request_bits or (self.client_rate and bits > self.client_burst):
+            limit = min(self.max_request_bits, self.client_burst) if self.client_rate else self.max_request_bits
+            self._reject(
+                RequestTooExpensive(f"request needs about {bits} random bits, the limit is {int(limit)}"),
+                "too_expensive",
+            )
+        if self.client_rate:
+            with self._lock:
+                bucket = self._buckets.get(client_id)
+                if bucket is None:
+                    bucket = self._buckets[client_id] = TokenBucket(self.client_rate, self.client_burst)
+                    while len(self._buckets) > self.max_clients:
+                        self._buckets.popitem(last=False)
+                else:
+                    self._buckets.move_to_end(client_id)
+                wait = bucket.consume(bits)
+            if wait:
+                self._reject(
+                    RateLimited(f"entropy budget exceeded, retry in {wait:.1f}s", retry_after=wait),
+                    "rate_limited",
+                )
+        with self._lock:
+            self.admitted += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "max_request_bits": self.max_request_bits,
+                "client_bits_per_second": self.client_rate,
+                "client_burst_bits": self.client_burst,
+                "tracked_clients": len(self._buckets),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,113 @@
+"""
+Coalesces concurrent requests into batches.
+
+Under bursty traffic many `/api/v1/random` requests arrive within a few
+milliseconds of each other. Instead of sending each one to the simulator
+executor on its own, `MicroBatcher` collects the requests that arrive within
+a short window (or until a batch is full), processes them with one call, so
+the whole batch is served from a single entropy read, and hands each caller
+its own result.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+from .metrics import COALESCED_BATCH_SIZE
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Groups items submitted within `window` seconds, up to `max_size` per batch.
+
+    `process` receives the items of a batch and must return one result per
+    item, in the same order. If it raises, every caller in the batch gets the
+    exception. A caller waits at most `window` seconds longer than it would
+    have on its own.
+
+    With `weight`, a batch is also flushed once its items' summed weight
+    reaches `max_weight`, and an item that would push it past that starts a
+    new batch, so small items never wait behind a heavy one.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[List[T]], Awaitable[List[R]]],
+        window: float = 0.002,
+        max_size: int = 64,
+        weight: Optional[Callable[[T], int]] = None,
+        max_weight: Optional[int] = None,
+    ):
+        if window < 0 or max_size <= 0:
+            raise ValueError("window must be non-negative and max_size positive")
+        if (weight is None) != (max_weight is None):
+            raise ValueError("weight and max_weight must be given together")
+        self._process = process
+        self.window = window
+        self.max_size = max_size
+        self._weight = weight
+        self.max_weight = max_weight
+        self._pending_weight = 0
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Keep running batches referenced until they finish
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: T) -> R:
+        """Queue `item` for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        weight = 0
+        if self._weight is not None:
+            weight = self._weight(item)
+            if self._pending and self._pending_weight + weight > self.max_weight:
+                self._flush()
+        self._pending.append((item, future))
+        self._pending_weight += weight
+        if len(self._pending) >= self.max_size or (self.max_weight is not None and self._pending_weight >= self.max_weight):
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        self._pending_weight = 0
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        COALESCED_BATCH_SIZE.observe(len(batch))
+        try:
+            results = await self._process([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            # The caller may have gone away (e.g. the client disconnected)
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            "window_ms": self.window * 1000,
+            "max_size": self.max_size,
+            "max_weight": self.max_weight,
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
@@ -0,0 +1,167 @@
+"""
+Batched quantum bit generation.
+
+Instead of building and running a 1-qubit circuit for every bit, the engine
+builds a single wide Hadamard circuit and runs it once with as many shots as
+needed. Results come back through the SamplerV2 interface as a `BitArray`,
+whose NumPy array already holds every shot packed big-endian, so the bytes
+are read straight out of it without per-shot strings or dicts.
+"""
+
+import itertools
+import math
+import time
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+import numpy as np
+
+from .metrics import SIMULATOR_JOB_SECONDS, SIMULATOR_JOBS
+
+if TYPE_CHECKING:
+    from qiskit.primitives.containers import BitArray
+
+    from .circuits import CircuitRegistry
+
+# Number of qubits measured per shot. A multiple of 8 keeps every shot
+# byte-aligned when packing the measured bits.
+DEFAULT_WIDTH = 32
+
+
+def sample_bits(backend, circuit, shots: int, seed: Optional[int] = None) -> "BitArray":
+    """Run `circuit` on an Aer `backend` and return the measured shots of its first register."""
+    from qiskit_aer.primitives import SamplerV2
+
+    # Aer's SamplerV2 fixes its seed at construction, and wrapping an existing backend is cheap
+    sampler = SamplerV2.from_backend(backend, seed=seed)
+    result = sampler.run([circuit], shots=shots).result()
+    return getattr(result[0].data, circuit.cregs[0].name)
+
+
+class QuantumBitEngine:
+    """Generates random bytes from one multi-qubit, multi-shot simulator job."""
+
+    def __init__(
+        self,
+        backend,
+        width: int = DEFAULT_WIDTH,
+        registry: Optional["CircuitRegistry"] = None,
+        seed: Optional[int] = None,
+    ):
+        if width <= 0 or width % 8:
+            raise ValueError("width must be a positive multiple of 8")
+        self.backend = backend
+        self.width = width
+        if registry is None:
+            from .circuits import CircuitRegistry
+
+            registry = CircuitRegistry(backend, preload=(width,))
+        # Built and transpiled once; every job reuses the same circuit
+        self.circuit = registry.get(width)
+        self.jobs_run = 0
+        # With a seed, job N runs with seed_simulator=seed+N: reproducible, yet no two jobs repeat
+        self.seed = seed
+        self._seeds = itertools.count(seed) if seed is not None else None
+
+    def generate_array(self, num_bytes: int) -> np.ndarray:
+        """Return `num_bytes` random bytes from a single simulator job, as a flat uint8 array."""
+        if num_bytes <= 0:
+            return np.empty(0, dtype=np.uint8)
+
+        shots = math.ceil(num_bytes / (self.width // 8))
+        seed = next(self._seeds) if self._seeds is not None else None
+        start = time.perf_counter()
+        bit_array = sample_bits(self.backend, self.circuit, shots, seed)
+        SIMULATOR_JOB_SECONDS.observe(time.perf_counter() - start, backend="aer")
+        SIMULATOR_JOBS.inc(backend="aer")
+        self.jobs_run += 1
+
+        # (shots, width / 8) bytes, each shot packed big-endian: flattening is a view, not a copy
+        return bit_array.array.reshape(-1)[:num_bytes]
+
+    def generate_bytes(self, num_bytes: int) -> bytes:
+        """Return `num_bytes` random bytes using a single simulator job."""
+        return self.generate_array(num_bytes).tobytes()
+
+    def bit_stream(self, num_bits: int = 0) -> "BitStream":
+        """Return a bit stream pre-filled with at least `num_bits` bits from one job."""
+        return BitStream(self.generate_bytes, initial=self.generate_bytes(math.ceil(num_bits / 8)))
+
+
+class BitStream:
+    """Sequential reader over a packed random byte buffer.
+
+    When the buffer runs out, more bytes are pulled from `source`, so callers
+    that under-estimate their needs still get correct (if slower) results.
+    """
+
+    # Bytes requested from the source on the first refill; each further
+    # refill doubles, up to MAX_REFILL, so long readers make few source calls
+    MIN_REFILL = 64
+    MAX_REFILL = 64 * 1024
+
+    def __init__(self, source: Callable[[int], bytes], initial: bytes = b"", sources: Optional[List[str]] = None):
+        self._source = source
+        # Names of the entropy backends that supplied this stream, kept up to date by `source`
+        self.sources = sources if sources is not None else []
+        self._buffer = bytearray(initial)
+        self._bit_pos = 0
+        self._refill_size = self.MIN_REFILL
+        self.bits_consumed = 0
+
+    def _ensure(self, num_bits: int):
+        available = len(self._buffer) * 8 - self._bit_pos
+        if available >= num_bits:
+            return
+        missing = math.ceil((num_bits - available) / 8)
+        # Drop fully consumed bytes before appending new ones
+        consumed_bytes = self._bit_pos // 8
+        del self._buffer[:consumed_bytes]
+        self._bit_pos -= consumed_bytes * 8
+        self._buffer.extend(self._source(max(missing, self._refill_size)))
+        self._refill_size = min(self._refill_size * 2, self.MAX_REFILL)
+
+    def read_bits(self, num_bits: int) -> int:
+        """Read `num_bits` bits and return them as an unsigned integer."""
+        if num_bits <= 0:
+            return 0
+        self._ensure(num_bits)
+
+        start_byte = self._bit_pos // 8
+        end_byte = (self._bit_pos + num_bits + 7) // 8
+        chunk = int.from_bytes(self._buffer[start_byte:end_byte], "big")
+        # Discard the bits after the requested window, then mask off the ones before it
+        trailing = end_byte * 8 - (self._bit_pos + num_bits)
+        value = (chunk >> trailing) & ((1 << num_bits) - 1)
+
+        self._bit_pos += num_bits
+        self.bits_consumed += num_bits
+        return value
+
+    def read_bit(self) -> int:
+        """Read a single bit."""
+        return self.read_bits(1)
+
+    def read_bits_array(self, num_bits: int, count: int) -> np.ndarray:
+        """Read `count` consecutive `num_bits`-bit values (at most 64 bits each) as a uint64 array."""
+        if not 0 < num_bits <= 64:
+            raise ValueError("num_bits must be between 1 and 64")
+        if count <= 0:
+            return np.empty(0, dtype=np.uint64)
+        total = num_bits * count
+        self._ensure(total)
+
+        start_byte = self._bit_pos // 8
+        end_byte = (self._bit_pos + total + 7) // 8
+        offset = self._bit_pos - start_byte * 8
+        # Copy the window so the bytearray can still be resized later
+        raw = np.frombuffer(bytes(self._buffer[start_byte:end_byte]), dtype=np.uint8)
+        bits = np.unpackbits(raw)[offset:offset + total].reshape(count, num_bits)
+
+        # Left-pad every value to 64 bits and reinterpret as big-endian integers
+        padded = np.zeros((count, 64), dtype=np.uint8)
+        padded[:, 64 - num_bits:] = bits
+        values = np.packbits(padded, axis=1).view(">u8").ravel().astype(np.uint64)
+
+        self._bit_pos += total
+        self.bits_consumed += total
+        return values
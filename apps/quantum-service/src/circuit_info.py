@@ -0,0 +1,64 @@
+"""
+Cache for the `/api/v1/quantum-circuit` demonstration result.
+
+The demonstration runs the same circuit every time and is purely
+illustrative, so its result is kept in memory and recomputed at most once per
+TTL. Stale results keep being served while a background thread refreshes
+them, so readers never wait on the simulator once the cache is warm.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class CircuitInfoCache:
+    """Holds a computed value for `ttl` seconds and refreshes it in the background."""
+
+    def __init__(self, compute: Callable[[], Dict], ttl: float = 300.0):
+        self._compute = compute
+        self.ttl = ttl
+        self._value: Optional[Dict] = None
+        self.computed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def peek(self) -> Optional[Dict]:
+        """Return the cached value, however old, without computing anything."""
+        return self._value
+
+    def is_fresh(self) -> bool:
+        return self.computed_at is not None and time.time() - self.computed_at < self.ttl
+
+    def refresh(self) -> Dict:
+        """Recompute the value now and store it."""
+        value = self._compute()
+        with self._lock:
+            self._value = value
+            self.computed_at = time.time()
+            self._refreshing = False
+        return value
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh_in_background(self):
+        """Start a background refresh unless one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_quietly, name="circuit-info-refresh", daemon=True).start()
+
+    def get(self) -> Dict:
+        """Return the cached value, computing it synchronously only if there is none yet."""
+        value = self._value
+        if value is None:
+            return self.refresh()
+        if not self.is_fresh():
+            self.refresh_in_background()
+        return value
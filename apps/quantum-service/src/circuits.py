@@ -0,0 +1,97 @@
+"""
+Random-bit circuits and a registry of pre-transpiled instances.
+
+Building a circuit and transpiling it for the simulator costs far more Python
+time than executing a few Hadamard gates, so circuits are built once per
+qubit width and reused by every job.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+from qiskit import QuantumCircuit, transpile
+
+
+def create_random_bit_circuit() -> QuantumCircuit:
+    """Create a 1-qubit circuit that measures a qubit in superposition."""
+    # Create a quantum circuit with 1 qubit
+    qc = QuantumCircuit(1, 1)
+
+    # Put the qubit in superposition
+    qc.h(0)
+
+    # Measure the qubit
+    qc.measure(0, 0)
+
+    return qc
+
+
+def create_multi_bit_circuit(num_bits: int = 6) -> QuantumCircuit:
+    """Create a circuit that puts `num_bits` qubits in superposition and measures them."""
+    if num_bits == 1:
+        return create_random_bit_circuit()
+
+    # Create a quantum circuit with num_bits qubits
+    qc = QuantumCircuit(num_bits, num_bits)
+
+    # Put all qubits in superposition
+    qc.h(range(num_bits))
+
+    # Measure all qubits
+    qc.measure(range(num_bits), range(num_bits))
+
+    return qc
+
+
+class CircuitRegistry:
+    """Transpiled random-bit circuits keyed by qubit width.
+
+    Widths passed as `preload` are built up front and kept for the lifetime of
+    the registry; any other width is built on first use and kept in an LRU
+    cache of `cache_size` entries.
+    """
+
+    def __init__(self, backend, preload: Iterable[int] = (), cache_size: int = 16):
+        self.backend = backend
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._pinned: Dict[int, QuantumCircuit] = {width: self._build(width) for width in preload}
+        self._lru: "OrderedDict[int, QuantumCircuit]" = OrderedDict()
+        self.builds = len(self._pinned)
+
+    def _build(self, width: int) -> QuantumCircuit:
+        if width <= 0:
+            raise ValueError("width must be positive")
+        # Target the backend's gate set only: its coupling map would cap the width at
+        # the statevector limit, while these Clifford circuits run with the stabilizer method
+        return transpile(
+            create_multi_bit_circuit(width),
+            basis_gates=list(self.backend.operation_names),
+            optimization_level=1,
+        )
+
+    def get(self, width: int) -> QuantumCircuit:
+        """Return the ready-to-run circuit for `width` qubits."""
+        circuit = self._pinned.get(width)
+        if circuit is not None:
+            return circuit
+
+        with self._lock:
+            circuit = self._lru.get(width)
+            if circuit is not None:
+                self._lru.move_to_end(width)
+                return circuit
+
+        circuit = self._build(width)
+        with self._lock:
+            self.builds += 1
+            self._lru[width] = circuit
+            self._lru.move_to_end(width)
+            while len(self._lru) > self.cache_size:
+                self._lru.popitem(last=False)
+        return circuit
+
+    def widths(self) -> Dict[str, list]:
+        with self._lock:
+            return {"preloaded": sorted(self._pinned), "cached": list(self._lru)}
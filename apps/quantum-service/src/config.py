@@ -0,0 +1,188 @@
+"""
+Service configuration read from environment variables.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_int_tuple(name: str, default: Tuple[int, ...]) -> Tuple[int, ...]:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return tuple(int(item) for item in value.split(",") if item.strip())
+
+
+def _env_str_tuple(name: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Entropy pool
+    pool_enabled: bool = True
+    pool_capacity: int = 64 * 1024
+    pool_low_watermark: float = 0.25
+    pool_high_watermark: float = 0.9
+    pool_chunk_size: int = 4096
+    # Name of the shared memory pool filled by the producer process of
+    # `python -m src.serve`; set by the launcher for its workers
+    shared_pool_name: str = ""
+    # HTTP worker processes started by `python -m src.serve`. Not the CPU
+    # count, which inside a container is usually the host's
+    workers: int = 2
+
+    # Entropy backends in priority order. Every source except the last one is
+    # abandoned in favour of the next if it takes longer than the timeout.
+    entropy_sources: Tuple[str, ...] = ("quantum_simulator", "os_urandom")
+    entropy_source_timeout: float = 10.0
+    # Chain reads are split into chunks of at most this many bytes, and the
+    # timeout applies to each chunk (Aer produces roughly 200 KB/s)
+    entropy_chunk_size: int = 64 * 1024
+    # Artificial round-trip delay of the local quantum_runtime stand-in
+    runtime_latency: float = 0.0
+
+    # Fixed simulator seed for reproducible runs; unset means unseeded
+    simulator_seed: Optional[int] = None
+
+    # Entropy log: "live" (off), "record" every read handed to a request,
+    # or "replay" a recorded log instead of generating entropy
+    entropy_log_mode: str = "live"
+    entropy_log_path: str = "entropy.log"
+
+    # Output mode: "raw" serves entropy backend bits directly; "drbg" serves an
+    # HMAC-DRBG reseeded with drbg_seed_bytes of health-tested raw entropy
+    # after every drbg_reseed_bytes of output. Requests can still ask for raw bits.
+    output_mode: str = "raw"
+    drbg_reseed_bytes: int = 1024 * 1024
+    drbg_seed_bytes: int = 256
+
+    # Append-only ledger of every draw, looked up by request ID (empty disables
+    # it), and the seconds between batched fsyncs (0 fsyncs every draw)
+    ledger_path: str = ""
+    ledger_sync_interval: float = 0.05
+
+    # Share of live entropy chunks copied into the online randomness tests,
+    # and how many sampled bytes each test run covers
+    randomness_sample_fraction: float = 0.01
+    randomness_window_bytes: int = 1024 * 1024
+
+    # Concurrent /api/v1/random requests arriving within this many
+    # milliseconds are served together, up to batch_max_requests and
+    # batch_max_bits of estimated entropy per batch; requests estimated above
+    # batch_max_bits on their own skip coalescing. A window of 0 disables it.
+    batch_window_ms: float = 2.0
+    batch_max_requests: int = 64
+    batch_max_bits: int = 1 << 16
+
+    # Admission control: the most random bits (including those expected to be
+    # discarded by rejection sampling) a single request may cost, and a
+    # per-client budget refilled at admission_client_bits_per_second up to
+    # admission_client_burst_bits. A rate of 0 disables the per-client budget.
+    # Clients are told apart by admission_client_header, or by address if unset.
+    # Sized for the local Aer simulator, which produces about 1.5 Mbit/s: the
+    # largest request (1 MiB of bits) ties it up for about 5 s, and one client's
+    # sustained rate is a sixth of its output. Raise them for faster backends
+    # or the DRBG output mode.
+    admission_max_request_bits: int = 1 << 23
+    admission_client_bits_per_second: float = float(1 << 18)
+    admission_client_burst_bits: int = 1 << 23
+    admission_client_header: str = ""
+
+    # Simulator worker pool
+    executor_workers: int = min(4, os.cpu_count() or 1)
+    executor_queue_size: int = 64
+
+    # Bulk endpoints
+    max_bytes_length: int = 64 * 1024 * 1024
+    max_stream_count: int = 10_000_000
+    max_batch_size: int = 10_000
+
+    # WebSocket subscriptions: most frames per second and most outstanding credits per connection
+    subscription_max_rate: float = 100.0
+    subscription_max_credits: int = 1024
+
+    # Seconds the /api/v1/quantum-circuit demonstration result is reused
+    circuit_info_ttl: float = 300.0
+
+    # Rendered circuit diagrams and histograms kept in memory
+    image_cache_size: int = 32
+
+    # Circuit widths transpiled at startup, and LRU size for any other width
+    circuit_widths: Tuple[int, ...] = (1, 8, 32)
+    circuit_cache_size: int = 16
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            pool_enabled=_env_bool("QUANTUM_POOL_ENABLED", cls.pool_enabled),
+            pool_capacity=_env_int("QUANTUM_POOL_CAPACITY", cls.pool_capacity),
+            pool_low_watermark=_env_float("QUANTUM_POOL_LOW_WATERMARK", cls.pool_low_watermark),
+            pool_high_watermark=_env_float("QUANTUM_POOL_HIGH_WATERMARK", cls.pool_high_watermark),
+            pool_chunk_size=_env_int("QUANTUM_POOL_CHUNK_SIZE", cls.pool_chunk_size),
+            shared_pool_name=os.getenv("QUANTUM_SHARED_POOL") or cls.shared_pool_name,
+            workers=_env_int("QUANTUM_WORKERS", cls.workers),
+            entropy_sources=_env_str_tuple("QUANTUM_ENTROPY_SOURCES", cls.entropy_sources),
+            entropy_source_timeout=_env_float("QUANTUM_ENTROPY_SOURCE_TIMEOUT", cls.entropy_source_timeout),
+            entropy_chunk_size=_env_int("QUANTUM_ENTROPY_CHUNK_SIZE", cls.entropy_chunk_size),
+            runtime_latency=_env_float("QUANTUM_RUNTIME_LATENCY", cls.runtime_latency),
+            simulator_seed=_env_optional_int("QUANTUM_SIMULATOR_SEED"),
+            entropy_log_mode=os.getenv("QUANTUM_ENTROPY_LOG_MODE") or cls.entropy_log_mode,
+            entropy_log_path=os.getenv("QUANTUM_ENTROPY_LOG_PATH") or cls.entropy_log_path,
+            output_mode=os.getenv("QUANTUM_OUTPUT_MODE") or cls.output_mode,
+            drbg_reseed_bytes=_env_int("QUANTUM_DRBG_RESEED_BYTES", cls.drbg_reseed_bytes),
+            drbg_seed_bytes=_env_int("QUANTUM_DRBG_SEED_BYTES", cls.drbg_seed_bytes),
+            ledger_path=os.getenv("QUANTUM_LEDGER_PATH") or cls.ledger_path,
+            ledger_sync_interval=_env_float("QUANTUM_LEDGER_SYNC_INTERVAL", cls.ledger_sync_interval),
+            randomness_sample_fraction=_env_float("QUANTUM_RANDOMNESS_SAMPLE_FRACTION", cls.randomness_sample_fraction),
+            randomness_window_bytes=_env_int("QUANTUM_RANDOMNESS_WINDOW_BYTES", cls.randomness_window_bytes),
+            batch_window_ms=_env_float("QUANTUM_BATCH_WINDOW_MS", cls.batch_window_ms),
+            batch_max_requests=_env_int("QUANTUM_BATCH_MAX_REQUESTS", cls.batch_max_requests),
+            batch_max_bits=_env_int("QUANTUM_BATCH_MAX_BITS", cls.batch_max_bits),
+            admission_max_request_bits=_env_int("QUANTUM_ADMISSION_MAX_REQUEST_BITS", cls.admission_max_request_bits),
+            admission_client_bits_per_second=_env_float(
+                "QUANTUM_ADMISSION_CLIENT_BITS_PER_SECOND", cls.admission_client_bits_per_second
+            ),
+            admission_client_burst_bits=_env_int("QUANTUM_ADMISSION_CLIENT_BURST_BITS", cls.admission_client_burst_bits),
+            admission_client_header=os.getenv("QUANTUM_ADMISSION_CLIENT_HEADER") or cls.admission_client_header,
+            executor_workers=_env_int("QUANTUM_EXECUTOR_WORKERS", cls.executor_workers),
+            executor_queue_size=_env_int("QUANTUM_EXECUTOR_QUEUE_SIZE", cls.executor_queue_size),
+            max_bytes_length=_env_int("QUANTUM_MAX_BYTES_LENGTH", cls.max_bytes_length),
+            max_stream_count=_env_int("QUANTUM_MAX_STREAM_COUNT", cls.max_stream_count),
+            max_batch_size=_env_int("QUANTUM_MAX_BATCH_SIZE", cls.max_batch_size),
+            subscription_max_rate=_env_float("QUANTUM_SUBSCRIPTION_MAX_RATE", cls.subscription_max_rate),
+            subscription_max_credits=_env_int("QUANTUM_SUBSCRIPTION_MAX_CREDITS", cls.subscription_max_credits),
+            circuit_info_ttl=_env_float("QUANTUM_CIRCUIT_INFO_TTL", cls.circuit_info_ttl),
+            image_cache_size=_env_int("QUANTUM_IMAGE_CACHE_SIZE", cls.image_cache_size),
+            circuit_widths=_env_int_tuple("QUANTUM_CIRCUIT_WIDTHS", cls.circuit_widths),
+            circuit_cache_size=_env_int("QUANTUM_CIRCUIT_CACHE_SIZE", cls.circuit_cache_size),
+        )
+
+
+settings = Settings.from_env()
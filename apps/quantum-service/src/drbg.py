@@ -0,0 +1,206 @@
+"""
+Quantum-seeded deterministic random bit generator.
+
+The simulator produces a few hundred kilobytes per second at best. In the
+"drbg" output mode, raw quantum bits are not served directly: they seed an
+HMAC-DRBG (NIST SP 800-90A, SHA-256) that is reseeded after a fixed number
+of output bytes, so throughput is bounded by HMAC instead of the simulator.
+Every seed first passes the SP 800-90B continuous health tests (repetition
+count and adaptive proportion); the DRBG's HMAC update then acts as the
+conditioning function over the tested input.
+"""
+
+import hmac
+import math
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .entropy_sources import EntropySourceError
+from .metrics import DRBG_HEALTH_FAILURES, DRBG_RESEEDS
+
+
+class HealthTestFailure(EntropySourceError):
+    """Raised when raw entropy fails a continuous health test."""
+
+
+def _binomial_cutoff(window: int, p: float, alpha: float) -> int:
+    """Smallest count whose upper binomial tail probability is at most `alpha`."""
+    log_p, log_q = math.log(p), math.log1p(-p)
+    tail = 0.0
+    for k in range(window, -1, -1):
+        log_pmf = math.lgamma(window + 1) - math.lgamma(k + 1) - math.lgamma(window - k + 1) + k * log_p + (window - k) * log_q
+        tail += math.exp(log_pmf)
+        if tail > alpha:
+            return k + 1
+    return 0
+
+
+class HealthTests:
+    """SP 800-90B section 4.4 health tests over raw bits.
+
+    Each bit is one sample with `min_entropy` bits of claimed min-entropy.
+    The repetition count test fails on a run of identical bits that long
+    with probability `alpha`; the adaptive proportion test counts, in
+    non-overlapping windows of `window` bits, how often the first bit of the
+    window recurs. Only whole windows are tested.
+    """
+
+    def __init__(self, min_entropy: float = 1.0, alpha: float = 2 ** -20, window: int = 1024):
+        self.window = window
+        self.repetition_cutoff = 1 + math.ceil(-math.log2(alpha) / min_entropy)
+        self.proportion_cutoff = _binomial_cutoff(window, 2 ** -min_entropy, alpha)
+
+    def check(self, data: bytes):
+        """Raise HealthTestFailure if `data` fails either test."""
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        if bits.size == 0:
+            return
+        # Run lengths from the positions where the bit value changes
+        edges = np.flatnonzero(np.diff(bits))
+        runs = np.diff(np.concatenate(([-1], edges, [bits.size - 1])))
+        if runs.max() >= self.repetition_cutoff:
+            DRBG_HEALTH_FAILURES.inc(test="repetition_count")
+            raise HealthTestFailure(f"repetition count test failed: run of {runs.max()} identical bits")
+
+        windows = bits[: bits.size // self.window * self.window].reshape(-1, self.window)
+        if windows.size:
+            matches = (windows == windows[:, :1]).sum(axis=1)
+            if matches.max() >= self.proportion_cutoff:
+                DRBG_HEALTH_FAILURES.inc(test="adaptive_proportion")
+                raise HealthTestFailure(
+                    f"adaptive proportion test failed: {matches.max()} of {self.window} bits repeat the first"
+                )
+
+
+class HmacDrbg:
+    """HMAC_DRBG with SHA-256, as specified in SP 800-90A section 10.1.2."""
+
+    # Most bytes one generate call may return
+    MAX_REQUEST = 1 << 16
+
+    def __init__(self, entropy: bytes, nonce: bytes = b"", personalization: bytes = b""):
+        self._key = b"\x00" * 32
+        self._value = b"\x01" * 32
+        self._update(entropy + nonce + personalization)
+        self.reseed_counter = 1
+
+    def _update(self, provided: bytes = b""):
+        self._key = hmac.digest(self._key, self._value + b"\x00" + provided, "sha256")
+        self._value = hmac.digest(self._key, self._value, "sha256")
+        if provided:
+            self._key = hmac.digest(self._key, self._value + b"\x01" + provided, "sha256")
+            self._value = hmac.digest(self._key, self._value, "sha256")
+
+    def reseed(self, entropy: bytes, additional: bytes = b""):
+        self._update(entropy + additional)
+        self.reseed_counter = 1
+
+    def generate(self, num_bytes: int, additional: bytes = b"") -> bytes:
+        """Return `num_bytes` pseudorandom bytes, at most MAX_REQUEST."""
+        if num_bytes > self.MAX_REQUEST:
+            raise ValueError(f"at most {self.MAX_REQUEST} bytes per request")
+        if additional:
+            self._update(additional)
+        key, value = self._key, self._value
+        blocks = []
+        for _ in range(-(-num_bytes // 32)):
+            value = hmac.digest(key, value, "sha256")
+            blocks.append(value)
+        self._value = value
+        self._update(additional)
+        self.reseed_counter += 1
+        return b"".join(blocks)[:num_bytes]
+
+
+class QuantumDrbg:
+    """An HMAC-DRBG reseeded from health-tested raw entropy every `reseed_bytes` of output.
+
+    `seed_source` returns raw bytes and the name of the backend that supplied
+    them. A read is labelled "quantum_drbg" if every chunk of it was generated
+    from seeds that came from quantum backends only (as decided by
+    `is_quantum`), and "classical_drbg" otherwise. The state is discarded in forked children so workers never
+    share an output sequence.
+    """
+
+    def __init__(
+        self,
+        seed_source: Callable[[int], Tuple[bytes, str]],
+        is_quantum: Callable[[str], bool],
+        reseed_bytes: int = 1 << 20,
+        seed_bytes: int = 256,
+        health_tests: Optional[HealthTests] = None,
+    ):
+        if reseed_bytes <= 0 or seed_bytes < 32:
+            raise ValueError("reseed_bytes must be positive and seed_bytes at least 32")
+        self._seed_source = seed_source
+        self._is_quantum = is_quantum
+        self.reseed_bytes = reseed_bytes
+        self.seed_bytes = seed_bytes
+        self.health_tests = health_tests or HealthTests()
+        self._lock = threading.Lock()
+        self._drbg: Optional[HmacDrbg] = None
+        self._since_reseed = 0
+        self.name = "quantum_drbg"
+        self.reseeds = 0
+        self.health_failures = 0
+        self.bytes_generated = 0
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self):
+        self._drbg = None
+
+    def _reseed(self):
+        data, source = self._seed_source(self.seed_bytes)
+        try:
+            self.health_tests.check(data)
+        except HealthTestFailure:
+            self.health_failures += 1
+            raise
+        # Distinct per process and instantiation even if two seeds ever matched
+        personalization = struct.pack("<qq", os.getpid(), time.time_ns())
+        if self._drbg is None:
+            self._drbg = HmacDrbg(data, personalization=personalization)
+        else:
+            self._drbg.reseed(data, personalization)
+        self.name = "quantum_drbg" if self._is_quantum(source) else "classical_drbg"
+        self._since_reseed = 0
+        self.reseeds += 1
+        DRBG_RESEEDS.inc()
+
+    def read(self, num_bytes: int) -> Tuple[bytes, str]:
+        """Return `num_bytes` DRBG output bytes and the name describing how it was seeded."""
+        chunks = []
+        with self._lock:
+            # A read straddling a reseed is only as quantum as its weakest seed
+            classical = False
+            remaining = num_bytes
+            while remaining > 0:
+                if self._drbg is None or self._since_reseed >= self.reseed_bytes:
+                    self._reseed()
+                classical = classical or self.name == "classical_drbg"
+                size = min(remaining, HmacDrbg.MAX_REQUEST, self.reseed_bytes - self._since_reseed)
+                chunks.append(self._drbg.generate(size))
+                self._since_reseed += size
+                remaining -= size
+            self.bytes_generated += num_bytes
+            return b"".join(chunks), "classical_drbg" if classical else "quantum_drbg"
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "source": self.name,
+                "reseed_bytes": self.reseed_bytes,
+                "seed_bytes": self.seed_bytes,
+                "bytes_since_reseed": self._since_reseed,
+                "bytes_generated": self.bytes_generated,
+                "reseeds": self.reseeds,
+                "health_failures": self.health_failures,
+                "repetition_cutoff": self.health_tests.repetition_cutoff,
+                "proportion_cutoff": self.health_tests.proportion_cutoff,
+            }
@@ -0,0 +1,57 @@
+"""
+Builds the entropy chain described by the settings.
+
+Both the app and the shared pool's producer process (`src/serve.py`) use
+these, so the producer gets exactly the app's chain without importing the
+app and everything it sets up at import time, such as the draw ledger.
+"""
+
+from .config import Settings
+from .entropy_log import ReplayEntropySource
+from .entropy_sources import (
+    AerEntropySource,
+    EntropySource,
+    FallbackChain,
+    LazyEntropySource,
+    RuntimeEntropySource,
+    UrandomEntropySource,
+)
+from .quantum_backend import QuantumBackend
+
+
+def create_quantum_backend(settings: Settings) -> QuantumBackend:
+    """Simulator, circuit registry and bit engine, built on first use."""
+    return QuantumBackend(
+        circuit_widths=settings.circuit_widths,
+        cache_size=settings.circuit_cache_size,
+        seed=settings.simulator_seed,
+    )
+
+
+def create_entropy_source(name: str, settings: Settings, quantum: QuantumBackend) -> EntropySource:
+    """Build the entropy backend registered under `name`. Quantum backends are built on first read."""
+    if name == AerEntropySource.name:
+        return LazyEntropySource(AerEntropySource, lambda: AerEntropySource(quantum.engine))
+    if name == RuntimeEntropySource.name:
+        return LazyEntropySource(RuntimeEntropySource, lambda: RuntimeEntropySource(
+            quantum.registry, latency=settings.runtime_latency, seed=settings.simulator_seed
+        ))
+    if name == UrandomEntropySource.name:
+        return UrandomEntropySource()
+    raise ValueError(f"Unknown entropy source: {name}")
+
+
+def build_entropy_chain(settings: Settings, quantum: QuantumBackend) -> FallbackChain:
+    """The chain of entropy backends to read from, or the recorded log in replay mode."""
+    if settings.entropy_log_mode not in ("live", "record", "replay"):
+        raise ValueError(f"Unknown entropy log mode: {settings.entropy_log_mode}")
+    if settings.entropy_log_mode == "replay":
+        # Serve a recorded log instead of generating entropy
+        return FallbackChain([(ReplayEntropySource(settings.entropy_log_path), None)])
+    # Entropy backends in priority order; the last one is never timed out
+    return FallbackChain(
+        [(create_entropy_source(name, settings, quantum), settings.entropy_source_timeout)
+         for name in settings.entropy_sources[:-1]]
+        + [(create_entropy_source(settings.entropy_sources[-1], settings, quantum), None)],
+        chunk_size=settings.entropy_chunk_size,
+    )
@@ -0,0 +1,168 @@
+"""
+Record/replay log of the entropy handed out to requests.
+
+In `record` mode every entropy read made on behalf of a request is appended
+to a binary log together with the request ID and the backend that produced
+it. In `replay` mode `ReplayEntropySource` serves the recorded bytes back in
+the same order, so a production draw sequence can be reproduced offline, for
+audits or performance comparisons, without running the simulator.
+
+The log is a magic header followed by records of
+
+    request ID (16-byte UUID) | timestamp (float64) | data length (uint32) |
+    source name length (uint8) | source name | data
+
+Records are only ever appended; readers map the file into memory and slice
+records out of it without copying. Inspect a log with:
+
+    python -m src.entropy_log entropy.log
+    python -m src.entropy_log entropy.log --request-id <uuid>
+"""
+
+import argparse
+import contextvars
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import uuid
+from typing import Iterator, List, NamedTuple, Optional
+
+from .entropy_sources import EntropySource, EntropySourceError
+
+MAGIC = b"QRNGLOG1"
+_HEADER = struct.Struct("<16sdIB")
+
+# ID of the request the current entropy reads are made for. Set by the
+# request handlers; the simulator executor carries it into worker threads.
+current_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_request_id", default=None)
+
+
+class LogRecord(NamedTuple):
+    request_id: Optional[str]
+    timestamp: float
+    source: str
+    data: memoryview
+
+
+class EntropyLogWriter:
+    """Appends entropy records to a log file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+        if os.fstat(self._fd).st_size == 0:
+            os.write(self._fd, MAGIC)
+        self.records = 0
+
+    def append(self, request_id: Optional[str], source: str, data: bytes):
+        """Append one record. Each record goes to the file in a single write."""
+        request_bytes = uuid.UUID(request_id).bytes if request_id else bytes(16)
+        source_bytes = source.encode()
+        header = _HEADER.pack(request_bytes, time.time(), len(data), len(source_bytes))
+        with self._lock:
+            os.write(self._fd, header + source_bytes + bytes(data))
+            self.records += 1
+
+    def close(self):
+        with self._lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+
+
+class EntropyLogReader:
+    """Memory-mapped, read-only view over an entropy log."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < len(MAGIC):
+                raise ValueError(f"{path} is not an entropy log")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not an entropy log")
+        self._view = memoryview(self._map)
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        offset = len(MAGIC)
+        end = len(self._map)
+        while offset + _HEADER.size <= end:
+            request_bytes, timestamp, length, source_length = _HEADER.unpack_from(self._map, offset)
+            offset += _HEADER.size
+            source = bytes(self._view[offset:offset + source_length]).decode()
+            offset += source_length
+            if offset + length > end:
+                # Truncated trailing record, e.g. the writer was killed mid-write
+                return
+            request_id = str(uuid.UUID(bytes=request_bytes)) if any(request_bytes) else None
+            yield LogRecord(request_id, timestamp, source, self._view[offset:offset + length])
+            offset += length
+
+    def for_request(self, request_id: str) -> List[LogRecord]:
+        """Return the records logged for `request_id`, in order."""
+        return [record for record in self if record.request_id == request_id]
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+
+class ReplayEntropySource(EntropySource):
+    """Serves the bytes of a recorded entropy log back in their original order.
+
+    Reads may be split or merged differently from the recorded ones; only the
+    byte sequence matters, so replaying the same requests reproduces the same
+    draws. Raises EntropySourceError once the log is exhausted.
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str):
+        self.reader = EntropyLogReader(path)
+        self._records = iter(self.reader)
+        self._current = memoryview(b"")
+        self._lock = threading.Lock()
+
+    def read(self, num_bytes: int) -> bytes:
+        chunks = []
+        remaining = num_bytes
+        with self._lock:
+            while remaining > 0:
+                if not self._current:
+                    record = next(self._records, None)
+                    if record is None:
+                        raise EntropySourceError("Entropy log exhausted")
+                    self._current = record.data
+                chunk = self._current[:remaining]
+                chunks.append(bytes(chunk))
+                self._current = self._current[len(chunk):]
+                remaining -= len(chunk)
+        return b"".join(chunks)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect a recorded entropy log")
+    parser.add_argument("path", help="Entropy log file")
+    parser.add_argument("--request-id", help="Only show the records of this request and dump their bytes as hex")
+    args = parser.parse_args(argv)
+
+    reader = EntropyLogReader(args.path)
+    records = reader.for_request(args.request_id) if args.request_id else reader
+    count = total = 0
+    for record in records:
+        count += 1
+        total += len(record.data)
+        print(f"{record.timestamp:.6f}  {record.request_id or '-':<36}  {record.source:<20} {len(record.data):>10} bytes")
+        if args.request_id:
+            print(bytes(record.data).hex())
+    print(f"{count} records, {total} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Process-wide pool of pre-generated quantum entropy.
+
+A fixed-size ring buffer is kept topped up by a background thread, so request
+handlers only copy bytes out of memory instead of waiting on the simulator.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Tuple
+
+
+class EntropyPool:
+    """Ring buffer of random bytes refilled between two watermarks.
+
+    The worker starts refilling when the fill level drops below
+    `low_watermark * capacity` and stops once it reaches
+    `high_watermark * capacity`. If a caller asks for more bytes than are
+    available, the shortfall is generated synchronously on the caller's
+    thread, so `take` never blocks waiting for the worker.
+
+    `source` returns the generated bytes together with the name of the
+    backend that produced them, and the pool remembers which backend filled
+    which part of the buffer so consumers can report it.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[int], Tuple[bytes, str]],
+        capacity: int = 64 * 1024,
+        low_watermark: float = 0.25,
+        high_watermark: float = 0.9,
+        chunk_size: int = 4096,
+    ):
+        if capacity <= 0 or chunk_size <= 0:
+            raise ValueError("capacity and chunk_size must be positive")
+        if not 0 <= low_watermark < high_watermark <= 1:
+            raise ValueError("watermarks must satisfy 0 <= low < high <= 1")
+
+        self._source = source
+        self.capacity = capacity
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.chunk_size = min(chunk_size, capacity)
+
+        self._buffer = bytearray(capacity)
+        self._read_pos = 0
+        self._fill = 0
+        # (byte count, source name) runs, oldest first, covering the buffered bytes
+        self._segments = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._worker = None
+        self._stopping = False
+
+        # Statistics
+        self.bytes_produced = 0
+        self.bytes_consumed = 0
+        self.misses = 0
+        self.refill_rate = 0.0
+
+    # Buffer manipulation (callers must hold the lock)
+
+    def _write(self, data: bytes, source_name: str):
+        if not data:
+            return
+        if self._segments and self._segments[-1][1] == source_name:
+            self._segments[-1][0] += len(data)
+        else:
+            self._segments.append([len(data), source_name])
+        write_pos = (self._read_pos + self._fill) % self.capacity
+        first = min(len(data), self.capacity - write_pos)
+        self._buffer[write_pos:write_pos + first] = data[:first]
+        self._buffer[:len(data) - first] = data[first:]
+        self._fill += len(data)
+
+    def _read(self, size: int, names: List[str]) -> bytes:
+        remaining = size
+        while remaining > 0:
+            segment = self._segments[0]
+            if segment[1] not in names:
+                names.append(segment[1])
+            used = min(remaining, segment[0])
+            segment[0] -= used
+            remaining -= used
+            if segment[0] == 0:
+                self._segments.popleft()
+        first = min(size, self.capacity - self._read_pos)
+        data = bytes(self._buffer[self._read_pos:self._read_pos + first])
+        if first < size:
+            data += bytes(self._buffer[:size - first])
+        self._read_pos = (self._read_pos + size) % self.capacity
+        self._fill -= size
+        return data
+
+    # Producer side
+
+    def _generate(self, size: int) -> Tuple[bytes, str]:
+        start = time.perf_counter()
+        data, source_name = self._source(size)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            rate = len(data) / elapsed
+            # Exponential moving average so a single slow job doesn't dominate
+            self.refill_rate = rate if not self.refill_rate else 0.8 * self.refill_rate + 0.2 * rate
+        return data, source_name
+
+    def refill(self):
+        """Top the buffer up to the high watermark."""
+        target = int(self.capacity * self.high_watermark)
+        while True:
+            with self._lock:
+                missing = target - self._fill
+                if missing <= 0 or self._stopping:
+                    return
+            data, source_name = self._generate(min(missing, self.chunk_size))
+            with self._lock:
+                data = data[:self.capacity - self._fill]
+                self._write(data, source_name)
+                self.bytes_produced += len(data)
+
+    def _below_low_watermark(self) -> bool:
+        return self._fill < self.capacity * self.low_watermark
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while not self._stopping and not self._below_low_watermark():
+                    self._wakeup.wait()
+                if self._stopping:
+                    return
+            try:
+                self.refill()
+            except Exception:
+                # Keep the worker alive; callers fall back to synchronous generation
+                time.sleep(1)
+
+    def start(self):
+        """Start the background refill worker."""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stopping = False
+            self._worker = threading.Thread(target=self._run, name="entropy-pool", daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background refill worker."""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+    # Consumer side
+
+    def take(self, size: int) -> bytes:
+        """Return `size` random bytes, from the buffer when possible."""
+        return self.take_with_source(size)[0]
+
+    def take_with_source(self, size: int) -> Tuple[bytes, str]:
+        """Return `size` random bytes and the name(s) of the backends that produced them."""
+        if size <= 0:
+            return b"", ""
+        names: List[str] = []
+        with self._wakeup:
+            available = min(size, self._fill)
+            data = self._read(available, names)
+            self.bytes_consumed += size
+            if available < size:
+                self.misses += 1
+            if self._below_low_watermark():
+                self._wakeup.notify()
+        if available < size:
+            extra, source_name = self._generate(size - available)
+            data += extra
+            if source_name not in names:
+                names.append(source_name)
+        return data, "+".join(names)
+
+    def stats(self) -> Dict[str, object]:
+        """Return the current fill level and refill statistics."""
+        with self._lock:
+            fill = self._fill
+        return {
+            "capacity": self.capacity,
+            "fill": fill,
+            "fill_ratio": round(fill / self.capacity, 4),
+            "low_watermark": self.low_watermark,
+            "high_watermark": self.high_watermark,
+            "refill_rate_bytes_per_sec": round(self.refill_rate, 1),
+            "bytes_produced": self.bytes_produced,
+            "bytes_consumed": self.bytes_consumed,
+            "misses": self.misses,
+            "worker_running": self._worker is not None and self._worker.is_alive(),
+        }
@@ -0,0 +1,264 @@
+"""
+Pluggable entropy backends and a fallback chain across them.
+
+Every backend exposes the same `read(num_bytes)` interface and a `name` that
+ends up in the `source` field of responses. `FallbackChain` tries the
+backends in priority order, giving each one a timeout, so a slow or failing
+backend degrades to the next one instead of stalling draws.
+"""
+
+import itertools
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from .metrics import CLASSICAL_FALLBACKS, SIMULATOR_JOB_SECONDS, SIMULATOR_JOBS, SOURCE_FALLBACKS
+
+if TYPE_CHECKING:
+    from .bit_engine import QuantumBitEngine
+    from .circuits import CircuitRegistry
+
+
+class EntropySourceError(Exception):
+    """Raised when no entropy backend could supply the requested bytes."""
+
+
+class EntropySource(ABC):
+    """A backend that produces random bytes."""
+
+    name: str = "unknown"
+    # Whether the bytes come from quantum measurements
+    quantum: bool = True
+
+    @abstractmethod
+    def read(self, num_bytes: int) -> bytes:
+        """Return exactly `num_bytes` random bytes."""
+
+
+class AerEntropySource(EntropySource):
+    """Local Aer simulator, through the batched bit engine."""
+
+    name = "quantum_simulator"
+
+    def __init__(self, engine: "QuantumBitEngine"):
+        self.engine = engine
+
+    def read(self, num_bytes: int) -> bytes:
+        return self.engine.generate_bytes(num_bytes)
+
+
+class RuntimeEntropySource(EntropySource):
+    """Quantum runtime backend driven through the SamplerV2 primitive interface.
+
+    Pass a runtime sampler (e.g. `qiskit_ibm_runtime.SamplerV2`) to use a
+    remote or hardware backend. Without one, Aer's SamplerV2 stands in for it
+    locally, and `latency` adds an artificial round-trip delay per job so
+    the remote behaviour (and timeouts) can be exercised offline. A `seed`
+    makes the local stand-in deterministic, with a different seed per job.
+    """
+
+    name = "quantum_runtime"
+
+    def __init__(
+        self,
+        registry: "CircuitRegistry",
+        sampler=None,
+        width: int = 32,
+        latency: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self._seeds = None
+        if sampler is None:
+            from qiskit_aer.primitives import SamplerV2
+
+            sampler = SamplerV2()
+            if seed is not None:
+                # Aer's SamplerV2 reuses its seed for every run, so hand out a fresh one per job
+                self._seeds = itertools.count(seed)
+                self._sampler_class = SamplerV2
+        self.sampler = sampler
+        self.width = width
+        self.latency = latency
+        self.circuit = registry.get(width)
+
+    def read(self, num_bytes: int) -> bytes:
+        if num_bytes <= 0:
+            return b""
+        if self.latency:
+            time.sleep(self.latency)
+        shots = math.ceil(num_bytes * 8 / self.width)
+        sampler = self.sampler
+        if self._seeds is not None:
+            sampler = self._sampler_class(seed=next(self._seeds))
+        start = time.perf_counter()
+        result = sampler.run([self.circuit], shots=shots).result()
+        SIMULATOR_JOB_SECONDS.observe(time.perf_counter() - start, backend="runtime")
+        SIMULATOR_JOBS.inc(backend="runtime")
+        bit_array = getattr(result[0].data, self.circuit.cregs[0].name)
+        return bit_array.array.reshape(-1)[:num_bytes].tobytes()
+
+
+class UrandomEntropySource(EntropySource):
+    """Operating system CSPRNG. Classical, but fast and always available."""
+
+    name = "os_urandom"
+    quantum = False
+
+    def read(self, num_bytes: int) -> bytes:
+        return os.urandom(num_bytes)
+
+
+class LazyEntropySource(EntropySource):
+    """Builds the wrapped source on its first read.
+
+    Keeps backends that need Qiskit from being constructed (and Qiskit from
+    being imported) until entropy is actually requested or the startup warmup
+    builds them.
+    """
+
+    def __init__(self, source_class: Type[EntropySource], factory: Callable[[], EntropySource]):
+        self.name = source_class.name
+        self.quantum = source_class.quantum
+        self._factory = factory
+        self._source: Optional[EntropySource] = None
+        self._lock = threading.Lock()
+
+    @property
+    def source(self) -> EntropySource:
+        if self._source is None:
+            with self._lock:
+                if self._source is None:
+                    self._source = self._factory()
+        return self._source
+
+    def read(self, num_bytes: int) -> bytes:
+        return self.source.read(num_bytes)
+
+
+class FallbackChain:
+    """Reads from entropy sources in priority order, with a timeout per source.
+
+    Each entry is a `(source, timeout)` pair. Sources with a timeout run on a
+    dedicated worker thread and are abandoned when they overrun it; a timeout
+    of None runs the source inline, which suits a last-resort source such as
+    `UrandomEntropySource`. A source is skipped while an abandoned read is
+    still running, so a hung backend costs one timeout rather than one per read.
+
+    Reads are split into chunks of at most `chunk_size` bytes, each one tried
+    and timed out on its own, so the timeout bounds one chunk's generation
+    whatever the read size, and a large read can't stall a backend for long.
+    """
+
+    def __init__(self, sources: Sequence[Tuple[EntropySource, Optional[float]]], chunk_size: int = 64 * 1024):
+        if not sources:
+            raise ValueError("at least one entropy source is required")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.sources = list(sources)
+        self.chunk_size = chunk_size
+        self._workers = {
+            source.name: ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"entropy-{source.name}")
+            for source, timeout in self.sources
+            if timeout is not None
+        }
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {
+            source.name: {"reads": 0, "bytes": 0, "errors": 0, "timeouts": 0, "skipped": 0} for source, _ in self.sources
+        }
+        # Abandoned reads still running, per source
+        self._abandoned = {source.name: 0 for source, _ in self.sources}
+        self.fallbacks = 0
+
+    @property
+    def primary(self) -> str:
+        return self.sources[0][0].name
+
+    def _record(self, name: str, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[name][key] += amount
+
+    def _read_one(self, source: EntropySource, timeout: Optional[float], num_bytes: int) -> bytes:
+        if timeout is None:
+            return source.read(num_bytes)
+        future = self._workers[source.name].submit(source.read, num_bytes)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            if not future.cancel():
+                self._record_abandoned(source.name, future)
+            raise
+
+    def _record_abandoned(self, name: str, future: Future):
+        with self._lock:
+            self._abandoned[name] += 1
+
+        def finished(_):
+            with self._lock:
+                self._abandoned[name] -= 1
+
+        future.add_done_callback(finished)
+
+    def read(self, num_bytes: int) -> Tuple[bytes, str]:
+        """Return `num_bytes` random bytes and the names of the sources that produced them, joined by "+"."""
+        if num_bytes <= self.chunk_size:
+            return self._read_chunk(num_bytes)
+        chunks = []
+        names: List[str] = []
+        for offset in range(0, num_bytes, self.chunk_size):
+            data, name = self._read_chunk(min(self.chunk_size, num_bytes - offset))
+            chunks.append(data)
+            if name not in names:
+                names.append(name)
+        return b"".join(chunks), "+".join(names)
+
+    def _read_chunk(self, num_bytes: int) -> Tuple[bytes, str]:
+        for position, (source, timeout) in enumerate(self.sources):
+            if self._abandoned[source.name]:
+                self._record(source.name, "skipped")
+                continue
+            try:
+                data = self._read_one(source, timeout, num_bytes)
+            except FutureTimeoutError:
+                self._record(source.name, "timeouts")
+                continue
+            except Exception:
+                self._record(source.name, "errors")
+                continue
+            if len(data) != num_bytes:
+                self._record(source.name, "errors")
+                continue
+            self._record(source.name, "reads")
+            self._record(source.name, "bytes", num_bytes)
+            if position > 0:
+                with self._lock:
+                    self.fallbacks += 1
+                SOURCE_FALLBACKS.inc(source=source.name)
+                if not source.quantum:
+                    CLASSICAL_FALLBACKS.inc()
+            return data, source.name
+        raise EntropySourceError("All entropy sources failed")
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "chain": [
+                    {
+                        "name": source.name,
+                        "timeout": timeout,
+                        "abandoned": self._abandoned[source.name],
+                        **self._stats[source.name],
+                    }
+                    for source, timeout in self.sources
+                ],
+                "chunk_size": self.chunk_size,
+                "fallbacks": self.fallbacks,
+            }
+
+    def shutdown(self):
+        for worker in self._workers.values():
+            worker.shutdown(wait=False, cancel_futures=True)
+
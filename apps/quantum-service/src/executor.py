@@ -0,0 +1,109 @@
+"""
+Runs blocking simulator work off the asyncio event loop.
+
+Jobs go to a dedicated thread pool (Aer releases the GIL while simulating)
+behind a bounded number of in-flight slots. When every slot is taken, new
+jobs are rejected immediately instead of queueing without limit, except
+follow-up jobs of a response that has already started, which wait for a slot.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+from .metrics import EXECUTOR_QUEUE_SECONDS, EXECUTOR_REJECTIONS
+
+T = TypeVar("T")
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the simulator executor has no free slot for a new job."""
+
+
+class SimulatorExecutor:
+    """Thread pool with a bounded queue for simulator jobs."""
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64):
+        if max_workers <= 0 or max_queue < 0:
+            raise ValueError("max_workers must be positive and max_queue non-negative")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="simulator")
+        # One slot per running job plus one per queued job
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def submit(self, fn: Callable[..., T], *args, **kwargs):
+        """Submit `fn` to the pool, raising ExecutorSaturated if the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            EXECUTOR_REJECTIONS.inc()
+            raise ExecutorSaturated("Simulator queue is full")
+        return self._submit_acquired(fn, *args, **kwargs)
+
+    def _submit_acquired(self, fn: Callable[..., T], *args, **kwargs):
+        with self._lock:
+            self._in_flight += 1
+        submitted = time.perf_counter()
+
+        def timed():
+            EXECUTOR_QUEUE_SECONDS.observe(time.perf_counter() - submitted)
+            return fn(*args, **kwargs)
+
+        try:
+            future = self._pool.submit(timed)
+        except BaseException:
+            self._release()
+            raise
+        # Release the slot when the job finishes, even if the awaiting request was cancelled
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run `fn` in the pool and await its result without blocking the event loop.
+
+        Like `asyncio.to_thread`, `fn` runs in a copy of the caller's context,
+        so context variables such as the current request ID carry over.
+        """
+        context = contextvars.copy_context()
+        future = self.submit(context.run, functools.partial(fn, *args, **kwargs))
+        return await asyncio.wrap_future(future)
+
+    async def run_when_free(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Like `run`, but wait for a free slot instead of raising ExecutorSaturated.
+
+        For jobs that continue a response whose headers are already sent,
+        where a 503 can no longer be returned.
+        """
+        delay = 0.001
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        context = contextvars.copy_context()
+        future = self._submit_acquired(context.run, functools.partial(fn, *args, **kwargs))
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            "workers": self.max_workers,
+            "queue_capacity": self.max_queue,
+            "in_flight": in_flight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,409 @@
+"""
+Append-only ledger of the draws handed out, indexed by request ID.
+
+Every draw is appended to a binary ledger file with its parameters, numbers
+and entropy source, so a past draw can be re-fetched and verified by its
+request ID. Appends are a single `write` to a file opened with O_APPEND and
+cost microseconds; a background thread fsyncs the file in batches every
+`sync_interval` seconds (0 fsyncs every append).
+
+Lookups go through a separate index file: an open-addressing hash table of
+(request ID, ledger offset) slots, memory-mapped, so finding a draw takes one
+probe sequence and one read. The index can always be rebuilt from the
+ledger, and is brought up to date automatically when the ledger is opened.
+
+The ledger is a magic header followed by records of
+
+    body length (uint32) | CRC-32 (uint32) | request ID (16-byte UUID) |
+    timestamp (int64 microseconds) | flags (uint8) | algorithm (uint8) |
+    source name length (uint8) | count (uint32) | source name | values
+
+where values are min_value, max_value and the numbers as int64, or as
+comma-separated decimals when any of them doesn't fit in 64 bits. Inspect
+a ledger with:
+
+    python -m src.ledger draws.ledger
+    python -m src.ledger draws.ledger --request-id <uuid>
+    python -m src.ledger draws.ledger --rebuild-index
+"""
+
+import argparse
+import datetime
+import mmap
+import os
+import struct
+import sys
+import threading
+import uuid
+import zlib
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"QRNGDRW1"
+INDEX_MAGIC = b"QRNGIDX1"
+_RECORD = struct.Struct("<II16sqBBBI")
+_INDEX_HEADER = struct.Struct("<8sQQQ")
+_SLOT = struct.Struct("<16sQ")
+
+ALGORITHMS = ("sequential", "combination")
+_UNIQUE = 1
+_RAW_QUANTUM = 2
+_WIDE = 4
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+class DrawRecord(NamedTuple):
+    request_id: str
+    timestamp: datetime.datetime
+    min_value: int
+    max_value: int
+    count: int
+    unique: bool
+    algorithm: str
+    raw_quantum: bool
+    source: str
+    numbers: List[int]
+
+    def to_dict(self):
+        return {
+            "request_id": self.request_id,
+            "timestamp": self.timestamp.isoformat(),
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "count": self.count,
+            "unique": self.unique,
+            "algorithm": self.algorithm,
+            "raw_quantum": self.raw_quantum,
+            "source": self.source,
+            "numbers": self.numbers,
+        }
+
+
+def encode_record(
+    request_id: str,
+    timestamp: datetime.datetime,
+    min_value: int,
+    max_value: int,
+    unique: bool,
+    algorithm: str,
+    raw_quantum: bool,
+    source: str,
+    numbers: Sequence[int],
+) -> bytes:
+    """Serialize one draw as a ledger record."""
+    flags = (_UNIQUE if unique else 0) | (_RAW_QUANTUM if raw_quantum else 0)
+    if _INT64_MIN <= min_value and max_value <= _INT64_MAX:
+        values = struct.pack("<qq", min_value, max_value) + np.asarray(numbers, dtype="<i8").tobytes()
+    else:
+        flags |= _WIDE
+        values = ",".join(map(str, [min_value, max_value, *numbers])).encode()
+    source_bytes = source.encode()
+    body = source_bytes + values
+    # Naive local time, as the draw endpoints report it, stored exactly
+    micros = (timestamp - _EPOCH) // _MICROSECOND
+    header = _RECORD.pack(
+        len(body), 0, uuid.UUID(request_id).bytes, micros,
+        flags, ALGORITHMS.index(algorithm), len(source_bytes), len(numbers),
+    )
+    crc = zlib.crc32(body, zlib.crc32(header[8:]))
+    return header[:4] + struct.pack("<I", crc) + header[8:] + body
+
+
+def decode_record(header: bytes, body: bytes) -> DrawRecord:
+    """Parse a record from its header and body, raising ValueError if the checksum doesn't match."""
+    length, crc, request_bytes, micros, flags, algorithm, source_length, count = _RECORD.unpack(header)
+    if zlib.crc32(body, zlib.crc32(header[8:])) != crc:
+        raise ValueError("ledger record checksum mismatch")
+    source = body[:source_length].decode()
+    values = body[source_length:]
+    if flags & _WIDE:
+        min_value, max_value, *numbers = map(int, values.decode().split(","))
+    else:
+        min_value, max_value = struct.unpack_from("<qq", values)
+        numbers = np.frombuffer(values, dtype="<i8", offset=16).tolist()
+    return DrawRecord(
+        str(uuid.UUID(bytes=request_bytes)),
+        _EPOCH + micros * _MICROSECOND,
+        min_value,
+        max_value,
+        count,
+        bool(flags & _UNIQUE),
+        ALGORITHMS[algorithm],
+        bool(flags & _RAW_QUANTUM),
+        source,
+        numbers,
+    )
+
+
+def _slot_hash(key: bytes) -> int:
+    # Request IDs are random apart from their version and variant bits: fold both halves together
+    high, low = struct.unpack("<QQ", key)
+    return ((high ^ low) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+
+
+class LedgerIndex:
+    """Memory-mapped open-addressing hash table from request ID to ledger offset.
+
+    The header also records `indexed_end`, the ledger offset up to which
+    records have been indexed. Grows to twice its capacity once 70% full.
+    """
+
+    def __init__(self, path: str, writable: bool = True, capacity: int = 1024):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.path = path
+        self.writable = writable
+        if writable and not os.path.exists(path):
+            self._create(path, capacity)
+        self._open()
+
+    @staticmethod
+    def _create(path: str, capacity: int, indexed_end: int = len(MAGIC)):
+        with open(path, "wb") as f:
+            f.write(_INDEX_HEADER.pack(INDEX_MAGIC, capacity, 0, indexed_end))
+            f.truncate(_INDEX_HEADER.size + capacity * _SLOT.size)
+
+    def _open(self):
+        with open(self.path, "r+b" if self.writable else "rb") as f:
+            if os.fstat(f.fileno()).st_size < _INDEX_HEADER.size:
+                raise ValueError(f"{self.path} is not a ledger index")
+            access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+            self._map = mmap.mmap(f.fileno(), 0, access=access)
+        magic, self.capacity, self.count, self.indexed_end = _INDEX_HEADER.unpack_from(self._map)
+        if magic != INDEX_MAGIC or len(self._map) != _INDEX_HEADER.size + self.capacity * _SLOT.size:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a ledger index")
+
+    def _probe(self, key: bytes) -> Iterator[int]:
+        mask = self.capacity - 1
+        # Fibonacci hashing: the high bits of the product are the well-mixed ones
+        slot = _slot_hash(key) >> (64 - (self.capacity.bit_length() - 1))
+        while True:
+            yield _INDEX_HEADER.size + slot * _SLOT.size
+            slot = (slot + 1) & mask
+
+    def get(self, key: bytes) -> Optional[int]:
+        for position in self._probe(key):
+            slot_key, offset = _SLOT.unpack_from(self._map, position)
+            if offset == 0:
+                return None
+            if slot_key == key:
+                return offset
+
+    def _insert(self, key: bytes, offset: int):
+        for position in self._probe(key):
+            slot_key, slot_offset = _SLOT.unpack_from(self._map, position)
+            if slot_offset == 0 or slot_key == key:
+                _SLOT.pack_into(self._map, position, key, offset)
+                if slot_offset == 0:
+                    self.count += 1
+                return
+
+    def put(self, key: bytes, offset: int, indexed_end: int):
+        """Map `key` to `offset`, and mark the ledger indexed up to `indexed_end`."""
+        if (self.count + 1) * 10 > self.capacity * 7:
+            self._grow()
+        self._insert(key, offset)
+        self.indexed_end = indexed_end
+        _INDEX_HEADER.pack_into(self._map, 0, INDEX_MAGIC, self.capacity, self.count, indexed_end)
+
+    def _grow(self):
+        entries = [
+            _SLOT.unpack_from(self._map, _INDEX_HEADER.size + slot * _SLOT.size)
+            for slot in range(self.capacity)
+        ]
+        temporary = self.path + ".tmp"
+        self._create(temporary, self.capacity * 2, self.indexed_end)
+        self._map.close()
+        os.replace(temporary, self.path)
+        self._open()
+        for key, offset in entries:
+            if offset:
+                self._insert(key, offset)
+        _INDEX_HEADER.pack_into(self._map, 0, INDEX_MAGIC, self.capacity, self.count, self.indexed_end)
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        self._map.close()
+
+
+def _scan(fd: int, start: int, end: int) -> Iterator[Tuple[int, bytes, bytes]]:
+    """Yield (offset, header, body) for the complete records between `start` and `end`."""
+    offset = start
+    while offset + _RECORD.size <= end:
+        header = os.pread(fd, _RECORD.size, offset)
+        length = struct.unpack_from("<I", header)[0]
+        if offset + _RECORD.size + length > end:
+            # Truncated trailing record, e.g. the writer was killed mid-write
+            return
+        yield offset, header, os.pread(fd, length, offset + _RECORD.size)
+        offset += _RECORD.size + length
+
+
+def _read(fd: int, offset: int) -> DrawRecord:
+    header = os.pread(fd, _RECORD.size, offset)
+    length = struct.unpack_from("<I", header)[0]
+    return decode_record(header, os.pread(fd, length, offset + _RECORD.size))
+
+
+class DrawLedger:
+    """Appends draws to a ledger file and looks them up by request ID.
+
+    One process writes a ledger at a time; multi-worker deployments give
+    each worker its own file.
+    """
+
+    def __init__(self, path: str, sync_interval: float = 0.05):
+        self.path = path
+        self.sync_interval = sync_interval
+        self._fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+        size = os.fstat(self._fd).st_size
+        if size == 0:
+            os.write(self._fd, MAGIC)
+            size = len(MAGIC)
+        elif os.pread(self._fd, len(MAGIC), 0) != MAGIC:
+            os.close(self._fd)
+            raise ValueError(f"{path} is not a draw ledger")
+        try:
+            self.index = LedgerIndex(path + ".idx")
+        except ValueError:
+            os.remove(path + ".idx")
+            self.index = LedgerIndex(path + ".idx")
+        if self.index.indexed_end > size:
+            # The index belongs to another ledger
+            self.index.close()
+            os.remove(path + ".idx")
+            self.index = LedgerIndex(path + ".idx")
+        self._end = self._catch_up(size)
+        self.records = self.index.count
+        self._dirty = False
+        self.syncs = 0
+        self._stop = threading.Event()
+        self._syncer = None
+        if sync_interval > 0:
+            self._syncer = threading.Thread(target=self._sync_loop, name="ledger-sync", daemon=True)
+            self._syncer.start()
+
+    def _catch_up(self, size: int) -> int:
+        """Index the records appended after the index was last updated; drop a truncated tail."""
+        end = self.index.indexed_end
+        for offset, header, body in _scan(self._fd, end, size):
+            end = offset + _RECORD.size + len(body)
+            self.index.put(header[8:24], offset, end)
+        if end < size:
+            os.ftruncate(self._fd, end)
+        return end
+
+    def append(self, record: bytes) -> int:
+        """Append an encoded record and index it. Returns its offset."""
+        with self._lock:
+            offset = self._end
+            os.write(self._fd, record)
+            self._end += len(record)
+            self.index.put(record[8:24], offset, self._end)
+            self.records += 1
+            if self._syncer is None:
+                os.fsync(self._fd)
+                self.syncs += 1
+            else:
+                self._dirty = True
+        return offset
+
+    def get(self, request_id: str) -> Optional[DrawRecord]:
+        """Return the draw recorded for `request_id`, or None."""
+        with self._lock:
+            offset = self.index.get(uuid.UUID(request_id).bytes)
+        if offset is None:
+            return None
+        return _read(self._fd, offset)
+
+    def __iter__(self) -> Iterator[DrawRecord]:
+        for _, header, body in _scan(self._fd, len(MAGIC), self._end):
+            yield decode_record(header, body)
+
+    def sync(self):
+        """Flush appended records to disk."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+        os.fsync(self._fd)
+        self.index.flush()
+        self.syncs += 1
+
+    def _sync_loop(self):
+        while not self._stop.wait(self.sync_interval):
+            self.sync()
+
+    def stats(self):
+        return {"path": self.path, "records": self.records, "bytes": self._end, "syncs": self.syncs}
+
+    def close(self):
+        self._stop.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        self.sync()
+        with self._lock:
+            self.index.close()
+            os.close(self._fd)
+
+
+def lookup(path: str, request_id: str) -> Optional[DrawRecord]:
+    """Look a draw up in a ledger written by another process, through its index."""
+    try:
+        index = LedgerIndex(path + ".idx", writable=False)
+    except (OSError, ValueError):
+        return None
+    try:
+        offset = index.get(uuid.UUID(request_id).bytes)
+    finally:
+        index.close()
+    if offset is None:
+        return None
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return _read(fd, offset)
+    finally:
+        os.close(fd)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect a draw ledger")
+    parser.add_argument("path", help="Ledger file")
+    parser.add_argument("--request-id", help="Only show the draw with this request ID")
+    parser.add_argument("--rebuild-index", action="store_true", help="Rebuild the index from the ledger")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} does not exist")
+    if args.rebuild_index and os.path.exists(args.path + ".idx"):
+        os.remove(args.path + ".idx")
+    ledger = DrawLedger(args.path, sync_interval=0)
+    try:
+        if args.request_id:
+            record = ledger.get(args.request_id)
+            if record is None:
+                print(f"{args.request_id} not found")
+                return 1
+            records = [record]
+        else:
+            records = ledger
+        count = 0
+        for record in records:
+            count += 1
+            print(f"{record.timestamp.isoformat()}  {record.request_id}  {record.source:<20} {record.numbers}")
+        print(f"{count} draws")
+    finally:
+        ledger.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,92 @@
-from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 import os
 from pydantic import BaseModel
-import random
-from typing import Dict, List, Optional
+from starlette.requests import HTTPConnection
+from typing import AsyncIterator, Dict, Iterator, List, Literal, Optional, Set, Tuple, Union
+from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 import datetime
+import glob
+import math
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
-# Updated Qiskit imports
-from qiskit import QuantumCircuit
-from qiskit.primitives import BackendSampler
-from qiskit_aer import AerSimulator
+import numpy as np
+
+# Qiskit is imported lazily by QuantumBackend so the app starts serving quickly
+from .admission import AdmissionController, AdmissionRejected, RateLimited, estimate_cost
+from .batcher import MicroBatcher
+from .bit_engine import BitStream, sample_bits
+from .circuit_info import CircuitInfoCache
+from .config import settings
+from .drbg import QuantumDrbg
+from .entropy_chain import build_entropy_chain, create_quantum_backend
+from .entropy_log import EntropyLogWriter, current_request_id
+from .entropy_pool import EntropyPool
+from .entropy_sources import EntropySourceError, LazyEntropySource
+from .executor import ExecutorSaturated, SimulatorExecutor
+from .ledger import DrawLedger, DrawRecord, encode_record, lookup
+from .metrics import BITS_PER_REQUEST, DRAW_STAGE_SECONDS, REGISTRY, SUBSCRIPTION_FRAMES, Gauge, MetricsMiddleware
+from .randomness import OnlineMonitor
+from .serialization import dumps, encode_response, new_request_id
+from .shared_pool import SharedEntropyPool
+from .subscriptions import FlowControl
+from .visualization import (
+    MEDIA_TYPES,
+    ImageCache,
+    RenderedImage,
+    VisualizationUnavailable,
+    etag_matches,
+    render_circuit,
+    render_histogram,
+)
+from .sampling import (
+    MAX_COMBINATION_TABLE,
+    combination_ints,
+    combination_supported,
+    expected_bits,
+    iter_unique_ints,
+    uniform_int,
+    uniform_ints,
+    unique_ints,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep the entropy pool topped up in the background while the app runs
+    if entropy_pool is not None:
+        entropy_pool.start()
+    # Load Qiskit off the startup path so /health answers right away; /ready reports when it's done.
+    # Shared pool workers leave generation to the producer and only load it if the pool runs dry.
+    if not settings.shared_pool_name:
+        threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+    yield
+    if entropy_pool is not None:
+        entropy_pool.stop()
+    simulator_executor.shutdown(wait=False)
+    entropy_chain.shutdown()
+    if entropy_log_writer is not None:
+        entropy_log_writer.close()
+    ledger_writer.shutdown(wait=True)
+    if draw_ledger is not None:
+        draw_ledger.close()
 
 app = FastAPI(
     title="Quantum Random Number Generator API",
     description="API for generating quantum random numbers for lottery applications",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, specify actual origins
@@ -30,6 +95,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(EntropySourceError)
+async def entropy_source_error_handler(request: Request, exc: EntropySourceError):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated):
+    # Tell clients to back off instead of piling more work onto the simulator
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Quantum simulator is busy, try again later"},
+        headers={"Retry-After": "1"},
+    )
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    headers = {"Retry-After": str(math.ceil(exc.retry_after))} if exc.retry_after else None
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=headers)
+
+@app.exception_handler(VisualizationUnavailable)
+async def visualization_unavailable_handler(request: Request, exc: VisualizationUnavailable):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
 # Mount static files
 script_dir = os.path.dirname(os.path.realpath(__file__))
 static_dir = os.path.join(script_dir, "static")
@@ -40,6 +127,18 @@ class RandomNumberRequest(BaseModel):
     max_value: int = 100
     count: int = 1
     unique: bool = True
+    # "combination" draws a unique set as one rank in [0, C(n, count)), returned in ascending order
+    algorithm: Literal["sequential", "combination"] = "sequential"
+    # Serve raw entropy backend bits even when the DRBG output mode is on
+    raw_quantum: bool = False
+
+class SubscriptionRequest(RandomNumberRequest):
+    # Frames per second
+    rate: float = 1.0
+    # "json" and "int64" frames carry one draw each; "bytes" frames carry `count` raw random bytes
+    format: Literal["json", "int64", "bytes"] = "json"
+    # Frames the subscriber accepts before it has to grant more credit
+    credits: int = 16
 
 class RandomNumberResponse(BaseModel):
     numbers: List[int]
@@ -47,67 +146,296 @@ class RandomNumberResponse(BaseModel):
     timestamp: str
     request_id: str
 
-# Initialize the simulator and sampler once
-simulator = AerSimulator()
-sampler = BackendSampler(backend=simulator)
+# Simulator, circuit registry and bit engine, built on first use or by the startup warmup
+quantum = create_quantum_backend(settings)
+
+# Blocking simulator work runs here so it never stalls the event loop
+simulator_executor = SimulatorExecutor(
+    max_workers=settings.executor_workers,
+    max_queue=settings.executor_queue_size,
+)
+
+entropy_chain = build_entropy_chain(settings, quantum)
+
+# Every read handed to a request is appended to the log in record mode
+entropy_log_writer = EntropyLogWriter(settings.entropy_log_path) if settings.entropy_log_mode == "record" else None
+
+# Pre-generated entropy, refilled in the background from the entropy chain.
+# Replays read the log directly so nothing is prefetched out of order.
+entropy_pool = None
+if settings.entropy_log_mode != "replay":
+    if settings.shared_pool_name:
+        # Multi-worker deployment: a producer process fills a pool shared by all workers
+        entropy_pool = SharedEntropyPool(settings.shared_pool_name, fallback=entropy_chain.read)
+    elif settings.pool_enabled:
+        entropy_pool = EntropyPool(
+            entropy_chain.read,
+            capacity=settings.pool_capacity,
+            low_watermark=settings.pool_low_watermark,
+            high_watermark=settings.pool_high_watermark,
+            chunk_size=settings.pool_chunk_size,
+        )
+
+def read_raw_entropy(num_bytes: int) -> Tuple[bytes, str]:
+    """Return random bytes and their source, from the entropy pool or straight from the chain if it's disabled."""
+    if entropy_pool is not None:
+        return entropy_pool.take_with_source(num_bytes)
+    return entropy_chain.read(num_bytes)
+
+quantum_source_names = {source.name for source, _ in entropy_chain.sources if source.quantum}
+
+def is_quantum_source(source: str) -> bool:
+    """Whether every backend named in a `source` value is quantum."""
+    return all(name in quantum_source_names for name in source.split("+") if name)
+
+if settings.output_mode not in ("raw", "drbg"):
+    raise ValueError(f"Unknown output mode: {settings.output_mode}")
+
+# In "drbg" mode raw entropy only seeds the DRBG, except for requests asking
+# for raw bits. Replays already serve the recorded output, so they skip it.
+quantum_drbg = QuantumDrbg(
+    read_raw_entropy,
+    is_quantum_source,
+    reseed_bytes=settings.drbg_reseed_bytes,
+    seed_bytes=settings.drbg_seed_bytes,
+) if settings.output_mode == "drbg" and settings.entropy_log_mode != "replay" else None
+
+def ledger_shard_path(path: str) -> str:
+    """Ledger file of this process: workers sharing a pool each append to their own file."""
+    if not settings.shared_pool_name:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}-{os.getpid()}{extension}"
+
+# Every draw handed out, for audits through GET /api/v1/random/{request_id}
+draw_ledger = DrawLedger(
+    ledger_shard_path(settings.ledger_path),
+    sync_interval=settings.ledger_sync_interval,
+) if settings.ledger_path else None
+
+# Appends run on their own thread, in order: growing the index can take a
+# while on a large ledger and must not stall the event loop
+ledger_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ledger")
+
+# Pool and executor state, sampled whenever /metrics is scraped
+if entropy_pool is not None:
+    REGISTRY.register(Gauge(
+        "quantum_entropy_pool_fill_bytes",
+        "Bytes currently buffered in the entropy pool",
+        callback=lambda: entropy_pool.stats()["fill"],
+    ))
+    REGISTRY.register(Gauge(
+        "quantum_entropy_pool_refill_rate_bytes_per_second",
+        "Moving average of the entropy pool refill rate",
+        callback=lambda: entropy_pool.refill_rate,
+    ))
+REGISTRY.register(Gauge(
+    "quantum_executor_in_flight_jobs",
+    "Simulator jobs running or waiting for a worker",
+    callback=lambda: simulator_executor.stats()["in_flight"],
+))
+
+# Statistical tests over a small sample of the entropy handed out
+randomness_monitor = OnlineMonitor(
+    fraction=settings.randomness_sample_fraction,
+    window_bytes=settings.randomness_window_bytes,
+)
+
+def warm_up():
+    """Load Qiskit and build the quantum backends ahead of the first request."""
+    quantum.load()
+    for source, _ in entropy_chain.sources:
+        if isinstance(source, LazyEntropySource):
+            source.source
+    # Compute the circuit demonstration ahead of the first dashboard poll
+    circuit_info_cache.refresh_in_background()
+
+def read_entropy(num_bytes: int, raw: bool = False) -> Tuple[bytes, str]:
+    """Return random bytes and their source: DRBG output in "drbg" mode unless `raw`, raw entropy otherwise."""
+    if quantum_drbg is not None and not raw:
+        data, source = quantum_drbg.read(num_bytes)
+    else:
+        data, source = read_raw_entropy(num_bytes)
+    randomness_monitor.observe(data)
+    if entropy_log_writer is not None:
+        entropy_log_writer.append(current_request_id.get(), source, data)
+    return data, source
+
+def encode_draw(
+    request_id: str,
+    request: "RandomNumberRequest",
+    numbers: List[int],
+    source: str,
+    timestamp: datetime.datetime,
+) -> bytes:
+    return encode_record(
+        request_id, timestamp, request.min_value, request.max_value, request.unique,
+        request.algorithm, request.raw_quantum, source, numbers,
+    )
+
+def append_draws(records: List[bytes]):
+    for record in records:
+        draw_ledger.append(record)
+
+async def record_draws(records: List[bytes]):
+    """Append encoded draws to the ledger, if it's enabled, without blocking the event loop."""
+    if draw_ledger is not None:
+        await asyncio.get_running_loop().run_in_executor(ledger_writer, append_draws, records)
+
+async def record_draw(
+    request_id: str,
+    request: "RandomNumberRequest",
+    numbers: List[int],
+    source: str,
+    timestamp: datetime.datetime,
+):
+    """Append a draw to the ledger, if it's enabled."""
+    if draw_ledger is not None:
+        await record_draws([encode_draw(request_id, request, numbers, source, timestamp)])
+
+def find_draw(request_id: str) -> Optional[DrawRecord]:
+    """Look a draw up in this process's ledger, then in the other workers' ledgers."""
+    record = draw_ledger.get(request_id)
+    if record is None and settings.shared_pool_name:
+        root, extension = os.path.splitext(settings.ledger_path)
+        for path in glob.glob(f"{glob.escape(root)}-*{extension}"):
+            if path != draw_ledger.path:
+                record = lookup(path, request_id)
+                if record is not None:
+                    break
+    return record
+
+def start_request() -> str:
+    """Assign an ID to the current request; entropy read for it is logged under that ID."""
+    request_id = new_request_id()
+    current_request_id.set(request_id)
+    return request_id
+
+def entropy_stream(num_bits: int, raw: bool = False) -> BitStream:
+    """Return a bit stream holding at least `num_bits` random bits."""
+    sources: List[str] = []
+
+    def read(num_bytes: int) -> bytes:
+        data, source = read_entropy(num_bytes, raw)
+        for name in source.split("+"):
+            if name and name not in sources:
+                sources.append(name)
+        return data
+
+    return BitStream(read, initial=read(math.ceil(num_bits / 8)), sources=sources)
 
-def generate_quantum_random_bit():
+def describe_sources(sources: List[str]) -> str:
+    """Value of the `source` response field for entropy drawn from `sources`."""
+    return "+".join(sources) or entropy_chain.primary
+
+def generate_quantum_random_bit(stream: Optional[BitStream] = None):
     """Generate a single random bit using a quantum circuit."""
-    # Create a quantum circuit with 1 qubit
-    qc = QuantumCircuit(1, 1)
-    
-    # Put the qubit in superposition
-    qc.h(0)
-    
-    # Measure the qubit
-    qc.measure(0, 0)
-    
-    # Execute the circuit using the sampler
-    job = sampler.run(circuits=[qc], shots=1)
-    result = job.result()
-    counts = result.quasi_dists[0]
-    
-    # Get the single measurement result (0 or 1)
-    measurement = next(iter(counts.keys()))
-    
-    # Return the measured bit
-    return measurement
+    if stream is None:
+        stream = entropy_stream(1)
+    return stream.read_bit()
 
-def generate_quantum_random_number(min_value, max_value):
+def generate_quantum_random_number(min_value, max_value, stream: Optional[BitStream] = None):
     """Generate a random number in the range [min_value, max_value] using quantum randomness."""
-    range_size = max_value - min_value + 1
-    
-    # Determine how many bits we need
-    bits_needed = (range_size - 1).bit_length()
-    
-    # Generate the required number of quantum random bits
-    value = 0
-    for i in range(bits_needed):
-        bit = generate_quantum_random_bit()
-        value = (value << 1) | bit
+    if stream is None:
+        stream = entropy_stream((max_value - min_value).bit_length())
     
-    # Ensure the value is within the desired range
-    value = min_value + (value % range_size)
-    return value
+    # Rejection sampling keeps every value in the range equally likely
+    return uniform_int(stream, min_value, max_value)
+
+def estimate_request_cost(request: "RandomNumberRequest"):
+    """Expected bits and rejection rate of a validated request."""
+    return estimate_cost(request.min_value, request.max_value, request.count, request.unique, request.algorithm)
+
+def estimate_bits_needed(request: "RandomNumberRequest") -> int:
+    """Estimate how many bits a request consumes so it can be served by one entropy read."""
+    bits = estimate_request_cost(request).bits
+    # A little headroom covers unlucky rejection streaks without a second read
+    return bits + bits // 8 + 64
+
+# The dashboard page is read once and served from memory
+with open(os.path.join(static_dir, "index.html"), "rb") as f:
+    INDEX_HTML = f.read()
 
 @app.get("/", tags=["Documentation"], response_class=HTMLResponse)
 async def root():
-    with open(os.path.join(static_dir, "index.html"), "r") as f:
-        html_content = f.read()
-    return HTMLResponse(content=html_content)
+    return HTMLResponse(content=INDEX_HTML)
 
 @app.get("/health", tags=["Health"])
 async def health():
     return {"status": "healthy", "service": "quantum-random-number-generator"}
 
-@app.post("/api/v1/random", response_model=RandomNumberResponse, tags=["Random Numbers"])
-async def generate_random_numbers(request: RandomNumberRequest):
-    """
-    Generate quantum random numbers within the specified range.
-    
-    This uses Qiskit's quantum simulator to generate random numbers based on quantum measurements.
+@app.get("/ready", tags=["Health"])
+async def ready():
+    """Readiness probe: 503 until Qiskit is loaded and the quantum backends are built.
+
+    Shared pool workers are ready at once, since the producer process generates their entropy.
     """
-    # Validate request
+    status = quantum.status()
+    if settings.shared_pool_name:
+        return {"status": "ready", "shared_pool": settings.shared_pool_name, **status}
+    if not status["loaded"]:
+        return JSONResponse(status_code=503, content={"status": "starting", **status})
+    return {"status": "ready", **status}
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """Exposes service metrics in the Prometheus text format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/v1/entropy/pool", tags=["Health"])
+async def entropy_pool_stats():
+    """Returns the fill level and refill rate of the quantum entropy pool."""
+    if entropy_pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **entropy_pool.stats()}
+
+@app.get("/api/v1/entropy/sources", tags=["Health"])
+async def entropy_source_stats():
+    """Returns the entropy backend chain with per-backend reads, errors and timeouts, and the output mode."""
+    stats = entropy_chain.stats()
+    stats["output_mode"] = "drbg" if quantum_drbg is not None else "raw"
+    if quantum_drbg is not None:
+        stats["drbg"] = quantum_drbg.stats()
+    return stats
+
+@app.get("/api/v1/entropy/health", tags=["Health"])
+async def entropy_health():
+    """Returns the latest online statistical test report over sampled live entropy."""
+    return randomness_monitor.status()
+
+@app.get("/api/v1/executor", tags=["Health"])
+async def executor_stats():
+    """Returns the load on the simulator worker pool and the request coalescing statistics."""
+    stats = simulator_executor.stats()
+    stats["coalescing"] = draw_batcher.stats() if draw_batcher is not None else {"enabled": False}
+    return stats
+
+# Per-request cost limit and per-client entropy budget
+admission = AdmissionController(
+    max_request_bits=settings.admission_max_request_bits,
+    client_rate=settings.admission_client_bits_per_second,
+    client_burst=settings.admission_client_burst_bits,
+)
+
+def client_id(http_request: HTTPConnection) -> str:
+    """Who a request's cost is charged to."""
+    if settings.admission_client_header:
+        value = http_request.headers.get(settings.admission_client_header)
+        if value:
+            return value
+    return http_request.client.host if http_request.client else "unknown"
+
+def admit(http_request: HTTPConnection, bits: int):
+    """Charge `bits` to the caller, before any entropy is generated."""
+    admission.admit(client_id(http_request), bits)
+
+@app.get("/api/v1/admission", tags=["Health"])
+async def admission_stats():
+    """Returns the admission control limits and how many requests were admitted or refused."""
+    return admission.stats()
+
+def validate_random_request(request: RandomNumberRequest):
+    """Raise an HTTPException if the request can't be fulfilled."""
     if request.min_value >= request.max_value:
         raise HTTPException(status_code=400, detail="min_value must be less than max_value")
     
@@ -120,70 +448,546 @@ async def generate_random_numbers(request: RandomNumberRequest):
             detail=f"Cannot generate {request.count} unique numbers in range {request.min_value}-{request.max_value}"
         )
     
-    # Generate random numbers using quantum circuit
-    if request.unique:
-        # For unique numbers, we need to keep track of generated values
-        numbers = []
-        attempts = 0
-        max_attempts = request.count * 10  # Limit attempts to avoid infinite loops
-        
-        while len(numbers) < request.count and attempts < max_attempts:
-            new_number = generate_quantum_random_number(request.min_value, request.max_value)
-            if new_number not in numbers:
-                numbers.append(new_number)
-            attempts += 1
-            
-        if len(numbers) < request.count:
-            # If we couldn't generate enough unique numbers, fall back to classical random
-            existing_set = set(numbers)
-            remaining_numbers = [n for n in range(request.min_value, request.max_value + 1) 
-                                if n not in existing_set]
-            additional_numbers = random.sample(remaining_numbers, request.count - len(numbers))
-            numbers.extend(additional_numbers)
+    if request.algorithm == "combination":
+        if not request.unique:
+            raise HTTPException(status_code=400, detail="combination algorithm requires unique=true")
+        if not combination_supported(request.min_value, request.max_value, request.count):
+            raise HTTPException(
+                status_code=400,
+                detail=f"combination algorithm supports at most {MAX_COMBINATION_TABLE} for range size times count"
+            )
+
+def draw_numbers(request: RandomNumberRequest, stream: Optional[BitStream] = None) -> Tuple[List[int], str]:
+    """Generate the numbers for a validated request. Blocks while entropy is generated."""
+    owns_stream = stream is None
+    if owns_stream:
+        # Fetch all the quantum bits this request should need in one read
+        start = time.perf_counter()
+        stream = entropy_stream(estimate_bits_needed(request), request.raw_quantum)
+        DRAW_STAGE_SECONDS.observe(time.perf_counter() - start, stage="entropy")
+    
+    # Map the quantum bits onto the requested range without modulo bias
+    start = time.perf_counter()
+    if request.algorithm == "combination":
+        numbers = combination_ints(stream, request.min_value, request.max_value, request.count)
+    elif request.unique:
+        numbers = unique_ints(stream, request.min_value, request.max_value, request.count)
     else:
-        # For non-unique numbers, just generate the requested count
-        numbers = [generate_quantum_random_number(request.min_value, request.max_value) 
-                  for _ in range(request.count)]
-    
-    return RandomNumberResponse(
-        numbers=numbers,
-        source="quantum_simulator",
-        timestamp=datetime.datetime.now().isoformat(),
-        request_id=str(uuid.uuid4())
+        numbers = uniform_ints(stream, request.min_value, request.max_value, request.count)
+    DRAW_STAGE_SECONDS.observe(time.perf_counter() - start, stage="sampling")
+    if owns_stream:
+        BITS_PER_REQUEST.observe(stream.bits_consumed, endpoint="random")
+    
+    return numbers, describe_sources(stream.sources)
+
+@app.post("/api/v1/random", response_model=RandomNumberResponse, tags=["Random Numbers"])
+async def generate_random_numbers(
+    request: RandomNumberRequest,
+    http_request: Request,
+    accept: Optional[str] = Header(None),
+):
+    """
+    Generate quantum random numbers within the specified range.
+    
+    This uses Qiskit's quantum simulator to generate random numbers based on quantum measurements.
+    Send `Accept: application/msgpack` for a MessagePack response.
+    """
+    validate_random_request(request)
+    admit(http_request, estimate_request_cost(request).bits)
+    request_id = start_request()
+    
+    numbers, source = await draw_single(request)
+    
+    start = time.perf_counter()
+    timestamp = datetime.datetime.now()
+    await record_draw(request_id, request, numbers, source, timestamp)
+    # Encoded directly; the response model only documents the shape
+    response = encode_response({
+        "numbers": numbers,
+        "source": source,
+        "timestamp": timestamp.isoformat(),
+        "request_id": request_id,
+    }, accept)
+    DRAW_STAGE_SECONDS.observe(time.perf_counter() - start, stage="response")
+    return response
+
+def draw_batch(requests: List[RandomNumberRequest]) -> List[Tuple[List[int], str]]:
+    """Generate the numbers for several validated requests from one shared entropy read."""
+    start = time.perf_counter()
+    # Raw bits satisfy every request, so one asking for them switches the whole read
+    raw = any(request.raw_quantum for request in requests)
+    stream = entropy_stream(sum(estimate_bits_needed(request) for request in requests), raw)
+    DRAW_STAGE_SECONDS.observe(time.perf_counter() - start, stage="entropy")
+    results = [draw_numbers(request, stream) for request in requests]
+    BITS_PER_REQUEST.observe(stream.bits_consumed, endpoint="batch")
+    return results
+
+def draw_coalesced(requests: List[RandomNumberRequest]) -> List[Tuple[List[int], str]]:
+    """Like draw_batch, for single draws that arrived together; bits are still reported per draw."""
+    start = time.perf_counter()
+    # Raw bits satisfy every request, so one asking for them switches the whole read
+    raw = any(request.raw_quantum for request in requests)
+    stream = entropy_stream(sum(estimate_bits_needed(request) for request in requests), raw)
+    DRAW_STAGE_SECONDS.observe(time.perf_counter() - start, stage="entropy")
+    results = []
+    for request in requests:
+        consumed = stream.bits_consumed
+        results.append(draw_numbers(request, stream))
+        BITS_PER_REQUEST.observe(stream.bits_consumed - consumed, endpoint="random")
+    return results
+
+async def run_coalesced(requests: List[RandomNumberRequest]) -> List[Tuple[List[int], str]]:
+    return await simulator_executor.run(draw_coalesced, requests)
+
+# Concurrent single draws are coalesced into one executor job and one entropy
+# read. In record mode the shared read is logged under one of their request IDs.
+draw_batcher = MicroBatcher(
+    run_coalesced,
+    window=settings.batch_window_ms / 1000,
+    max_size=settings.batch_max_requests,
+    weight=estimate_bits_needed,
+    max_weight=settings.batch_max_bits,
+) if settings.batch_window_ms > 0 else None
+
+async def draw_single(request: RandomNumberRequest) -> Tuple[List[int], str]:
+    """Draw for one validated request, coalesced with concurrent ones unless it is large."""
+    if draw_batcher is not None and estimate_bits_needed(request) <= settings.batch_max_bits:
+        return await draw_batcher.submit(request)
+    # Large draws get their own job so small ones never wait behind them
+    return await simulator_executor.run(draw_numbers, request)
+
+@app.post("/api/v1/random/batch", response_model=List[RandomNumberResponse], tags=["Random Numbers"])
+async def generate_random_numbers_batch(
+    requests: List[RandomNumberRequest],
+    http_request: Request,
+    accept: Optional[str] = Header(None),
+):
+    """
+    Generate several independent draws in one round-trip.
+    
+    All draws are served from a single entropy read, and the responses are
+    returned in the same order as the requests.
+    """
+    if not requests:
+        raise HTTPException(status_code=400, detail="batch must contain at least one request")
+    if len(requests) > settings.max_batch_size:
+        raise HTTPException(status_code=400, detail=f"batch must not exceed {settings.max_batch_size} requests")
+    for index, request in enumerate(requests):
+        try:
+            validate_random_request(request)
+        except HTTPException as exc:
+            raise HTTPException(status_code=exc.status_code, detail=f"requests[{index}]: {exc.detail}")
+    admit(http_request, sum(estimate_request_cost(request).bits for request in requests))
+    
+    # The shared entropy read is logged under the ID of the first draw
+    request_ids = [start_request()] + [new_request_id() for _ in requests[1:]]
+    results = await simulator_executor.run(draw_batch, requests)
+    
+    timestamp = datetime.datetime.now()
+    if draw_ledger is not None:
+        await record_draws([
+            encode_draw(request_id, request, numbers, source, timestamp)
+            for request, (numbers, source), request_id in zip(requests, results, request_ids)
+        ])
+    return encode_response([
+        {"numbers": numbers, "source": source, "timestamp": timestamp.isoformat(), "request_id": request_id}
+        for (numbers, source), request_id in zip(results, request_ids)
+    ], accept)
+
+# Numbers per chunk sent by the streaming endpoint
+STREAM_CHUNK_SIZE = 8192
+# Bytes per chunk sent by the raw bytes endpoint
+BYTES_CHUNK_SIZE = 64 * 1024
+
+def iter_number_chunks(request: RandomNumberRequest, stream: BitStream) -> Iterator[List[int]]:
+    """Yield the numbers for a validated request in chunks of STREAM_CHUNK_SIZE."""
+    if request.algorithm == "combination":
+        numbers = combination_ints(stream, request.min_value, request.max_value, request.count)
+        for start in range(0, len(numbers), STREAM_CHUNK_SIZE):
+            yield numbers[start:start + STREAM_CHUNK_SIZE]
+        return
+    if request.unique:
+        yield from iter_unique_ints(stream, request.min_value, request.max_value, request.count, STREAM_CHUNK_SIZE)
+        return
+    remaining = request.count
+    while remaining > 0:
+        size = min(remaining, STREAM_CHUNK_SIZE)
+        yield uniform_ints(stream, request.min_value, request.max_value, size)
+        remaining -= size
+
+async def iterate_in_executor(iterator: Iterator) -> AsyncIterator:
+    """Advance a blocking iterator on the simulator executor, one item at a time.
+
+    Items are produced while the response streams, so they wait for a free
+    executor slot rather than fail after the headers have gone out.
+    """
+    done = object()
+    while True:
+        item = await simulator_executor.run_when_free(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+async def encode_ndjson(chunks: AsyncIterator[List[int]]) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield ("\n".join(map(str, chunk)) + "\n").encode()
+
+async def encode_int64(chunks: AsyncIterator[List[int]]) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield np.asarray(chunk, dtype="<i8").tobytes()
+
+class EntropySourceChanged(Exception):
+    """Raised mid-stream when entropy comes from a backend the X-Entropy-Source header didn't name."""
+
+def check_stream_source(announced: str, actual: str):
+    """Abort a streamed response rather than let its headers misreport where its entropy came from."""
+    if not set(actual.split("+")) <= set(announced.split("+")):
+        raise EntropySourceChanged(f"entropy source changed from {announced} to {actual} mid-stream")
+
+async def announced_source_only(chunks: AsyncIterator[List[int]], stream: BitStream, source: str) -> AsyncIterator[List[int]]:
+    async for chunk in chunks:
+        check_stream_source(source, describe_sources(stream.sources))
+        yield chunk
+
+@app.get("/api/v1/random/bytes", tags=["Random Numbers"])
+async def generate_random_bytes(
+    http_request: Request,
+    length: int = Query(..., gt=0, le=settings.max_bytes_length),
+    raw_quantum: bool = False,
+):
+    """
+    Stream `length` raw quantum random bytes as application/octet-stream.
+    
+    In the DRBG output mode, pass `raw_quantum=true` to bypass the DRBG.
+    If a later chunk would come from a backend other than the one named in
+    `X-Entropy-Source`, the response is cut short instead.
+    """
+    admit(http_request, length * 8)
+    request_id = start_request()
+    # Produce the first chunk up front so its source can go in the headers
+    first_chunk, source = await simulator_executor.run(read_entropy, min(length, BYTES_CHUNK_SIZE), raw_quantum)
+
+    async def chunks():
+        yield first_chunk
+        remaining = length - len(first_chunk)
+        while remaining > 0:
+            size = min(remaining, BYTES_CHUNK_SIZE)
+            # Past the headers a 503 is no longer possible, so wait for a slot
+            data, chunk_source = await simulator_executor.run_when_free(read_entropy, size, raw_quantum)
+            check_stream_source(source, chunk_source)
+            yield data
+            remaining -= size
+
+    return StreamingResponse(
+        chunks(),
+        media_type="application/octet-stream",
+        headers={"Content-Length": str(length), "X-Entropy-Source": source, "X-Request-ID": request_id},
     )
 
-@app.get("/api/v1/quantum-circuit", tags=["Visualization"])
-async def get_quantum_circuit_info():
-    """Returns information about the quantum circuit used for random number generation."""
-    # Create a quantum circuit with 1 qubit
-    qc = QuantumCircuit(1, 1)
+@app.post("/api/v1/random/stream", tags=["Random Numbers"])
+async def stream_random_numbers(
+    request: RandomNumberRequest,
+    http_request: Request,
+    output_format: str = Query("ndjson", alias="format", pattern="^(ndjson|int64)$"),
+):
+    """
+    Stream quantum random numbers without building the whole result in memory.
+    
+    `ndjson` sends one number per line; `int64` sends packed little-endian
+    signed 64-bit integers. As with `/api/v1/random/bytes`, the stream is cut
+    short if its entropy stops coming from the backend in `X-Entropy-Source`.
+    """
+    validate_random_request(request)
+    if request.count > settings.max_stream_count:
+        raise HTTPException(status_code=400, detail=f"count must not exceed {settings.max_stream_count}")
+    if output_format == "int64" and not (-(1 << 63) <= request.min_value and request.max_value < (1 << 63)):
+        raise HTTPException(status_code=400, detail="int64 format requires values within the signed 64-bit range")
+    # The whole stream is charged up front
+    admit(http_request, estimate_request_cost(request).bits)
+    request_id = start_request()
+    
+    first_chunk = min(request.count, STREAM_CHUNK_SIZE)
+    stream = await simulator_executor.run(
+        entropy_stream,
+        expected_bits(request.min_value, request.max_value, first_chunk, request.unique),
+        request.raw_quantum,
+    )
+    source = describe_sources(stream.sources)
+    chunks = announced_source_only(iterate_in_executor(iter_number_chunks(request, stream)), stream, source)
+    if output_format == "int64":
+        return StreamingResponse(
+            encode_int64(chunks),
+            media_type="application/octet-stream",
+            headers={"X-Number-Format": "int64-le", "X-Entropy-Source": source, "X-Request-ID": request_id},
+        )
+    return StreamingResponse(
+        encode_ndjson(chunks),
+        media_type="application/x-ndjson",
+        headers={"X-Entropy-Source": source, "X-Request-ID": request_id},
+    )
+
+# Declared after /api/v1/random/bytes so that path isn't taken for a request ID
+@app.get("/api/v1/random/{request_id}", tags=["Random Numbers"])
+async def get_recorded_draw(request_id: str, accept: Optional[str] = Header(None)):
+    """
+    Re-fetch a past draw from the draw ledger by its request ID, with its parameters and entropy source.
+    """
+    if draw_ledger is None:
+        raise HTTPException(status_code=404, detail="Draw ledger is not enabled")
+    try:
+        uuid.UUID(request_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Draw not found")
+    # Lookups wait for the ledger lock while the index grows, so keep them off the event loop
+    record = await asyncio.to_thread(find_draw, request_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Draw not found")
+    return encode_response(record.to_dict(), accept)
+
+# Flow control state of every open subscription
+active_subscriptions: Set[FlowControl] = set()
+
+REGISTRY.register(Gauge(
+    "quantum_active_subscriptions",
+    "Open WebSocket random number subscriptions",
+    callback=lambda: len(active_subscriptions),
+))
+
+def validate_subscription(spec: SubscriptionRequest):
+    """Raise an HTTPException if the subscription can't be served."""
+    if spec.format == "bytes":
+        # Byte frames only use `count`; the range fields don't apply
+        if not 0 < spec.count <= BYTES_CHUNK_SIZE:
+            raise HTTPException(status_code=400, detail=f"bytes frames must be between 1 and {BYTES_CHUNK_SIZE} bytes")
+    else:
+        validate_random_request(spec)
+    if not 0 < spec.rate <= settings.subscription_max_rate:
+        raise HTTPException(status_code=400, detail=f"rate must be positive and at most {settings.subscription_max_rate}")
+    if spec.credits < 0:
+        raise HTTPException(status_code=400, detail="credits must not be negative")
+    if spec.format == "int64" and not (-(1 << 63) <= spec.min_value and spec.max_value < (1 << 63)):
+        raise HTTPException(status_code=400, detail="int64 format requires values within the signed 64-bit range")
+
+async def subscription_frame(spec: SubscriptionRequest) -> Union[str, bytes]:
+    """Generate the next frame of a subscription, through the same path as single draws."""
+    request_id = start_request()
+    if spec.format == "bytes":
+        data, _ = await simulator_executor.run(read_entropy, spec.count, spec.raw_quantum)
+        return data
+    numbers, source = await draw_single(spec)
+    timestamp = datetime.datetime.now()
+    await record_draw(request_id, spec, numbers, source, timestamp)
+    if spec.format == "int64":
+        # The request ID leads the frame so binary draws can be looked up too
+        return uuid.UUID(request_id).bytes + np.asarray(numbers, dtype="<i8").tobytes()
+    return dumps({
+        "numbers": numbers,
+        "source": source,
+        "timestamp": timestamp.isoformat(),
+        "request_id": request_id,
+    }).decode()
+
+async def close_with_error(websocket: WebSocket, code: int, detail: str):
+    # The connection may already be gone
+    try:
+        await websocket.send_text(dumps({"error": detail}).decode())
+        await websocket.close(code=code)
+    except (RuntimeError, OSError, WebSocketDisconnect):
+        pass
+
+@app.websocket("/api/v1/random/subscribe")
+async def subscribe_random_numbers(websocket: WebSocket):
+    """
+    Push a continuous feed of draws or raw bytes over a WebSocket.
     
-    # Put the qubit in superposition
-    qc.h(0)
+    The first message is the subscription: a `/api/v1/random` request body
+    plus `rate` (frames per second), `format` (`json`, `int64` or `bytes`)
+    and `credits`. The server acknowledges it, then sends one frame per
+    credit, no faster than `rate`; send `{"credit": n}` to grant more.
+    """
+    await websocket.accept()
+    try:
+        spec = SubscriptionRequest.model_validate(await websocket.receive_json())
+        validate_subscription(spec)
+    except WebSocketDisconnect:
+        return
+    except HTTPException as exc:
+        await close_with_error(websocket, 1008, exc.detail)
+        return
+    except ValueError as exc:
+        await close_with_error(websocket, 1008, f"invalid subscription: {exc}")
+        return
+    
+    cost = spec.count * 8 if spec.format == "bytes" else estimate_request_cost(spec).bits
+    flow = FlowControl(spec.rate, spec.credits, settings.subscription_max_credits)
+    await websocket.send_text(dumps({
+        "subscribed": True,
+        "format": spec.format,
+        "rate": spec.rate,
+        "credits": flow.credits,
+        "max_credits": flow.max_credits,
+    }).decode())
+    
+    async def receive_credits():
+        while True:
+            message = await websocket.receive_json()
+            credit = message.get("credit") if isinstance(message, dict) else None
+            if not isinstance(credit, int) or credit <= 0:
+                raise ValueError('expected {"credit": <positive integer>}')
+            flow.grant(credit)
     
-    # Measure the qubit
-    qc.measure(0, 0)
+    async def push_frames():
+        while True:
+            await flow.acquire()
+            while True:
+                try:
+                    # Subscribers draw on the same entropy budget as requests, and wait for it to refill
+                    admit(websocket, cost)
+                    frame = await subscription_frame(spec)
+                    break
+                except RateLimited as exc:
+                    await asyncio.sleep(exc.retry_after)
+                except ExecutorSaturated:
+                    await asyncio.sleep(1)
+            if isinstance(frame, bytes):
+                await websocket.send_bytes(frame)
+            else:
+                await websocket.send_text(frame)
+            SUBSCRIPTION_FRAMES.inc(format=spec.format)
     
+    active_subscriptions.add(flow)
+    tasks = [asyncio.ensure_future(receive_credits()), asyncio.ensure_future(push_frames())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        active_subscriptions.discard(flow)
+    
+    exc = next(iter(done)).exception()
+    if exc is None or isinstance(exc, (WebSocketDisconnect, OSError)):
+        return
+    if isinstance(exc, ValueError):
+        await close_with_error(websocket, 1008, str(exc))
+    elif isinstance(exc, AdmissionRejected):
+        await close_with_error(websocket, 1008, exc.detail)
+    elif isinstance(exc, EntropySourceError):
+        await close_with_error(websocket, 1011, str(exc))
+    else:
+        await close_with_error(websocket, 1011, "internal error")
+        raise exc
+
+def run_circuit_demo() -> Dict[str, int]:
+    """Run the single-qubit demonstration circuit and return its measurement counts."""
+    # The demonstration circuit never changes, so reuse the registry's copy
+    demo_circuit = quantum.registry.get(1)
     # Execute the circuit with multiple shots to demonstrate the distribution
-    job = sampler.run(circuits=[qc], shots=1000)
-    result = job.result()
-    counts = result.quasi_dists[0]
+    bit_array = sample_bits(quantum.simulator, demo_circuit, shots=1000, seed=settings.simulator_seed)
     
-    # Format counts for the response
+    # Exact per-outcome shot counts, with both outcomes always present
     measurement_counts = {"0": 0, "1": 0}
-    for outcome, probability in counts.items():
-        measurement_counts[str(outcome)] = int(probability * 1000)
-    
-    # Return information about the circuit and its results
+    measurement_counts.update(bit_array.get_counts())
+    return measurement_counts
+
+def build_circuit_info() -> Dict:
+    """Run the demonstration circuit and describe it together with its results."""
+    demo_circuit = quantum.registry.get(1)
     return {
         "circuit_description": "Hadamard gate followed by measurement",
-        "circuit_qubits": 1,
-        "circuit_depth": 2,
-        "measurement_counts": measurement_counts,
+        "circuit_qubits": demo_circuit.num_qubits,
+        "circuit_depth": demo_circuit.depth(),
+        "measurement_counts": run_circuit_demo(),
         "explanation": "This quantum circuit places a qubit in superposition using a Hadamard gate, "
                      "creating an equal probability of measuring 0 or 1. The measurement then "
-                     "collapses the superposition, providing a truly random bit."
+                     "collapses the superposition, providing a truly random bit.",
+        "computed_at": datetime.datetime.now().isoformat(),
     }
 
+circuit_info_cache = CircuitInfoCache(build_circuit_info, ttl=settings.circuit_info_ttl)
+
+@app.get("/api/v1/quantum-circuit", tags=["Visualization"])
+async def get_quantum_circuit_info():
+    """Returns information about the quantum circuit used for random number generation."""
+    # Served from memory; the simulation only runs when the cache is empty
+    info = circuit_info_cache.peek()
+    if info is None:
+        return await simulator_executor.run(circuit_info_cache.get)
+    return circuit_info_cache.get()
+
+@app.post("/api/v1/quantum-circuit/refresh", tags=["Visualization"])
+async def refresh_quantum_circuit_info():
+    """Re-runs the demonstration circuit and replaces the cached result."""
+    return await simulator_executor.run(circuit_info_cache.refresh)
+
+# Widest circuit diagram, widest histogram (one bar per outcome) and most histogram shots served
+MAX_DIAGRAM_WIDTH = 16
+MAX_HISTOGRAM_WIDTH = 8
+MAX_HISTOGRAM_SHOTS = 100_000
+IMAGE_FORMAT_PATTERN = "^(" + "|".join(MEDIA_TYPES) + ")$"
+
+image_cache = ImageCache(max_entries=settings.image_cache_size)
+
+def histogram_image(width: int, shots: int, image_format: str) -> Tuple[bytes, str]:
+    """Sample the random-bit circuit and plot every outcome's count."""
+    bit_array = sample_bits(quantum.simulator, quantum.registry.get(width), shots=shots, seed=settings.simulator_seed)
+    counts = {format(outcome, f"0{width}b"): 0 for outcome in range(1 << width)}
+    counts.update(bit_array.get_counts())
+    return render_histogram(counts, shots, image_format), MEDIA_TYPES[image_format]
+
+async def cached_image(key: Tuple, render) -> RenderedImage:
+    # Cache hits never leave the event loop; renders run on the simulator executor
+    image = image_cache.peek(key)
+    if image is None:
+        image = await simulator_executor.run(image_cache.get, key, render)
+    return image
+
+def image_response(image: RenderedImage, if_none_match: Optional[str]) -> Response:
+    headers = {"ETag": image.etag, "Cache-Control": "public, max-age=3600"}
+    if etag_matches(if_none_match, image.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=image.body, media_type=image.media_type, headers=headers)
+
+@app.get("/api/v1/quantum-circuit/image/circuit", tags=["Visualization"])
+async def get_circuit_image(
+    width: int = Query(1, ge=1, le=MAX_DIAGRAM_WIDTH),
+    image_format: str = Query("png", alias="format", pattern=IMAGE_FORMAT_PATTERN),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Diagram of the `width`-qubit random-bit circuit as `png`, `svg` or `txt`.
+    
+    Rendered once and then served from memory; send `If-None-Match` with the
+    ETag to get `304 Not Modified`. `png` and `svg` need matplotlib.
+    """
+    image = await cached_image(
+        ("circuit", width, image_format),
+        lambda: (render_circuit(width, image_format), MEDIA_TYPES[image_format]),
+    )
+    return image_response(image, if_none_match)
+
+@app.get("/api/v1/quantum-circuit/image/histogram", tags=["Visualization"])
+async def get_histogram_image(
+    width: int = Query(1, ge=1, le=MAX_HISTOGRAM_WIDTH),
+    shots: int = Query(1000, ge=1, le=MAX_HISTOGRAM_SHOTS),
+    image_format: str = Query("png", alias="format", pattern=IMAGE_FORMAT_PATTERN),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Histogram of `shots` measurements of the `width`-qubit circuit as `png`, `svg` or `txt`.
+    
+    Simulated and rendered once per (width, shots, format), then served from
+    memory with an ETag like the circuit diagram.
+    """
+    image = await cached_image(
+        ("histogram", width, shots, image_format),
+        lambda: histogram_image(width, shots, image_format),
+    )
+    return image_response(image, if_none_match)
+
+@app.get("/api/v1/quantum-circuit/image/cache", tags=["Visualization"])
+async def image_cache_stats():
+    """Returns how many rendered images are cached and how often they were reused."""
+    return image_cache.stats()
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8002, reload=True)
\ No newline at end of file
+    uvicorn.run("src.main:app", host="0.0.0.0", port=8002, reload=True)
\ No newline at end of file
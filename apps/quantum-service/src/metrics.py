@@ -0,0 +1,294 @@
+"""
+Minimal Prometheus-compatible metrics.
+
+Counters, gauges and histograms with labels, rendered in the Prometheus text
+exposition format by the `/metrics` endpoint. All metrics live in the
+module-level `REGISTRY` and are defined at the bottom of this module so every
+part of the service records into the same place.
+"""
+
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, LabelValues, Sequence[str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for name, values, extra_names, value in self.samples():
+            labels = _format_labels(self.labelnames + tuple(extra_names), values)
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        # Unlabelled counters are exported as 0 until first incremented
+        self._values: Dict[LabelValues, float] = {} if labelnames else {(): 0}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, key, (), value
+
+
+class Gauge(Metric):
+    """Value that can go up and down, either set directly or read from a callback."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        if self.callback is not None:
+            value = self.callback()
+            if value is not None:
+                yield self.name, (), (), value
+            return
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, key, (), value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type_name = "histogram"
+
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[-1] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                yield self.name + "_bucket", key + (_format_value(bound),), ("le",), cumulative
+            yield self.name + "_sum", key, (), state[-2]
+            yield self.name + "_count", key, (), state[-1]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording HTTP request latency by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"],
+            )
+
+
+REGISTRY = Registry()
+
+# Size buckets for bit counts, from a single lottery draw up to bulk pulls
+BIT_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "quantum_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status"),
+))
+DRAW_STAGE_SECONDS = REGISTRY.register(Histogram(
+    "quantum_draw_stage_duration_seconds",
+    "Time spent in each stage of the draw pipeline",
+    ("stage",),
+))
+SIMULATOR_JOBS = REGISTRY.register(Counter(
+    "quantum_simulator_jobs_total",
+    "Simulator jobs run, by backend",
+    ("backend",),
+))
+SIMULATOR_JOB_SECONDS = REGISTRY.register(Histogram(
+    "quantum_simulator_job_duration_seconds",
+    "Simulator job duration, by backend",
+    ("backend",),
+))
+BITS_PER_REQUEST = REGISTRY.register(Histogram(
+    "quantum_request_bits_consumed",
+    "Random bits consumed per draw request",
+    ("endpoint",),
+    buckets=BIT_BUCKETS,
+))
+SAMPLING_REJECTIONS = REGISTRY.register(Counter(
+    "quantum_sampling_rejections_total",
+    "Candidate values discarded by rejection sampling for falling outside the range",
+))
+UNIQUE_RETRIES = REGISTRY.register(Counter(
+    "quantum_unique_draw_retries_total",
+    "Candidate values discarded by unique draws because they were already drawn",
+))
+SOURCE_FALLBACKS = REGISTRY.register(Counter(
+    "quantum_entropy_fallbacks_total",
+    "Reads served by a lower-priority entropy source, by the source that served them",
+    ("source",),
+))
+CLASSICAL_FALLBACKS = REGISTRY.register(Counter(
+    "quantum_classical_fallbacks_total",
+    "Reads served by a classical (non-quantum) entropy source",
+))
+COALESCED_BATCH_SIZE = REGISTRY.register(Histogram(
+    "quantum_coalesced_batch_size",
+    "Concurrent draw requests served together by the micro-batching scheduler",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+))
+EXECUTOR_QUEUE_SECONDS = REGISTRY.register(Histogram(
+    "quantum_executor_queue_seconds",
+    "Time simulator jobs wait for a free worker",
+))
+EXECUTOR_REJECTIONS = REGISTRY.register(Counter(
+    "quantum_executor_rejections_total",
+    "Jobs rejected because the simulator queue was full",
+))
+ADMISSION_REJECTIONS = REGISTRY.register(Counter(
+    "quantum_admission_rejections_total",
+    "Requests refused by admission control, by reason",
+    ("reason",),
+))
+DRBG_RESEEDS = REGISTRY.register(Counter(
+    "quantum_drbg_reseeds_total",
+    "Times the DRBG output mode was reseeded from raw entropy",
+))
+DRBG_HEALTH_FAILURES = REGISTRY.register(Counter(
+    "quantum_drbg_health_test_failures_total",
+    "Raw entropy rejected by the continuous health tests, by test",
+    ("test",),
+))
+SUBSCRIPTION_FRAMES = REGISTRY.register(Counter(
+    "quantum_subscription_frames_total",
+    "Frames pushed to WebSocket subscribers, by frame format",
+    ("format",),
+))
@@ -0,0 +1,77 @@
+"""
+Lazily loaded Qiskit objects.
+
+Importing Qiskit and Aer and transpiling the preloaded circuits takes over a
+second, so nothing quantum is touched at import time. `QuantumBackend` builds
+the simulator, circuit registry and bit engine the first time any of
+them is needed, or ahead of time when the app's startup warmup calls `load`.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+
+class QuantumBackend:
+    """Simulator, circuit registry and bit engine, created on first use."""
+
+    def __init__(self, circuit_widths: Iterable[int] = (1, 8, 32), cache_size: int = 16, seed: Optional[int] = None):
+        self.circuit_widths = tuple(circuit_widths)
+        self.cache_size = cache_size
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def load(self) -> "QuantumBackend":
+        """Import Qiskit and build every object. Safe to call repeatedly and from any thread."""
+        if self._loaded.is_set():
+            return self
+        with self._lock:
+            if self._loaded.is_set():
+                return self
+            start = time.perf_counter()
+            try:
+                from qiskit_aer import AerSimulator
+
+                from .bit_engine import QuantumBitEngine
+                from .circuits import CircuitRegistry
+
+                simulator = AerSimulator()
+                # Random-bit circuits built and transpiled once per width
+                registry = CircuitRegistry(simulator, preload=self.circuit_widths, cache_size=self.cache_size)
+                # Batched bit generator: one wide circuit, many shots per simulator job
+                engine = QuantumBitEngine(simulator, registry=registry, seed=self.seed)
+            except Exception as exc:
+                self.error = f"{type(exc).__name__}: {exc}"
+                raise
+            self._simulator = simulator
+            self._registry = registry
+            self._engine = engine
+            self.error = None
+            self.load_seconds = time.perf_counter() - start
+            self._loaded.set()
+        return self
+
+    def is_loaded(self) -> bool:
+        return self._loaded.is_set()
+
+    @property
+    def simulator(self):
+        return self.load()._simulator
+
+    @property
+    def registry(self):
+        return self.load()._registry
+
+    @property
+    def engine(self):
+        return self.load()._engine
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "loaded": self.is_loaded(),
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "error": self.error,
+        }
@@ -0,0 +1,287 @@
+"""
+Statistical tests for generated randomness.
+
+NumPy-vectorized versions of a subset of NIST SP 800-22 (frequency, block
+frequency, runs, longest run of ones, cumulative sums) plus a byte-level
+chi-square, serial correlation and a chi-square on numbers mapped onto a
+range. They are fast enough to analyze megabytes of pool output, and are
+available both as a CLI over captured bytes:
+
+    python -m src.randomness captured.bin
+    curl -s "localhost:8002/api/v1/random/bytes?length=1048576" | python -m src.randomness -
+
+and as `OnlineMonitor`, which checks a small fraction of live entropy in the
+background.
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .metrics import REGISTRY, Counter
+
+# Significance level recommended by NIST SP 800-22
+DEFAULT_ALPHA = 0.01
+
+RANDOMNESS_TEST_RUNS = REGISTRY.register(Counter(
+    "quantum_randomness_test_runs_total",
+    "Online randomness test runs over sampled entropy",
+))
+RANDOMNESS_TEST_FAILURES = REGISTRY.register(Counter(
+    "quantum_randomness_test_failures_total",
+    "Online randomness tests that failed, by test",
+    ("test",),
+))
+
+
+# scipy.special takes a noticeable share of the service's import time, so
+# it is only imported once a test actually runs
+
+
+def erfc(x):
+    from scipy.special import erfc as _erfc
+
+    return _erfc(x)
+
+
+def gammaincc(a, x):
+    from scipy.special import gammaincc as _gammaincc
+
+    return _gammaincc(a, x)
+
+
+def to_bits(data) -> np.ndarray:
+    """Unpack bytes (or a uint8 array) into an array of 0/1 values."""
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8) if not isinstance(data, np.ndarray) else data)
+
+
+def _result(statistic: float, p_value: float, alpha: float, **extra) -> Dict:
+    return {"statistic": float(statistic), "p_value": float(p_value), "passed": bool(p_value >= alpha), **extra}
+
+
+def frequency_test(bits: np.ndarray, alpha: float = DEFAULT_ALPHA) -> Dict:
+    """NIST 2.1: proportion of ones over the whole sequence."""
+    n = bits.size
+    s_obs = abs(2 * int(bits.sum()) - n) / math.sqrt(n)
+    return _result(s_obs, erfc(s_obs / math.sqrt(2)), alpha)
+
+
+def block_frequency_test(bits: np.ndarray, block_size: int = 128, alpha: float = DEFAULT_ALPHA) -> Dict:
+    """NIST 2.2: proportion of ones within fixed-size blocks."""
+    num_blocks = bits.size // block_size
+    blocks = bits[:num_blocks * block_size].reshape(num_blocks, block_size)
+    proportions = blocks.mean(axis=1)
+    chi_square = 4 * block_size * float(((proportions - 0.5) ** 2).sum())
+    return _result(chi_square, gammaincc(num_blocks / 2, chi_square / 2), alpha, block_size=block_size)
+
+
+def runs_test(bits: np.ndarray, alpha: float = DEFAULT_ALPHA) -> Dict:
+    """NIST 2.3: number of uninterrupted runs of identical bits."""
+    n = bits.size
+    pi = bits.mean()
+    # The test is only meaningful if the frequency test would pass
+    if abs(pi - 0.5) >= 2 / math.sqrt(n):
+        return _result(0.0, 0.0, alpha)
+    runs = 1 + int(np.count_nonzero(bits[1:] != bits[:-1]))
+    numerator = abs(runs - 2 * n * pi * (1 - pi))
+    denominator = 2 * math.sqrt(2 * n) * pi * (1 - pi)
+    return _result(runs, erfc(numerator / denominator), alpha)
+
+
+# NIST 2.4 parameters for M = 10000: category bounds and probabilities
+_LONGEST_RUN_CATEGORIES = (10, 11, 12, 13, 14, 15, 16)
+_LONGEST_RUN_PROBABILITIES = (0.0882, 0.2092, 0.2483, 0.1933, 0.1208, 0.0675, 0.0727)
+
+
+def longest_run_test(bits: np.ndarray, alpha: float = DEFAULT_ALPHA) -> Optional[Dict]:
+    """NIST 2.4: longest run of ones in 10000-bit blocks. Needs at least 750,000 bits."""
+    block_size = 10000
+    if bits.size < 750000:
+        return None
+    num_blocks = bits.size // block_size
+    blocks = bits[:num_blocks * block_size].reshape(num_blocks, block_size).astype(np.int8)
+
+    # Longest run of ones per block: positions of run boundaries via diff on a zero-padded copy
+    padded = np.zeros((num_blocks, block_size + 2), dtype=np.int8)
+    padded[:, 1:-1] = blocks
+    edges = np.diff(padded, axis=1)
+    longest = np.zeros(num_blocks, dtype=np.int64)
+    for row in range(num_blocks):
+        starts = np.flatnonzero(edges[row] == 1)
+        ends = np.flatnonzero(edges[row] == -1)
+        if starts.size:
+            longest[row] = (ends - starts).max()
+
+    low, high = _LONGEST_RUN_CATEGORIES[0], _LONGEST_RUN_CATEGORIES[-1]
+    categories = np.clip(longest, low, high) - low
+    observed = np.bincount(categories, minlength=len(_LONGEST_RUN_PROBABILITIES))
+    expected = num_blocks * np.asarray(_LONGEST_RUN_PROBABILITIES)
+    chi_square = float(((observed - expected) ** 2 / expected).sum())
+    return _result(chi_square, gammaincc((len(expected) - 1) / 2, chi_square / 2), alpha)
+
+
+def cumulative_sums_test(bits: np.ndarray, alpha: float = DEFAULT_ALPHA) -> Dict:
+    """NIST 2.13 (forward mode): maximal excursion of the random walk of +/-1 steps."""
+    n = bits.size
+    walk = np.cumsum(2 * bits.astype(np.int64) - 1)
+    z = int(np.abs(walk).max())
+    if z == 0:
+        return _result(0, 1.0, alpha)
+
+    def normal_cdf(x):
+        return 0.5 * erfc(-x / math.sqrt(2))
+
+    sqrt_n = math.sqrt(n)
+    k1 = np.arange((-n / z + 1) // 4, (n / z - 1) // 4 + 1)
+    k2 = np.arange((-n / z - 3) // 4, (n / z - 1) // 4 + 1)
+    total1 = (normal_cdf((4 * k1 + 1) * z / sqrt_n) - normal_cdf((4 * k1 - 1) * z / sqrt_n)).sum()
+    total2 = (normal_cdf((4 * k2 + 3) * z / sqrt_n) - normal_cdf((4 * k2 + 1) * z / sqrt_n)).sum()
+    p_value = 1 - total1 + total2
+    return _result(z, min(max(p_value, 0.0), 1.0), alpha)
+
+
+def byte_chi_square_test(data: np.ndarray, alpha: float = DEFAULT_ALPHA) -> Dict:
+    """Chi-square goodness of fit of byte values against the uniform distribution."""
+    observed = np.bincount(data, minlength=256)
+    expected = data.size / 256
+    chi_square = float(((observed - expected) ** 2).sum() / expected)
+    return _result(chi_square, gammaincc(255 / 2, chi_square / 2), alpha)
+
+
+def serial_correlation_test(data: np.ndarray, alpha: float = DEFAULT_ALPHA) -> Dict:
+    """Correlation between each byte and the next one; close to 0 for random data."""
+    values = data.astype(np.float64)
+    x, y = values[:-1], values[1:]
+    if x.std() == 0 or y.std() == 0:
+        return _result(1.0, 0.0, alpha)
+    correlation = float(np.corrcoef(x, y)[0, 1])
+    # Under independence, r * sqrt(n) is approximately standard normal
+    p_value = erfc(abs(correlation) * math.sqrt(x.size) / math.sqrt(2))
+    return _result(correlation, p_value, alpha)
+
+
+def range_chi_square_test(numbers: Iterable[int], min_value: int, max_value: int, alpha: float = DEFAULT_ALPHA) -> Dict:
+    """Chi-square test that numbers mapped onto [min_value, max_value] are uniform."""
+    values = np.asarray(list(numbers), dtype=np.int64) - min_value
+    categories = max_value - min_value + 1
+    observed = np.bincount(values, minlength=categories)
+    expected = values.size / categories
+    chi_square = float(((observed - expected) ** 2).sum() / expected)
+    return _result(chi_square, gammaincc((categories - 1) / 2, chi_square / 2), alpha)
+
+
+def run_all(data: bytes, alpha: float = DEFAULT_ALPHA) -> Dict:
+    """Run every byte-stream test over `data` and summarize the results."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if raw.size < 128:
+        raise ValueError("at least 128 bytes are required")
+    bits = np.unpackbits(raw)
+    start = time.perf_counter()
+    tests = {
+        "frequency": frequency_test(bits, alpha),
+        "block_frequency": block_frequency_test(bits, alpha=alpha),
+        "runs": runs_test(bits, alpha),
+        "longest_run": longest_run_test(bits, alpha),
+        "cumulative_sums": cumulative_sums_test(bits, alpha),
+        "byte_chi_square": byte_chi_square_test(raw, alpha),
+        "serial_correlation": serial_correlation_test(raw, alpha),
+    }
+    tests = {name: result for name, result in tests.items() if result is not None}
+    return {
+        "bytes": int(raw.size),
+        "alpha": alpha,
+        "passed": all(result["passed"] for result in tests.values()),
+        "failed": [name for name, result in tests.items() if not result["passed"]],
+        "duration_seconds": round(time.perf_counter() - start, 4),
+        "tests": tests,
+    }
+
+
+class OnlineMonitor:
+    """Tests a small random fraction of live entropy in the background.
+
+    `observe` is called with every chunk handed out; a `fraction` of chunks is
+    copied into a window, and once the window holds `window_bytes` the tests
+    run on a background thread. The latest report is kept for the health
+    endpoint and failures are counted in the metrics.
+    """
+
+    def __init__(self, fraction: float = 0.01, window_bytes: int = 1 << 20, alpha: float = DEFAULT_ALPHA):
+        self.fraction = fraction
+        self.window_bytes = window_bytes
+        self.alpha = alpha
+        self._window: List[bytes] = []
+        self._window_size = 0
+        self._lock = threading.Lock()
+        self._sampler = random.Random()
+        self.last_report: Optional[Dict] = None
+        self.reports = 0
+
+    def observe(self, data: bytes):
+        # Sample whole chunks so bit-level runs are kept intact
+        if not data or self._sampler.random() >= self.fraction:
+            return
+        with self._lock:
+            self._window.append(bytes(data))
+            self._window_size += len(data)
+            if self._window_size < self.window_bytes:
+                return
+            window = b"".join(self._window)
+            self._window = []
+            self._window_size = 0
+        threading.Thread(target=self._analyze, args=(window,), name="randomness-monitor", daemon=True).start()
+
+    def _analyze(self, window: bytes):
+        report = run_all(window, self.alpha)
+        report["completed_at"] = time.time()
+        RANDOMNESS_TEST_RUNS.inc()
+        for name in report["failed"]:
+            RANDOMNESS_TEST_FAILURES.inc(test=name)
+        self.last_report = report
+        self.reports += 1
+
+    def status(self) -> Dict:
+        with self._lock:
+            buffered = self._window_size
+        return {
+            "sample_fraction": self.fraction,
+            "window_bytes": self.window_bytes,
+            "buffered_bytes": buffered,
+            "reports": self.reports,
+            "last_report": self.last_report,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run statistical randomness tests over captured bytes")
+    parser.add_argument("path", help="File with raw random bytes, or - for stdin")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.path == "-":
+        data = sys.stdin.buffer.read()
+    else:
+        with open(args.path, "rb") as f:
+            data = f.read()
+
+    report = run_all(data, args.alpha)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['bytes']} bytes analyzed in {report['duration_seconds']}s (alpha={args.alpha})")
+        for name, result in report["tests"].items():
+            status = "PASS" if result["passed"] else "FAIL"
+            print(f"  {status}  {name:<20} p={result['p_value']:.4f}")
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
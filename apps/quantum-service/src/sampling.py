@@ -0,0 +1,237 @@
+"""
+Unbiased mapping of random bits onto integer ranges.
+
+Values are drawn with rejection sampling: read just enough bits to cover the
+range and discard out-of-range results, so every number in the range is
+exactly equally likely (unlike `value % range_size`). Large draws are
+vectorized with NumPy, and unique draws never fall back to classical
+randomness.
+"""
+
+import bisect
+import functools
+import math
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from .bit_engine import BitStream
+from .metrics import SAMPLING_REJECTIONS, UNIQUE_RETRIES
+
+# Upper bound on candidates drawn per vectorized batch, to bound memory use
+MAX_BATCH = 1 << 16
+
+# Largest binomial table (range size x count entries) built for combination draws
+MAX_COMBINATION_TABLE = 1 << 16
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _range_bits(range_size: int) -> int:
+    return (range_size - 1).bit_length()
+
+
+def uniform_int(stream: BitStream, low: int, high: int) -> int:
+    """Return a uniformly distributed integer in [low, high]."""
+    range_size = high - low + 1
+    bits = _range_bits(range_size)
+    value = stream.read_bits(bits)
+    rejected = 0
+    while value >= range_size:
+        rejected += 1
+        value = stream.read_bits(bits)
+    if rejected:
+        SAMPLING_REJECTIONS.inc(rejected)
+    return low + value
+
+
+def _vectorizable(low: int, high: int) -> bool:
+    return _INT64_MIN <= low and high <= _INT64_MAX and _range_bits(high - low + 1) <= 63
+
+
+def _uniform_offsets(stream: BitStream, range_size: int, count: int) -> np.ndarray:
+    """Return `count` uniform offsets in [0, range_size) as a uint64 array."""
+    bits = _range_bits(range_size)
+    acceptance = range_size / (1 << bits)
+    out = np.empty(count, dtype=np.uint64)
+    filled = 0
+    while filled < count:
+        needed = count - filled
+        # Draw about as many candidates as should be accepted, so few bits are wasted
+        batch = min(MAX_BATCH, math.ceil(needed / acceptance))
+        candidates = stream.read_bits_array(bits, batch)
+        in_range = candidates[candidates < range_size]
+        if in_range.size < batch:
+            SAMPLING_REJECTIONS.inc(batch - in_range.size)
+        accepted = in_range[:needed]
+        out[filled:filled + accepted.size] = accepted
+        filled += accepted.size
+    return out
+
+
+def _to_list(offsets: np.ndarray, low: int) -> List[int]:
+    if _INT64_MIN <= low + int(offsets.max(initial=0)) <= _INT64_MAX:
+        return (offsets.astype(np.int64) + low).tolist()
+    return [low + int(offset) for offset in offsets]
+
+
+def uniform_ints(stream: BitStream, low: int, high: int, count: int) -> List[int]:
+    """Return `count` independent uniform integers in [low, high]."""
+    if count <= 0:
+        return []
+    range_size = high - low + 1
+    if range_size == 1:
+        return [low] * count
+    if not _vectorizable(low, high):
+        return [uniform_int(stream, low, high) for _ in range(count)]
+    return _to_list(_uniform_offsets(stream, range_size, count), low)
+
+
+def unique_ints(stream: BitStream, low: int, high: int, count: int) -> List[int]:
+    """Return `count` distinct uniform integers in [low, high], in random order.
+
+    When `count` is small relative to the range, candidates are drawn in
+    vectorized batches and de-duplicated; otherwise a partial Fisher-Yates
+    shuffle over the range is driven by the stream. Either way the cost is
+    O(count) in time and entropy.
+    """
+    range_size = high - low + 1
+    if count > range_size:
+        raise ValueError(f"Cannot draw {count} unique numbers from a range of size {range_size}")
+    if count <= 0:
+        return []
+
+    if 2 * count <= range_size:
+        if _vectorizable(low, high):
+            return _unique_by_rejection(stream, low, range_size, count)
+        return _unique_sparse_fisher_yates(stream, low, range_size, count)
+    return _unique_fisher_yates(stream, low, range_size, count)
+
+
+def _unique_by_rejection(stream: BitStream, low: int, range_size: int, count: int) -> List[int]:
+    chosen = np.empty(0, dtype=np.uint64)
+    while chosen.size < count:
+        candidates = _uniform_offsets(stream, range_size, count - chosen.size)
+        merged = np.concatenate((chosen, candidates))
+        # Keep the first occurrence of each value, preserving draw order
+        _, first_index = np.unique(merged, return_index=True)
+        if first_index.size < merged.size:
+            UNIQUE_RETRIES.inc(merged.size - first_index.size)
+        chosen = merged[np.sort(first_index)]
+    return _to_list(chosen[:count], low)
+
+
+def _unique_fisher_yates(stream: BitStream, low: int, range_size: int, count: int) -> List[int]:
+    # Dense partial shuffle; only used when range_size < 2 * count
+    values = list(range(low, low + range_size))
+    for i in range(count):
+        j = uniform_int(stream, i, range_size - 1)
+        values[i], values[j] = values[j], values[i]
+    return values[:count]
+
+
+def _unique_sparse_fisher_yates(stream: BitStream, low: int, range_size: int, count: int) -> List[int]:
+    return [n for chunk in iter_unique_ints(stream, low, low + range_size - 1, count, count) for n in chunk]
+
+
+def iter_unique_ints(stream: BitStream, low: int, high: int, count: int, chunk_size: int) -> Iterator[List[int]]:
+    """Yield `count` distinct uniform integers in [low, high] in chunks of `chunk_size`.
+
+    This is a partial Fisher-Yates shuffle over a virtual array that only
+    stores the swapped positions, so memory grows with `count`, not with
+    the size of the range.
+    """
+    range_size = high - low + 1
+    if count > range_size:
+        raise ValueError(f"Cannot draw {count} unique numbers from a range of size {range_size}")
+    swapped = {}
+    chunk = []
+    for i in range(count):
+        j = uniform_int(stream, i, range_size - 1)
+        chunk.append(low + swapped.get(j, j))
+        swapped[j] = swapped.get(i, i)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@functools.lru_cache(maxsize=32)
+def _binomial_table(range_size: int, count: int) -> Tuple[Tuple[int, ...], ...]:
+    """Row i holds C(m, i) for m in [0, range_size), for i in [1, count]. Each row is non-decreasing."""
+    return tuple(
+        tuple(math.comb(m, i) for m in range(range_size))
+        for i in range(count + 1)
+    )
+
+
+def combination_supported(low: int, high: int, count: int) -> bool:
+    """Whether a combination draw of `count` values from [low, high] fits in a binomial table."""
+    return (high - low + 1) * count <= MAX_COMBINATION_TABLE
+
+
+def unrank_combination(rank: int, range_size: int, count: int) -> List[int]:
+    """Return the combination of `count` offsets in [0, range_size) with the given colex rank.
+
+    Uses the combinatorial number system: every rank in [0, C(range_size, count))
+    is uniquely written as C(c_k, k) + ... + C(c_1, 1) with
+    c_k > ... > c_1 >= 0, and {c_1, ..., c_k} is the combination.
+    """
+    table = _binomial_table(range_size, count)
+    combination = []
+    upper = range_size
+    for i in range(count, 0, -1):
+        # Largest c below the previous element with C(c, i) <= rank
+        c = bisect.bisect_right(table[i], rank, 0, upper) - 1
+        combination.append(c)
+        rank -= table[i][c]
+        upper = c
+    combination.reverse()
+    return combination
+
+
+def combination_ints(stream: BitStream, low: int, high: int, count: int) -> List[int]:
+    """Return a uniformly random set of `count` distinct integers in [low, high], in ascending order.
+
+    Draws a single rank in [0, C(n, count)) with ceil(log2 C(n, count)) bits
+    per attempt and unranks it, so the cost does not depend on collisions
+    between drawn values.
+    """
+    range_size = high - low + 1
+    if count > range_size:
+        raise ValueError(f"Cannot draw {count} unique numbers from a range of size {range_size}")
+    if count <= 0:
+        return []
+    if not combination_supported(low, high, count):
+        raise ValueError(f"Combination draws support at most {MAX_COMBINATION_TABLE} range size x count")
+    rank = uniform_int(stream, 0, math.comb(range_size, count) - 1)
+    return [low + offset for offset in unrank_combination(rank, range_size, count)]
+
+
+def combination_bits(low: int, high: int, count: int) -> int:
+    """Estimate how many bits a combination draw consumes on average."""
+    combinations = math.comb(high - low + 1, count)
+    if combinations <= 1:
+        return 0
+    bits = _range_bits(combinations)
+    return math.ceil(bits * (1 << bits) / combinations)
+
+
+def expected_bits(low: int, high: int, count: int, unique: bool) -> int:
+    """Estimate how many bits a draw consumes on average."""
+    range_size = high - low + 1
+    if range_size <= 1 or count <= 0:
+        return 0
+    bits = _range_bits(range_size)
+    bits_per_value = bits * (1 << bits) / range_size
+    if not unique or range_size >= count << 32:
+        # Repeats are negligible once the range dwarfs the count
+        draws = count
+    elif 2 * count <= range_size:
+        # Coupon-collector cost of `count` distinct values out of `range_size`
+        draws = range_size * math.log1p(count / (range_size - count))
+    else:
+        draws = count
+    return math.ceil(draws * bits_per_value)
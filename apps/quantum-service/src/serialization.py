@@ -0,0 +1,108 @@
+"""
+Fast response encoding and request IDs for the draw endpoints.
+
+Draw responses are plain dicts encoded straight to bytes, skipping pydantic
+model construction and FastAPI's generic `jsonable_encoder`. JSON uses
+`orjson` when it is installed and the standard library otherwise; clients
+that send `Accept: application/msgpack` get MessagePack if `msgpack` is
+installed.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Optional
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode `content` as compact JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content)
+        except TypeError:
+            # orjson only handles 64-bit integers; draws can go far beyond that
+            pass
+    return json.dumps(content, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class MsgpackResponse(Response):
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content)
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """Whether the Accept header asks for MessagePack and it can be produced."""
+    if not accept or msgpack is None:
+        return False
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def encode_response(content: Any, accept: Optional[str] = None) -> Response:
+    """Encode `content` as MessagePack if the client asked for it and it fits, JSON otherwise."""
+    if wants_msgpack(accept):
+        try:
+            return MsgpackResponse(content)
+        except OverflowError:
+            # MessagePack integers stop at 64 bits; JSON has no such limit
+            pass
+    return FastJSONResponse(content)
+
+
+class RequestIdGenerator:
+    """Random version 4 UUIDs as strings, without calling uuid4 per request.
+
+    IDs are unguessable, since anyone holding one can look the draw up. They
+    are sliced from a block of `batch` IDs' worth of `os.urandom` bytes, which
+    is refilled when used up, and the buffer is dropped in forked children so
+    workers never hand out the same IDs.
+    """
+
+    def __init__(self, batch: int = 256):
+        self.batch = batch
+        self._lock = threading.Lock()
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._buffer = b""
+        self._offset = 0
+
+    def __call__(self) -> str:
+        with self._lock:
+            if self._offset >= len(self._buffer):
+                self._buffer = os.urandom(16 * self.batch)
+                self._offset = 0
+            raw = bytearray(self._buffer[self._offset:self._offset + 16])
+            self._offset += 16
+        # Version 4 in the high nibble of byte 6, RFC 9562 variant in the top bits of byte 8
+        raw[6] = 0x40 | (raw[6] & 0x0F)
+        raw[8] = 0x80 | (raw[8] & 0x3F)
+        value = raw.hex()
+        return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+
+
+new_request_id = RequestIdGenerator()
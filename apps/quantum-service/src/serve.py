@@ -0,0 +1,77 @@
+"""
+Production launcher: several HTTP workers sharing one entropy producer.
+
+    python -m src.serve --workers 4 --port 8002
+
+Creates the shared memory entropy pool, starts a producer process that keeps
+it filled from the entropy chain, then runs uvicorn with `--workers` worker
+processes that all consume from that pool (see `src/shared_pool.py`).
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import uuid
+from typing import List, Optional
+
+import uvicorn
+
+from .config import settings
+from .entropy_chain import build_entropy_chain, create_quantum_backend
+from .shared_pool import SharedRingBuffer, StopFlag, run_producer
+
+
+def _producer_main(name: str, stop: StopFlag):
+    # SIGTERM and Ctrl+C often reach the whole process group; shutdown is the launcher's job
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Built here rather than imported from the app, which would also open its ledger and pools
+    entropy_chain = build_entropy_chain(settings, create_quantum_backend(settings))
+    buffer = SharedRingBuffer.attach(name)
+    try:
+        run_producer(
+            buffer,
+            entropy_chain.read,
+            stop,
+            low_watermark=settings.pool_low_watermark,
+            high_watermark=settings.pool_high_watermark,
+        )
+    finally:
+        entropy_chain.shutdown()
+        buffer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the quantum service with several workers and a shared entropy pool")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--workers", type=int, default=settings.workers, help="Number of HTTP worker processes")
+    args = parser.parse_args(argv)
+
+    chunk_size = settings.pool_chunk_size
+    capacity = max(chunk_size, settings.pool_capacity // chunk_size * chunk_size)
+    buffer = SharedRingBuffer.create(f"qrng-{uuid.uuid4().hex[:12]}", capacity=capacity, chunk_size=chunk_size)
+
+    context = multiprocessing.get_context("spawn")
+    stop = StopFlag(context)
+    producer = context.Process(target=_producer_main, args=(buffer.name, stop), name="entropy-producer", daemon=True)
+    producer.start()
+    try:
+        # Inherited by the uvicorn workers, which attach to the pool on import
+        os.environ["QUANTUM_SHARED_POOL"] = buffer.name
+        uvicorn.run("src.main:app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        stop.set()
+        producer.join(timeout=10)
+        if producer.is_alive():
+            # It ignores SIGTERM, so a stuck producer has to be killed
+            producer.kill()
+            producer.join(timeout=5)
+        buffer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""
+Entropy pool shared by several worker processes.
+
+In the multi-worker deployment (`python -m src.serve`), one producer process
+runs the entropy chain and keeps a ring buffer in
+`multiprocessing.shared_memory` topped up, and every HTTP worker copies bytes
+out of it through `SharedEntropyPool`, so the simulator runs in one place
+instead of once per worker.
+
+Segment layout:
+
+    header | source name table | one source tag per chunk | ring buffer
+
+The header holds monotonic byte counters for the write and read positions.
+The producer is the only writer: it fills free space outside of any lock and
+then publishes it by advancing the write position. Consumers serialize on a
+short `fcntl` file lock while they copy bytes and advance the read position.
+The producer writes whole chunks, each tagged with the index of the backend
+that produced it, so consumers can still report their source.
+"""
+
+import contextlib
+import fcntl
+import os
+import struct
+import tempfile
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# read_pos, write_pos, bytes_consumed, misses, capacity, chunk_size,
+# producer refill rate in bytes per second
+_HEADER = struct.Struct("<QQQQIId")
+_HEADER_SIZE = 64
+_MAX_SOURCES = 8
+_SOURCE_NAME_SIZE = 32
+_NO_SOURCE = 0xFF
+
+
+class SharedRingBuffer:
+    """Ring buffer of random bytes in a named shared memory segment."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+        _, _, _, _, self.capacity, self.chunk_size, _ = _HEADER.unpack_from(shm.buf, 0)
+        self._names_offset = _HEADER_SIZE
+        self._tags_offset = self._names_offset + _MAX_SOURCES * _SOURCE_NAME_SIZE
+        self._data_offset = self._tags_offset + self.capacity // self.chunk_size
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{self.name.lstrip('/')}.lock")
+        self._lock_file = open(self._lock_path, "a+b")
+        # fcntl locks are per process, so threads of one worker also need a local lock
+        self._thread_lock = threading.Lock()
+
+    @classmethod
+    def create(cls, name: Optional[str] = None, capacity: int = 64 * 1024, chunk_size: int = 4096) -> "SharedRingBuffer":
+        if capacity <= 0 or chunk_size <= 0 or capacity % chunk_size:
+            raise ValueError("capacity must be a positive multiple of chunk_size")
+        size = _HEADER_SIZE + _MAX_SOURCES * _SOURCE_NAME_SIZE + capacity // chunk_size + capacity
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, 0, 0, 0, 0, capacity, chunk_size, 0.0)
+        shm.buf[_HEADER_SIZE:_HEADER_SIZE + _MAX_SOURCES * _SOURCE_NAME_SIZE] = bytes(_MAX_SOURCES * _SOURCE_NAME_SIZE)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRingBuffer":
+        # Only the creator may unlink the segment, so keep attachments out of
+        # the resource tracker, which would remove it when a worker exits
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: rtype == "shared_memory" or register(name, rtype)
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+        return cls(shm, owner=False)
+
+    # Header access
+
+    def _counters(self) -> Tuple[int, int]:
+        read_pos, write_pos = struct.unpack_from("<QQ", self.shm.buf, 0)
+        return read_pos, write_pos
+
+    def _add_counter(self, index: int, amount: int):
+        offset = index * 8
+        (value,) = struct.unpack_from("<Q", self.shm.buf, offset)
+        struct.pack_into("<Q", self.shm.buf, offset, value + amount)
+
+    def fill(self) -> int:
+        read_pos, write_pos = self._counters()
+        return write_pos - read_pos
+
+    @property
+    def refill_rate(self) -> float:
+        return struct.unpack_from("<d", self.shm.buf, 40)[0]
+
+    @refill_rate.setter
+    def refill_rate(self, value: float):
+        struct.pack_into("<d", self.shm.buf, 40, value)
+
+    # Source names
+
+    def _source_names(self) -> List[str]:
+        names = []
+        for index in range(_MAX_SOURCES):
+            offset = self._names_offset + index * _SOURCE_NAME_SIZE
+            raw = bytes(self.shm.buf[offset:offset + _SOURCE_NAME_SIZE]).rstrip(b"\x00")
+            if not raw:
+                break
+            names.append(raw.decode())
+        return names
+
+    def _source_index(self, name: str) -> int:
+        names = self._source_names()
+        if name in names:
+            return names.index(name)
+        if len(names) == _MAX_SOURCES:
+            return _NO_SOURCE
+        offset = self._names_offset + len(names) * _SOURCE_NAME_SIZE
+        self.shm.buf[offset:offset + _SOURCE_NAME_SIZE] = name.encode()[:_SOURCE_NAME_SIZE].ljust(_SOURCE_NAME_SIZE, b"\x00")
+        return len(names)
+
+    # Producer side (a single process)
+
+    def write_chunk(self, data: bytes, source_name: str) -> bool:
+        """Append one chunk of exactly `chunk_size` bytes. Returns False if there is no room."""
+        if len(data) != self.chunk_size:
+            raise ValueError("chunks must be exactly chunk_size bytes")
+        read_pos, write_pos = self._counters()
+        if write_pos - read_pos + self.chunk_size > self.capacity:
+            return False
+        # write_pos is always chunk-aligned, so a chunk never wraps
+        start = write_pos % self.capacity
+        self.shm.buf[self._data_offset + start:self._data_offset + start + self.chunk_size] = data
+        self.shm.buf[self._tags_offset + start // self.chunk_size] = self._source_index(source_name)
+        # Publish only after the data is in place
+        with self._locked():
+            self._add_counter(1, self.chunk_size)
+        return True
+
+    # Consumer side
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def read(self, size: int) -> Tuple[bytes, List[str]]:
+        """Copy up to `size` bytes out of the buffer, with the names of the sources that produced them."""
+        with self._locked():
+            read_pos, write_pos = self._counters()
+            size = min(size, write_pos - read_pos)
+            if size <= 0:
+                return b"", []
+            start = read_pos % self.capacity
+            first = min(size, self.capacity - start)
+            buf = self.shm.buf
+            data = bytes(buf[self._data_offset + start:self._data_offset + start + first])
+            if first < size:
+                data += bytes(buf[self._data_offset:self._data_offset + size - first])
+            first_chunk = read_pos // self.chunk_size
+            last_chunk = (read_pos + size - 1) // self.chunk_size
+            tags = {
+                buf[self._tags_offset + chunk % (self.capacity // self.chunk_size)]
+                for chunk in range(first_chunk, last_chunk + 1)
+            }
+            self._add_counter(0, size)
+            self._add_counter(2, size)
+        table = self._source_names()
+        return data, [table[tag] for tag in sorted(tags) if tag < len(table)]
+
+    def record_miss(self):
+        with self._locked():
+            self._add_counter(3, 1)
+
+    def stats(self) -> Dict[str, int]:
+        read_pos, write_pos, consumed, misses, _, _, _ = _HEADER.unpack_from(self.shm.buf, 0)
+        return {"fill": write_pos - read_pos, "bytes_produced": write_pos, "bytes_consumed": consumed, "misses": misses}
+
+    def close(self):
+        self._lock_file.close()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            try:
+                os.unlink(self._lock_path)
+            except FileNotFoundError:
+                pass
+
+
+class SharedEntropyPool:
+    """Consumer view of a `SharedRingBuffer`, interchangeable with `EntropyPool`.
+
+    When the buffer can't cover a request, the consumer waits up to
+    `wait_timeout` seconds for the producer and then generates the shortfall
+    itself with `fallback`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fallback: Callable[[int], Tuple[bytes, str]],
+        wait_timeout: float = 0.05,
+    ):
+        self.buffer = SharedRingBuffer.attach(name)
+        self._fallback = fallback
+        self.wait_timeout = wait_timeout
+        self.capacity = self.buffer.capacity
+
+    @property
+    def refill_rate(self) -> float:
+        return self.buffer.refill_rate
+
+    def start(self):
+        """The producer process does the refilling."""
+
+    def stop(self, timeout: float = 5.0):
+        self.buffer.close()
+
+    def take(self, size: int) -> bytes:
+        return self.take_with_source(size)[0]
+
+    def take_with_source(self, size: int) -> Tuple[bytes, str]:
+        """Return `size` random bytes and the name(s) of the backends that produced them."""
+        if size <= 0:
+            return b"", ""
+        chunks: List[bytes] = []
+        names: List[str] = []
+        remaining = size
+        deadline = time.monotonic() + self.wait_timeout
+        while remaining > 0:
+            data, sources = self.buffer.read(remaining)
+            chunks.append(data)
+            remaining -= len(data)
+            for source in sources:
+                if source not in names:
+                    names.append(source)
+            if remaining <= 0 or time.monotonic() >= deadline:
+                break
+            time.sleep(0.001)
+        if remaining > 0:
+            self.buffer.record_miss()
+            extra, source_name = self._fallback(remaining)
+            chunks.append(extra)
+            if source_name not in names:
+                names.append(source_name)
+        return b"".join(chunks), "+".join(names)
+
+    def stats(self) -> Dict[str, object]:
+        stats = self.buffer.stats()
+        return {
+            "shared": True,
+            "name": self.buffer.name,
+            "capacity": self.capacity,
+            "fill": stats["fill"],
+            "fill_ratio": round(stats["fill"] / self.capacity, 4),
+            "refill_rate_bytes_per_sec": round(self.refill_rate, 1),
+            "bytes_produced": stats["bytes_produced"],
+            "bytes_consumed": stats["bytes_consumed"],
+            "misses": stats["misses"],
+        }
+
+
+class StopFlag:
+    """Stop signal for a producer process, polled instead of waited on.
+
+    `multiprocessing.Event.set` notifies through a shared condition and hangs
+    if a waiter was killed mid-wait, as happens when SIGTERM reaches the whole
+    process group. This is a plain shared byte, so setting it never blocks.
+    It also reads as set once the process that created it has exited, so an
+    orphaned producer stops by itself.
+    """
+
+    def __init__(self, context, poll_interval: float = 0.05):
+        self._flag = context.RawValue("b", 0)
+        self._owner_pid = os.getpid()
+        self.poll_interval = poll_interval
+
+    def set(self):
+        self._flag.value = 1
+
+    def is_set(self) -> bool:
+        return bool(self._flag.value) or (os.getpid() != self._owner_pid and os.getppid() != self._owner_pid)
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while not self.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(remaining, self.poll_interval))
+        return True
+
+
+def run_producer(
+    buffer: SharedRingBuffer,
+    source: Callable[[int], Tuple[bytes, str]],
+    stop: Union[threading.Event, StopFlag],
+    low_watermark: float = 0.25,
+    high_watermark: float = 0.9,
+    poll_interval: float = 0.005,
+):
+    """Keep `buffer` between the watermarks from `source` until `stop` is set."""
+    low = buffer.capacity * low_watermark
+    high = max(buffer.capacity * high_watermark, buffer.chunk_size)
+    while not stop.is_set():
+        if buffer.fill() >= low:
+            stop.wait(poll_interval)
+            continue
+        while not stop.is_set() and buffer.fill() + buffer.chunk_size <= high:
+            start = time.perf_counter()
+            try:
+                data, source_name = source(buffer.chunk_size)
+            except Exception:
+                # Consumers fall back to generating entropy themselves meanwhile
+                stop.wait(1)
+                break
+            elapsed = time.perf_counter() - start
+            if elapsed > 0:
+                rate = len(data) / elapsed
+                # Same moving average as EntropyPool.refill_rate
+                buffer.refill_rate = rate if not buffer.refill_rate else 0.8 * buffer.refill_rate + 0.2 * rate
+            buffer.write_chunk(data, source_name)
@@ -0,0 +1,56 @@
+"""
+Flow control for WebSocket random number subscriptions.
+
+A subscriber asks for a feed of draws at a given rate. Frames are sent only
+while the subscriber has credit: it starts with a number of credits, each
+frame uses one, and it grants more by sending `{"credit": n}`. A consumer
+that falls behind simply stops granting credit, and the server stops
+generating for it instead of buffering frames it can't take.
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+
+class FlowControl:
+    """Credit-based flow control paced to at most `rate` frames per second.
+
+    Credits never accumulate beyond `max_credits`, so a subscriber can't
+    grant itself an unbounded backlog.
+    """
+
+    def __init__(self, rate: float, credits: int, max_credits: int):
+        if rate <= 0 or max_credits <= 0:
+            raise ValueError("rate and max_credits must be positive")
+        self.rate = rate
+        self.max_credits = max_credits
+        self.credits = min(max(credits, 0), max_credits)
+        self._available = asyncio.Event()
+        if self.credits:
+            self._available.set()
+        self._next_frame: Optional[float] = None
+        self.frames = 0
+
+    def grant(self, credits: int):
+        """Add credits granted by the subscriber."""
+        if credits <= 0:
+            raise ValueError("credit must be positive")
+        self.credits = min(self.credits + credits, self.max_credits)
+        self._available.set()
+
+    async def acquire(self):
+        """Wait until a frame may be sent: the subscriber has credit and the rate allows it."""
+        while not self.credits:
+            self._available.clear()
+            await self._available.wait()
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._next_frame is not None and self._next_frame > now:
+            await asyncio.sleep(self._next_frame - now)
+            now = self._next_frame
+        self._next_frame = now + 1 / self.rate
+        self.credits -= 1
+        self.frames += 1
+
+    def stats(self) -> Dict[str, object]:
+        return {"rate": self.rate, "credits": self.credits, "frames": self.frames}
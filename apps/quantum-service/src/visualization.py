@@ -0,0 +1,147 @@
+"""
+Server-side rendering of circuit diagrams and measurement histograms.
+
+Images are rendered with matplotlib, which is optional: without it only the
+plain-text format is available and the image formats raise
+`VisualizationUnavailable`. Rendering takes tens to hundreds of milliseconds,
+so every image is rendered once and kept in a bounded `ImageCache` together
+with an ETag, letting clients revalidate with `If-None-Match`.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml", "txt": "text/plain; charset=utf-8"}
+
+
+class VisualizationUnavailable(Exception):
+    """Raised when an image format needs matplotlib and it isn't installed."""
+
+
+class RenderedImage(NamedTuple):
+    body: bytes
+    media_type: str
+    etag: str
+
+
+def _save(figure, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=image_format, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def render_circuit(width: int, image_format: str) -> bytes:
+    """Draw the `width`-qubit random-bit circuit."""
+    from .circuits import create_multi_bit_circuit
+
+    circuit = create_multi_bit_circuit(width)
+    if image_format == "txt":
+        return (str(circuit.draw(output="text")) + "\n").encode()
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        figure = circuit.draw(output="mpl")
+    except ImportError as exc:
+        raise VisualizationUnavailable(f"{image_format} images need matplotlib: {exc}") from exc
+    try:
+        figure.suptitle(f"Quantum Circuit for {width}-Bit Random Number Generation")
+        return _save(figure, image_format)
+    finally:
+        plt.close(figure)
+
+
+def render_histogram(counts: Dict[str, int], shots: int, image_format: str) -> bytes:
+    """Plot measurement counts as a bar chart, or as text bars for `txt`."""
+    if image_format == "txt":
+        longest = max(counts.values(), default=0) or 1
+        lines = [f"Measurement results for {shots} shots"]
+        lines += [f"{outcome} {'#' * round(40 * count / longest):<40} {count}" for outcome, count in counts.items()]
+        return ("\n".join(lines) + "\n").encode()
+    try:
+        from matplotlib.figure import Figure
+    except ImportError as exc:
+        raise VisualizationUnavailable(f"{image_format} images need matplotlib: {exc}") from exc
+    # The object-oriented API keeps pyplot's global state out of it
+    figure = Figure(figsize=(8, 6))
+    axes = figure.subplots()
+    axes.bar(list(counts), list(counts.values()))
+    axes.set_title(f"Measurement Results for {shots} Shots")
+    axes.set_xlabel("Measurement Outcome")
+    axes.set_ylabel("Count")
+    axes.grid(axis="y", alpha=0.3)
+    if len(counts) > 16:
+        axes.tick_params(axis="x", labelrotation=90, labelsize=6)
+    return _save(figure, image_format)
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class ImageCache:
+    """LRU cache of rendered images, holding at most `max_entries`.
+
+    Renders are serialized: matplotlib isn't thread-safe, and a request
+    arriving while the same image is being rendered then finds it cached
+    instead of rendering it again.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._images: "OrderedDict[Hashable, RenderedImage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self.hits = 0
+        self.renders = 0
+
+    def peek(self, key: Hashable) -> Optional[RenderedImage]:
+        """Return the cached image for `key` without rendering anything."""
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+            return image
+
+    def get(self, key: Hashable, render: Callable[[], Tuple[bytes, str]]) -> RenderedImage:
+        """Return the image for `key`, calling `render` for its body and media type if it isn't cached. Blocks."""
+        image = self.peek(key)
+        if image is not None:
+            return image
+        with self._render_lock:
+            image = self.peek(key)
+            if image is not None:
+                return image
+            body, media_type = render()
+            image = RenderedImage(body, media_type, etag_for(body))
+            self.renders += 1
+        with self._lock:
+            self._images[key] = image
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+        return image
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._images),
+                "max_entries": self.max_entries,
+                "bytes": sum(len(image.body) for image in self._images.values()),
+                "hits": self.hits,
+                "renders": self.renders,
+            }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches `etag`."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
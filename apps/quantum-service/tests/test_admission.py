@@ -0,0 +1,75 @@
+import pytest
+
+from src import main
+from src.admission import AdmissionController, RateLimited, RequestTooExpensive, TokenBucket, estimate_cost
+
+
+def test_estimate_cost_includes_rejections():
+    """Test para verificar que el coste estimado incluye los valores descartados por rechazo."""
+    # 5 valores en 3 bits: se descartan 3 de cada 8 candidatos
+    cost = estimate_cost(1, 5, 100, unique=False)
+    assert cost.rejection_rate == pytest.approx(3 / 8)
+    assert cost.bits == 480
+    # Un rango potencia de dos no descarta nada
+    assert estimate_cost(0, 255, 10, unique=False).rejection_rate == 0
+
+
+def test_estimate_cost_combination():
+    """Test para verificar la estimación de coste del algoritmo de combinaciones."""
+    cost = estimate_cost(1, 49, 6, algorithm="combination")
+    assert 24 <= cost.bits <= 48
+    assert 0 <= cost.rejection_rate < 0.5
+
+
+def test_token_bucket_refills_over_time():
+    """Test para verificar que el cubo de tokens se rellena con el tiempo."""
+    bucket = TokenBucket(rate=100, capacity=200, now=0)
+    assert bucket.consume(150, now=0) == 0
+    assert bucket.consume(100, now=0) == pytest.approx(0.5)
+    assert bucket.consume(100, now=0.5) == 0
+
+
+def test_controller_rejects_expensive_requests():
+    """Test para verificar que las peticiones demasiado caras se rechazan con 413."""
+    controller = AdmissionController(max_request_bits=1000)
+    controller.admit("a", 1000)
+    with pytest.raises(RequestTooExpensive):
+        controller.admit("a", 1001)
+    assert controller.stats()["rejected"] == 1
+
+
+def test_controller_limits_each_client_separately():
+    """Test para verificar que cada cliente tiene su propio presupuesto de bits."""
+    controller = AdmissionController(max_request_bits=1000, client_rate=1, client_burst=1000)
+    controller.admit("heavy", 1000)
+    with pytest.raises(RateLimited) as info:
+        controller.admit("heavy", 10)
+    assert info.value.retry_after > 0
+    controller.admit("light", 10)
+
+
+def test_random_endpoint_rejects_huge_request(client, monkeypatch):
+    """Test para verificar que el endpoint rechaza una petición que excede el límite antes de generarla."""
+    monkeypatch.setattr(main, "admission", AdmissionController(max_request_bits=10_000))
+    response = client.post(
+        "/api/v1/random",
+        json={"min_value": 0, "max_value": (1 << 62) + 1, "count": 1000, "unique": False},
+    )
+    assert response.status_code == 413
+    assert "random bits" in response.json()["detail"]
+
+
+def test_default_limit_keeps_requests_to_seconds_of_simulator_time(client):
+    """Test para verificar que el límite por defecto rechaza lecturas que ocuparían el simulador durante minutos."""
+    response = client.get("/api/v1/random/bytes", params={"length": 8 * 1024 * 1024})
+    assert response.status_code == 413
+
+
+def test_rate_limited_client_gets_retry_after(client, valid_random_request, monkeypatch):
+    """Test para verificar que un cliente sin presupuesto recibe 429 con Retry-After."""
+    monkeypatch.setattr(main, "admission", AdmissionController(max_request_bits=1000, client_rate=1, client_burst=1000))
+    assert client.get("/api/v1/random/bytes", params={"length": 125}).status_code == 200
+    response = client.post("/api/v1/random", json=valid_random_request)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert client.get("/api/v1/admission").json()["rejected"] == 1
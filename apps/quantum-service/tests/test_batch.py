@@ -0,0 +1,33 @@
+def test_batch_returns_one_response_per_request(client):
+    """Test para verificar que el lote devuelve una respuesta por solicitud y en orden."""
+    payload = [
+        {"min_value": 1, "max_value": 90, "count": 6, "unique": True},
+        {"min_value": 1, "max_value": 10, "count": 20, "unique": False},
+        {"min_value": 100, "max_value": 200, "count": 3, "unique": True},
+    ]
+    response = client.post("/api/v1/random/batch", json=payload)
+    assert response.status_code == 200
+    results = response.json()
+    assert len(results) == 3
+
+    for spec, result in zip(payload, results):
+        numbers = result["numbers"]
+        assert len(numbers) == spec["count"]
+        assert all(spec["min_value"] <= n <= spec["max_value"] for n in numbers)
+        if spec["unique"]:
+            assert len(set(numbers)) == len(numbers)
+
+    assert len({result["request_id"] for result in results}) == 3
+
+
+def test_batch_reports_invalid_request_index(client, valid_random_request, invalid_random_request):
+    """Test para verificar que se indica qué solicitud del lote es inválida."""
+    response = client.post("/api/v1/random/batch", json=[valid_random_request, invalid_random_request])
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("requests[1]:")
+
+
+def test_batch_rejects_empty_list(client):
+    """Test para verificar que se rechaza un lote vacío."""
+    response = client.post("/api/v1/random/batch", json=[])
+    assert response.status_code == 400
@@ -0,0 +1,106 @@
+import asyncio
+import dataclasses
+
+import httpx
+
+from src import main
+from src.batcher import MicroBatcher
+
+
+def test_concurrent_items_share_one_batch():
+    """Test para verificar que las peticiones simultáneas se agrupan en un solo lote."""
+    calls = []
+
+    async def process(items):
+        calls.append(list(items))
+        return [item * 10 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(process, window=0.05, max_size=100)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5))), batcher
+
+    results, batcher = asyncio.run(scenario())
+    assert results == [0, 10, 20, 30, 40]
+    assert calls == [[0, 1, 2, 3, 4]]
+    assert batcher.stats()["average_batch_size"] == 5
+
+
+def test_full_batch_is_flushed_immediately():
+    """Test para verificar que un lote lleno se procesa sin esperar a la ventana."""
+    calls = []
+
+    async def process(items):
+        calls.append(list(items))
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(process, window=10, max_size=2)
+        return await asyncio.wait_for(asyncio.gather(batcher.submit(1), batcher.submit(2)), timeout=1)
+
+    assert asyncio.run(scenario()) == [1, 2]
+    assert calls == [[1, 2]]
+
+
+def test_batch_is_bounded_by_weight():
+    """Test para verificar que un lote se cierra al alcanzar el peso máximo y que un elemento pesado no retrasa a los ligeros."""
+    calls = []
+
+    async def process(items):
+        calls.append(list(items))
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(process, window=0.05, max_size=100, weight=lambda item: item, max_weight=10)
+        return await asyncio.gather(*(batcher.submit(item) for item in (1, 2, 9, 3, 4, 10)))
+
+    assert asyncio.run(scenario()) == [1, 2, 9, 3, 4, 10]
+    assert calls == [[1, 2], [9], [3, 4], [10]]
+
+
+def test_errors_reach_every_caller():
+    """Test para verificar que un error del lote llega a todas las peticiones."""
+    async def process(items):
+        raise RuntimeError("no entropy")
+
+    async def scenario():
+        batcher = MicroBatcher(process, window=0.01)
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_random_endpoint_coalesces_concurrent_requests(valid_random_request, monkeypatch):
+    """Test para verificar que el endpoint agrupa sorteos simultáneos en un solo trabajo."""
+    batcher = MicroBatcher(main.run_coalesced, window=0.05, max_size=64)
+    monkeypatch.setattr(main, "draw_batcher", batcher)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.post("/api/v1/random", json=valid_random_request) for _ in range(8)))
+
+    responses = asyncio.run(scenario())
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.json()["request_id"] for response in responses}) == 8
+    assert batcher.stats()["items"] == 8
+    assert batcher.stats()["batches"] < 8
+
+
+def test_large_draws_skip_coalescing(valid_random_request, monkeypatch):
+    """Test para verificar que un sorteo grande no se agrupa con los pequeños."""
+    batcher = MicroBatcher(main.run_coalesced, window=0.05, max_size=64, weight=main.estimate_bits_needed, max_weight=1000)
+    monkeypatch.setattr(main, "draw_batcher", batcher)
+    monkeypatch.setattr(main, "settings", dataclasses.replace(main.settings, batch_max_bits=1000))
+    large = {"min_value": 0, "max_value": 2**32 - 1, "count": 100, "unique": False}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            requests = [valid_random_request, large, valid_random_request]
+            return await asyncio.gather(*(client.post("/api/v1/random", json=request) for request in requests))
+
+    responses = asyncio.run(scenario())
+    assert all(response.status_code == 200 for response in responses)
+    assert len(responses[1].json()["numbers"]) == 100
+    assert batcher.stats()["items"] == 2
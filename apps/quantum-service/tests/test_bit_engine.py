@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from qiskit_aer import AerSimulator
+
+from src.bit_engine import BitStream, QuantumBitEngine, sample_bits
+
+
+def test_generate_bytes_uses_single_job():
+    """Test para verificar que se generan todos los bytes con un solo trabajo del simulador."""
+    engine = QuantumBitEngine(AerSimulator())
+    data = engine.generate_bytes(100)
+    assert len(data) == 100
+    assert engine.jobs_run == 1
+
+
+def test_engine_rejects_unaligned_width():
+    """Test para verificar que el ancho del circuito debe ser múltiplo de 8."""
+    with pytest.raises(ValueError):
+        QuantumBitEngine(AerSimulator(), width=12)
+
+
+def test_bit_stream_reads_across_byte_boundaries():
+    """Test para verificar la lectura de bits que cruzan límites de bytes."""
+    stream = BitStream(lambda n: b"\x00" * n, initial=bytes([0b10110011, 0b01011100]))
+    assert stream.read_bits(3) == 0b101
+    assert stream.read_bits(7) == 0b1001101
+    assert stream.read_bit() == 0
+    assert stream.bits_consumed == 11
+
+
+def test_bit_stream_refills_from_source():
+    """Test para verificar que el flujo pide más bytes a la fuente cuando se agota."""
+    requested = []
+
+    def source(n):
+        requested.append(n)
+        return b"\xff" * n
+
+    stream = BitStream(source, initial=b"\x00")
+    assert stream.read_bits(8) == 0
+    assert stream.read_bits(16) == 0xFFFF
+    assert requested == [BitStream.MIN_REFILL]
+
+
+def test_seeded_engine_is_reproducible():
+    """Test para verificar que una semilla fija reproduce la secuencia de trabajos."""
+    first = QuantumBitEngine(AerSimulator(), seed=42)
+    second = QuantumBitEngine(AerSimulator(), seed=42)
+    jobs = [first.generate_bytes(64) for _ in range(2)]
+    assert jobs == [second.generate_bytes(64) for _ in range(2)]
+    # Consecutive jobs use different seeds
+    assert jobs[0] != jobs[1]
+
+
+def test_generate_array_matches_shot_memory():
+    """Test para verificar que los bytes empaquetados coinciden con la memoria de cada disparo."""
+    simulator = AerSimulator()
+    engine = QuantumBitEngine(simulator, seed=7)
+    array = engine.generate_array(10)
+    assert array.dtype == np.uint8 and array.shape == (10,)
+    memory = simulator.run(engine.circuit, shots=3, memory=True, seed_simulator=7).result().get_memory()
+    assert array.tobytes() == int("".join(memory), 2).to_bytes(12, "big")[:10]
+
+
+def test_sample_bits_counts_are_exact():
+    """Test para verificar que los conteos de medidas son enteros exactos."""
+    simulator = AerSimulator()
+    circuit = QuantumBitEngine(simulator, width=8).circuit
+    counts = sample_bits(simulator, circuit, shots=500, seed=1).get_counts()
+    assert sum(counts.values()) == 500
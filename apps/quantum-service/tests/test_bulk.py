@@ -0,0 +1,77 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src import main
+
+
+def test_random_bytes_endpoint(client):
+    """Test para verificar que se devuelven exactamente N bytes aleatorios."""
+    response = client.get("/api/v1/random/bytes", params={"length": 100000})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert len(response.content) == 100000
+
+
+def test_random_bytes_invalid_length(client):
+    """Test para verificar la validación de la longitud solicitada."""
+    response = client.get("/api/v1/random/bytes", params={"length": 0})
+    assert response.status_code == 422
+
+
+def test_stream_ndjson(client):
+    """Test para verificar el streaming de números en formato NDJSON."""
+    payload = {"min_value": 1, "max_value": 1000, "count": 20000, "unique": False}
+    response = client.post("/api/v1/random/stream", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    numbers = [json.loads(line) for line in response.text.splitlines()]
+    assert len(numbers) == 20000
+    assert all(1 <= n <= 1000 for n in numbers)
+
+
+def test_stream_unique_int64(client):
+    """Test para verificar el streaming binario de números únicos."""
+    payload = {"min_value": 1, "max_value": 50000, "count": 20000, "unique": True}
+    response = client.post("/api/v1/random/stream", params={"format": "int64"}, json=payload)
+    assert response.status_code == 200
+    numbers = np.frombuffer(response.content, dtype="<i8")
+    assert numbers.size == 20000
+    assert np.unique(numbers).size == 20000
+    assert numbers.min() >= 1 and numbers.max() <= 50000
+
+
+def test_stream_reuses_request_validation(client, invalid_random_request):
+    """Test para verificar que el streaming aplica la misma validación que /api/v1/random."""
+    response = client.post("/api/v1/random/stream", json=invalid_random_request)
+    assert response.status_code == 400
+    assert "min_value must be less than max_value" in response.json()["detail"]
+
+
+@pytest.fixture
+def falls_back_after_first_read(monkeypatch):
+    """Fixture que simula una fuente que pasa a os_urandom tras la primera lectura."""
+    reads = []
+
+    def read_entropy(num_bytes, raw=False):
+        reads.append(num_bytes)
+        return os.urandom(num_bytes), "quantum_simulator" if len(reads) == 1 else "os_urandom"
+
+    monkeypatch.setattr(main, "read_entropy", read_entropy)
+    return reads
+
+
+def test_bytes_stream_stops_when_source_changes(client, falls_back_after_first_read):
+    """Test para verificar que el flujo de bytes se corta si la fuente deja de ser la anunciada en la cabecera."""
+    with pytest.raises(main.EntropySourceChanged):
+        client.get("/api/v1/random/bytes", params={"length": 2 * main.BYTES_CHUNK_SIZE})
+    assert len(falls_back_after_first_read) == 2
+
+
+def test_number_stream_stops_when_source_changes(client, falls_back_after_first_read):
+    """Test para verificar que el flujo de números se corta si la fuente deja de ser la anunciada en la cabecera."""
+    request = {"min_value": 0, "max_value": 2**32 - 1, "count": 3 * main.STREAM_CHUNK_SIZE, "unique": False}
+    with pytest.raises(main.EntropySourceChanged):
+        client.post("/api/v1/random/stream", json=request)
@@ -21,4 +21,22 @@ def test_quantum_circuit_info(client):
     
     # Verificar que los conteos suman 1000
     total_counts = sum(data["measurement_counts"].values())
-    assert total_counts == 1000 
\ No newline at end of file
+    assert total_counts == 1000 
+
+
+def test_quantum_circuit_info_is_cached(client):
+    """Test para verificar que el resultado del circuito se reutiliza entre peticiones."""
+    first = client.get("/api/v1/quantum-circuit").json()
+    second = client.get("/api/v1/quantum-circuit").json()
+    assert first == second
+
+
+def test_quantum_circuit_refresh(client):
+    """Test para verificar que el refresco explícito recalcula el resultado."""
+    before = client.get("/api/v1/quantum-circuit").json()
+    response = client.post("/api/v1/quantum-circuit/refresh")
+    assert response.status_code == 200
+    refreshed = response.json()
+    assert refreshed["computed_at"] >= before["computed_at"]
+    assert sum(refreshed["measurement_counts"].values()) == 1000
+    assert client.get("/api/v1/quantum-circuit").json() == refreshed
@@ -0,0 +1,35 @@
+import time
+
+from src.circuit_info import CircuitInfoCache
+
+
+def make_counter():
+    """Crea una función de cálculo que cuenta cuántas veces se ejecuta."""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"calls": len(calls)}
+
+    return compute, calls
+
+
+def test_get_computes_once_while_fresh():
+    """Test para verificar que no se recalcula mientras el valor no ha caducado."""
+    compute, calls = make_counter()
+    cache = CircuitInfoCache(compute, ttl=60)
+    assert cache.get() == {"calls": 1}
+    assert cache.get() == {"calls": 1}
+    assert len(calls) == 1
+
+
+def test_stale_value_is_served_while_refreshing():
+    """Test para verificar que un valor caducado se sirve mientras se refresca en segundo plano."""
+    compute, calls = make_counter()
+    cache = CircuitInfoCache(compute, ttl=0)
+    assert cache.get() == {"calls": 1}
+    assert cache.get() == {"calls": 1}
+    deadline = time.time() + 5
+    while cache.peek() == {"calls": 1} and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.peek() == {"calls": 2}
@@ -0,0 +1,30 @@
+from qiskit_aer import AerSimulator
+
+from src.circuits import CircuitRegistry, create_multi_bit_circuit
+
+
+def test_multi_bit_circuit_structure():
+    """Test para verificar que el circuito aplica Hadamard y mide cada qubit."""
+    qc = create_multi_bit_circuit(6)
+    assert qc.num_qubits == 6
+    assert qc.count_ops() == {"h": 6, "measure": 6}
+
+
+def test_registry_reuses_preloaded_circuits():
+    """Test para verificar que los anchos precargados no se vuelven a construir."""
+    registry = CircuitRegistry(AerSimulator(), preload=(1, 32))
+    assert registry.get(32) is registry.get(32)
+    assert registry.get(1).depth() == 2
+    assert registry.builds == 2
+
+
+def test_registry_evicts_least_recently_used_width():
+    """Test para verificar la caché LRU para anchos poco comunes."""
+    registry = CircuitRegistry(AerSimulator(), cache_size=2)
+    first = registry.get(3)
+    registry.get(4)
+    registry.get(3)
+    registry.get(5)
+    assert registry.widths()["cached"] == [3, 5]
+    assert registry.get(3) is first
+    assert registry.builds == 3
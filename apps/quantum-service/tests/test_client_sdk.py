@@ -0,0 +1,153 @@
+import asyncio
+
+import httpx
+import pytest
+
+from quantum_client import AsyncQuantumClient, DrawSpec, QuantumClient, QuantumServiceError, RetryPolicy
+from src.main import app
+
+NO_WAIT = RetryPolicy(max_retries=2, backoff=0)
+
+
+@pytest.fixture
+def quantum_client(client):
+    """Fixture que proporciona el cliente SDK sobre el cliente de prueba de la API."""
+    return QuantumClient(http_client=client, retry=NO_WAIT)
+
+
+def test_random_draw(quantum_client):
+    """Test para verificar un sorteo a través del SDK."""
+    draw = quantum_client.random(1, 90, count=6)
+    assert len(set(draw.numbers)) == 6
+    assert draw.request_id
+
+
+def test_errors_raise_service_error(quantum_client):
+    """Test para verificar que los errores del servicio se convierten en excepciones."""
+    with pytest.raises(QuantumServiceError) as excinfo:
+        quantum_client.random(10, 1)
+    assert excinfo.value.status_code == 400
+
+
+def test_draw_buffer_uses_batches(quantum_client, monkeypatch):
+    """Test para verificar que el buffer de sorteos pide lotes completos."""
+    batches = []
+    random_batch = quantum_client.random_batch
+
+    def counting(specs):
+        batches.append(len(specs))
+        return random_batch(specs)
+
+    monkeypatch.setattr(quantum_client, "random_batch", counting)
+    buffer = quantum_client.draws(DrawSpec(1, 90, 6), prefetch=10)
+    draws = [buffer.next() for _ in range(15)]
+    assert len({draw.request_id for draw in draws}) == 15
+    assert batches == [10, 10]
+
+
+def test_number_and_byte_buffers(quantum_client):
+    """Test para verificar los buffers de números y bytes."""
+    numbers = quantum_client.numbers(1, 6, prefetch=50)
+    assert all(1 <= numbers.next() <= 6 for _ in range(120))
+    data = quantum_client.byte_buffer(chunk_size=256)
+    assert len(data.read(100)) == 100
+    assert len(data.read(500)) == 500
+
+
+def test_stream_numbers(quantum_client):
+    """Test para verificar la lectura en streaming a través del SDK."""
+    numbers = list(quantum_client.stream_numbers(1, 10, 1000))
+    assert len(numbers) == 1000
+
+
+def test_retries_transient_errors():
+    """Test para verificar que se reintentan los 503 y los errores de conexión."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection refused")
+        if len(calls) == 2:
+            return httpx.Response(503, json={"detail": "busy"}, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"status": "healthy"})
+
+    http = httpx.Client(transport=httpx.MockTransport(handler), base_url="http://test")
+    client = QuantumClient(http_client=http, retry=NO_WAIT)
+    assert client.health() == {"status": "healthy"}
+    assert len(calls) == 3
+
+
+def test_gives_up_after_max_retries():
+    """Test para verificar que se deja de reintentar tras el máximo configurado."""
+    http = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(503, json={"detail": "busy"})), base_url="http://test")
+    client = QuantumClient(http_client=http, retry=NO_WAIT)
+    with pytest.raises(QuantumServiceError) as excinfo:
+        client.health()
+    assert excinfo.value.status_code == 503
+
+
+@pytest.mark.parametrize("failure", [
+    httpx.ReadTimeout("read timed out"),
+    httpx.RemoteProtocolError("server disconnected"),
+    httpx.Response(502, json={"detail": "bad gateway"}),
+    httpx.Response(504, json={"detail": "gateway timeout"}),
+])
+def test_draws_are_not_retried_once_sent(failure):
+    """Test para verificar que un sorteo que pudo llegar al servidor no se reintenta."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if isinstance(failure, Exception):
+            raise failure
+        return failure
+
+    http = httpx.Client(transport=httpx.MockTransport(handler), base_url="http://test")
+    client = QuantumClient(http_client=http, retry=NO_WAIT)
+    with pytest.raises((httpx.TransportError, QuantumServiceError)):
+        client.random(1, 10)
+    with pytest.raises((httpx.TransportError, QuantumServiceError)):
+        client.random_batch([DrawSpec()])
+    assert len(calls) == 2
+
+
+def test_draws_are_retried_before_reaching_the_server():
+    """Test para verificar que un sorteo se reintenta tras un error de conexión o un 429/503."""
+    draw = {"numbers": [4], "source": "quantum_simulator", "timestamp": "2024-01-01T00:00:00", "request_id": "x"}
+    failures = [httpx.ConnectError("refused"), httpx.ConnectTimeout("timed out"), 429, 503]
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if failures:
+            failure = failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return httpx.Response(failure, json={"detail": "busy"}, headers={"Retry-After": "0"})
+        return httpx.Response(200, json=draw)
+
+    async def scenario():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test")
+        async with http, AsyncQuantumClient(http_client=http, retry=RetryPolicy(max_retries=4, backoff=0)) as client:
+            return await client.random(1, 10)
+
+    assert asyncio.run(scenario()).numbers == [4]
+    assert len(calls) == 5
+
+
+def test_async_client():
+    """Test para verificar el cliente asíncrono y su buffer con precarga."""
+    async def scenario():
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        async with http, AsyncQuantumClient(http_client=http, retry=NO_WAIT) as client:
+            draw = await client.random(1, 90, count=6, algorithm="combination")
+            buffer = client.draws(DrawSpec(1, 49, 6), prefetch=4)
+            draws = [await buffer.next() for _ in range(10)]
+            data = await client.byte_buffer(chunk_size=64).read(100)
+            return draw, draws, data
+
+    draw, draws, data = asyncio.run(scenario())
+    assert draw.numbers == sorted(draw.numbers)
+    assert len({d.request_id for d in draws}) == 10
+    assert len(data) == 100
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from src import main
+from src.drbg import HealthTestFailure, HealthTests, HmacDrbg, QuantumDrbg
+
+
+def test_hmac_drbg_matches_nist_vector():
+    """Test para verificar el HMAC-DRBG con un vector de prueba del NIST (SHA-256, sin resiembra)."""
+    drbg = HmacDrbg(
+        bytes.fromhex("ca851911349384bffe89de1cbdc46e6831e44d34a4fb935ee285dd14b71a7488"),
+        nonce=bytes.fromhex("659ba96c601dc69fc902940805ec0ca8"),
+    )
+    drbg.generate(128)
+    assert drbg.generate(128).hex() == (
+        "e528e9abf2dece54d47c7e75e5fe302149f817ea9fb4bee6f4199697d04d5b89"
+        "d54fbb978a15b5c443c9ec21036d2460b6f73ebad0dc2aba6e624abf07745bc1"
+        "07694bb7547bb0995f70de25d6b29e2d3011bb19d27676c07162c8b5ccde0668"
+        "961df86803482cb37ed6d5c0bb8d50cf1f50d476aa0458bdaba806f48be9dcb8"
+    )
+
+
+def test_health_tests_use_standard_cutoffs():
+    """Test para verificar los umbrales de SP 800-90B para bits con entropía completa."""
+    tests = HealthTests()
+    assert tests.repetition_cutoff == 21
+    assert tests.proportion_cutoff == 589
+    tests.check(os.urandom(1024))
+
+
+def test_health_tests_reject_stuck_and_biased_input():
+    """Test para verificar que las pruebas de salud rechazan entradas atascadas o sesgadas."""
+    tests = HealthTests()
+    with pytest.raises(HealthTestFailure, match="repetition"):
+        tests.check(b"\x00" * 4)
+    # Tres de cada cuatro bits a 1, sin rachas largas
+    with pytest.raises(HealthTestFailure, match="proportion"):
+        tests.check(b"\xee" * 256)
+
+
+def test_quantum_drbg_reseeds_after_interval():
+    """Test para verificar que el DRBG se resiembra tras el intervalo configurado."""
+    seeds = []
+
+    def seed_source(num_bytes):
+        seeds.append(num_bytes)
+        return os.urandom(num_bytes), "quantum_simulator"
+
+    drbg = QuantumDrbg(seed_source, lambda source: source == "quantum_simulator", reseed_bytes=1000, seed_bytes=128)
+    data, source = drbg.read(2500)
+    assert len(data) == 2500
+    assert source == "quantum_drbg"
+    assert seeds == [128, 128, 128]
+    assert drbg.stats()["reseeds"] == 3
+
+
+def test_quantum_drbg_reports_classical_seed():
+    """Test para verificar que el DRBG indica cuando su semilla no es cuántica."""
+    drbg = QuantumDrbg(lambda n: (os.urandom(n), "os_urandom"), lambda source: False)
+    assert drbg.read(16)[1] == "classical_drbg"
+
+
+def test_quantum_drbg_labels_each_read_by_its_seeds():
+    """Test para verificar que una lectura con algún fragmento de semilla clásica se marca como clásica."""
+    sources = ["quantum_simulator", "os_urandom", "quantum_simulator", "quantum_simulator"]
+    drbg = QuantumDrbg(
+        lambda n: (os.urandom(n), sources.pop(0)),
+        lambda source: source == "quantum_simulator",
+        reseed_bytes=1000,
+        seed_bytes=32,
+    )
+    # Seeded from quantum, then classical partway through
+    assert drbg.read(1500)[1] == "classical_drbg"
+    # Finishes the classical seed's interval before reseeding from quantum
+    assert drbg.read(1000)[1] == "classical_drbg"
+    assert drbg.read(1000)[1] == "quantum_drbg"
+
+
+def test_drbg_mode_marks_source_and_allows_raw(client, valid_random_request, monkeypatch):
+    """Test para verificar que el modo DRBG se indica en `source` y que se pueden pedir bits cuánticos directos."""
+    monkeypatch.setattr(main, "draw_batcher", None)
+    monkeypatch.setattr(main, "quantum_drbg", QuantumDrbg(main.read_raw_entropy, main.is_quantum_source))
+    assert client.post("/api/v1/random", json=valid_random_request).json()["source"] == "quantum_drbg"
+
+    raw = client.post("/api/v1/random", json={**valid_random_request, "raw_quantum": True}).json()
+    assert "drbg" not in raw["source"]
+    assert client.get("/api/v1/random/bytes", params={"length": 16}).headers["X-Entropy-Source"] == "quantum_drbg"
+    assert client.get("/api/v1/entropy/sources").json()["output_mode"] == "drbg"
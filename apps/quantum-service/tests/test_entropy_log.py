@@ -0,0 +1,70 @@
+import os
+import uuid
+
+import pytest
+
+from src import main
+from src.entropy_log import EntropyLogReader, EntropyLogWriter, ReplayEntropySource
+from src.entropy_sources import EntropySourceError, FallbackChain
+
+
+def test_log_round_trip(tmp_path):
+    """Test para verificar que los registros se leen tal como se escribieron."""
+    path = str(tmp_path / "entropy.log")
+    request_id = str(uuid.uuid4())
+    writer = EntropyLogWriter(path)
+    writer.append(request_id, "quantum_simulator", b"\x01\x02\x03")
+    writer.append(None, "os_urandom", b"\xff")
+    writer.close()
+
+    records = list(EntropyLogReader(path))
+    assert [(r.request_id, r.source, bytes(r.data)) for r in records] == [
+        (request_id, "quantum_simulator", b"\x01\x02\x03"),
+        (None, "os_urandom", b"\xff"),
+    ]
+    assert len(EntropyLogReader(path).for_request(request_id)) == 1
+
+
+def test_truncated_record_is_ignored(tmp_path):
+    """Test para verificar que un registro incompleto al final no rompe la lectura."""
+    path = str(tmp_path / "entropy.log")
+    writer = EntropyLogWriter(path)
+    writer.append(None, "os_urandom", b"\x00" * 32)
+    writer.close()
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 1)
+    assert list(EntropyLogReader(path)) == []
+
+
+def test_replay_serves_bytes_in_order(tmp_path):
+    """Test para verificar que la reproducción devuelve los bytes en orden, con otro troceado."""
+    path = str(tmp_path / "entropy.log")
+    writer = EntropyLogWriter(path)
+    writer.append(None, "os_urandom", b"abcd")
+    writer.append(None, "os_urandom", b"efgh")
+    writer.close()
+
+    source = ReplayEntropySource(path)
+    assert source.read(3) == b"abc"
+    assert source.read(4) == b"defg"
+    assert source.read(1) == b"h"
+    with pytest.raises(EntropySourceError):
+        source.read(1)
+
+
+def test_record_then_replay_reproduces_draw(client, valid_random_request, tmp_path, monkeypatch):
+    """Test para verificar que una tirada grabada se reproduce exactamente."""
+    path = str(tmp_path / "entropy.log")
+    writer = EntropyLogWriter(path)
+    monkeypatch.setattr(main, "entropy_log_writer", writer)
+    monkeypatch.setattr(main, "entropy_pool", None)
+    recorded = client.post("/api/v1/random", json=valid_random_request).json()
+    writer.close()
+
+    assert EntropyLogReader(path).for_request(recorded["request_id"])
+
+    monkeypatch.setattr(main, "entropy_log_writer", None)
+    monkeypatch.setattr(main, "entropy_chain", FallbackChain([(ReplayEntropySource(path), None)]))
+    replayed = client.post("/api/v1/random", json=valid_random_request).json()
+    assert replayed["numbers"] == recorded["numbers"]
+    assert replayed["source"] == "replay"
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from src.entropy_pool import EntropyPool
+
+
+def make_counting_source():
+    """Crea una fuente determinista que devuelve bytes consecutivos."""
+    position = [0]
+
+    def source(n):
+        data = bytes((position[0] + i) % 256 for i in range(n))
+        position[0] += n
+        return data, "counter"
+
+    return source
+
+
+def test_refill_reaches_high_watermark():
+    """Test para verificar que el rellenado llega a la marca superior."""
+    pool = EntropyPool(lambda n: (b"\x01" * n, "test"), capacity=100, high_watermark=0.8, chunk_size=30)
+    pool.refill()
+    stats = pool.stats()
+    assert stats["fill"] == 80
+    assert stats["bytes_produced"] == 80
+
+
+def test_take_wraps_around_ring_buffer():
+    """Test para verificar que los bytes salen en orden aunque el buffer dé la vuelta."""
+    pool = EntropyPool(make_counting_source(), capacity=10, low_watermark=0.1, high_watermark=1.0, chunk_size=10)
+    pool.refill()
+    assert pool.take(7) == bytes(range(7))
+    pool.refill()
+    assert pool.take(10) == bytes(range(7, 17))
+
+
+def test_take_generates_shortfall_synchronously():
+    """Test para verificar que se generan los bytes que faltan cuando el pool está vacío."""
+    pool = EntropyPool(lambda n: (b"\x02" * n, "test"), capacity=16)
+    data = pool.take(40)
+    assert data == b"\x02" * 40
+    assert pool.stats()["misses"] == 1
+
+
+def test_background_worker_refills_pool():
+    """Test para verificar que el hilo en segundo plano rellena el pool."""
+    pool = EntropyPool(lambda n: (b"\x03" * n, "test"), capacity=64, high_watermark=0.5, chunk_size=8)
+    pool.start()
+    try:
+        deadline = time.time() + 5
+        while pool.stats()["fill"] < 32 and time.time() < deadline:
+            time.sleep(0.01)
+        assert pool.stats()["fill"] == 32
+        assert pool.stats()["worker_running"]
+    finally:
+        pool.stop()
+    assert not pool.stats()["worker_running"]
+
+
+def test_take_reports_source_names():
+    """Test para verificar que el pool indica qué backend generó los bytes."""
+    names = iter(["quantum_simulator", "os_urandom"])
+    pool = EntropyPool(lambda n: (b"\x04" * n, next(names)), capacity=8, high_watermark=0.5)
+    pool.refill()
+    assert pool.take_with_source(4) == (b"\x04" * 4, "quantum_simulator")
+    assert pool.take_with_source(4) == (b"\x04" * 4, "os_urandom")
+
+
+def test_invalid_watermarks():
+    """Test para verificar la validación de las marcas de nivel."""
+    with pytest.raises(ValueError):
+        EntropyPool(lambda n: (b"", "test"), low_watermark=0.9, high_watermark=0.5)
+
+
+def test_entropy_pool_endpoint(client):
+    """Test para verificar el endpoint de estadísticas del pool."""
+    response = client.get("/api/v1/entropy/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is True
+    assert "fill_ratio" in data
+    assert "refill_rate_bytes_per_sec" in data
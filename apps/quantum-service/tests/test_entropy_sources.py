@@ -0,0 +1,169 @@
+import dataclasses
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from qiskit_aer import AerSimulator
+
+from src.circuits import CircuitRegistry
+from src.config import settings
+from src.entropy_chain import build_entropy_chain, create_quantum_backend
+from src.entropy_sources import (
+    EntropySource,
+    EntropySourceError,
+    FallbackChain,
+    LazyEntropySource,
+    RuntimeEntropySource,
+    UrandomEntropySource,
+)
+
+
+class SlowSource(EntropySource):
+    name = "slow"
+
+    def read(self, num_bytes):
+        time.sleep(1)
+        return b"\x00" * num_bytes
+
+
+class BrokenSource(EntropySource):
+    name = "broken"
+
+    def read(self, num_bytes):
+        raise RuntimeError("backend unavailable")
+
+
+def test_runtime_stand_in_returns_requested_bytes():
+    """Test para verificar el sustituto local del runtime cuántico."""
+    source = RuntimeEntropySource(CircuitRegistry(AerSimulator()))
+    assert len(source.read(37)) == 37
+
+
+def test_chain_uses_primary_source():
+    """Test para verificar que se usa la primera fuente cuando responde."""
+    chain = FallbackChain([(UrandomEntropySource(), None)])
+    data, name = chain.read(16)
+    assert len(data) == 16
+    assert name == "os_urandom"
+    assert chain.fallbacks == 0
+
+
+def test_chain_falls_back_on_timeout():
+    """Test para verificar que una fuente lenta cede el paso a la siguiente."""
+    chain = FallbackChain([(SlowSource(), 0.05), (UrandomEntropySource(), None)])
+    data, name = chain.read(8)
+    assert name == "os_urandom"
+    stats = chain.stats()
+    assert stats["fallbacks"] == 1
+    assert stats["chain"][0]["timeouts"] == 1
+    chain.shutdown()
+
+
+def test_chain_skips_source_while_abandoned_read_runs():
+    """Test para verificar que una fuente colgada se omite hasta que termina su lectura abandonada."""
+    chain = FallbackChain([(SlowSource(), 0.05), (UrandomEntropySource(), None)])
+    chain.read(8)
+    start = time.perf_counter()
+    _, name = chain.read(8)
+    assert name == "os_urandom"
+    assert time.perf_counter() - start < 0.05
+    stats = chain.stats()["chain"][0]
+    assert (stats["timeouts"], stats["skipped"], stats["abandoned"]) == (1, 1, 1)
+
+    time.sleep(1.1)
+    assert chain.stats()["chain"][0]["abandoned"] == 0
+    chain.shutdown()
+
+
+class CountingSource(EntropySource):
+    name = "counting"
+
+    def __init__(self, fail_after=None):
+        self.reads = []
+        self.fail_after = fail_after
+
+    def read(self, num_bytes):
+        if self.fail_after is not None and len(self.reads) >= self.fail_after:
+            raise RuntimeError("backend unavailable")
+        self.reads.append(num_bytes)
+        return b"\x00" * num_bytes
+
+
+def test_chain_reads_in_bounded_chunks():
+    """Test para verificar que las lecturas grandes se dividen en fragmentos acotados con su propio límite de tiempo."""
+    source = CountingSource()
+    chain = FallbackChain([(source, 1.0), (UrandomEntropySource(), None)], chunk_size=1000)
+    data, name = chain.read(2500)
+    assert len(data) == 2500
+    assert name == "counting"
+    assert source.reads == [1000, 1000, 500]
+    chain.shutdown()
+
+
+def test_chunked_read_names_every_source_used():
+    """Test para verificar que una lectura troceada indica todas las fuentes que la produjeron."""
+    chain = FallbackChain([(CountingSource(fail_after=1), 1.0), (UrandomEntropySource(), None)], chunk_size=100)
+    data, name = chain.read(300)
+    assert len(data) == 300
+    assert name == "counting+os_urandom"
+    assert chain.stats()["fallbacks"] == 2
+    chain.shutdown()
+
+
+def test_chain_falls_back_on_error():
+    """Test para verificar que una fuente con errores cede el paso a la siguiente."""
+    chain = FallbackChain([(BrokenSource(), 1.0), (UrandomEntropySource(), None)])
+    assert chain.read(8)[1] == "os_urandom"
+    assert chain.stats()["chain"][0]["errors"] == 1
+    chain.shutdown()
+
+
+def test_chain_raises_when_every_source_fails():
+    """Test para verificar el error cuando ninguna fuente responde."""
+    chain = FallbackChain([(BrokenSource(), None)])
+    with pytest.raises(EntropySourceError):
+        chain.read(8)
+
+
+def test_response_reports_entropy_source(client, valid_random_request):
+    """Test para verificar que la respuesta indica el backend real en el campo source."""
+    response = client.post("/api/v1/random", json=valid_random_request)
+    assert response.json()["source"] == "quantum_simulator"
+    stats = client.get("/api/v1/entropy/sources").json()
+    assert stats["chain"][0]["name"] == "quantum_simulator"
+
+
+def test_lazy_source_builds_on_first_read():
+    """Test para verificar que una fuente diferida no se construye hasta la primera lectura."""
+    built = []
+
+    def factory():
+        built.append(True)
+        return UrandomEntropySource()
+
+    source = LazyEntropySource(UrandomEntropySource, factory)
+    assert source.name == "os_urandom"
+    assert not source.quantum
+    assert not built
+    assert len(source.read(8)) == 8
+    source.read(8)
+    assert len(built) == 1
+
+
+def test_chain_is_built_from_settings():
+    """Test para verificar que la cadena se construye en el orden configurado y solo la última fuente no tiene límite."""
+    configured = dataclasses.replace(settings, entropy_sources=("quantum_simulator", "os_urandom"), entropy_source_timeout=2.5)
+    chain = build_entropy_chain(configured, create_quantum_backend(configured))
+    assert [(source.name, timeout) for source, timeout in chain.sources] == [("quantum_simulator", 2.5), ("os_urandom", None)]
+    chain.shutdown()
+
+    with pytest.raises(ValueError):
+        build_entropy_chain(dataclasses.replace(settings, entropy_sources=("nope",)), create_quantum_backend(settings))
+
+
+def test_producer_builds_chain_without_importing_the_app():
+    """Test para verificar que el productor del pool compartido no importa la aplicación."""
+    code = "import sys; import src.serve; assert 'src.main' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
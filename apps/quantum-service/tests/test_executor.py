@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.executor import ExecutorSaturated, SimulatorExecutor
+from src import main
+from src.main import simulator_executor
+
+
+def test_run_returns_result():
+    """Test para verificar que el ejecutor devuelve el resultado de la tarea."""
+    executor = SimulatorExecutor(max_workers=1, max_queue=1)
+    try:
+        assert asyncio.run(executor.run(sum, [1, 2, 3])) == 6
+        assert executor.stats()["in_flight"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_submit_rejects_when_queue_is_full():
+    """Test para verificar que se rechazan tareas cuando la cola está llena."""
+    executor = SimulatorExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        executor.submit(release.wait)
+        executor.submit(release.wait)
+        with pytest.raises(ExecutorSaturated):
+            executor.submit(release.wait)
+        assert executor.stats()["rejected"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_run_when_free_waits_for_a_slot():
+    """Test para verificar que run_when_free espera un hueco en lugar de rechazar la tarea."""
+    executor = SimulatorExecutor(max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        executor.submit(release.wait)
+        waiting = asyncio.ensure_future(executor.run_when_free(sum, [1, 2]))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        release.set()
+        return await waiting
+
+    try:
+        assert asyncio.run(scenario()) == 3
+        assert executor.stats()["rejected"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_saturated_executor_returns_503(client, valid_random_request, monkeypatch):
+    """Test para verificar que el endpoint responde 503 cuando el simulador está saturado."""
+    def saturated(*args, **kwargs):
+        raise ExecutorSaturated("Simulator queue is full")
+
+    monkeypatch.setattr(simulator_executor, "submit", saturated)
+    response = client.post("/api/v1/random", json=valid_random_request)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_byte_stream_continues_while_executor_is_saturated(client, monkeypatch):
+    """Test para verificar que los fragmentos posteriores de un flujo esperan al ejecutor en vez de fallar."""
+    submit = simulator_executor.submit
+    calls = []
+
+    def saturated_after_first(*args, **kwargs):
+        calls.append(args)
+        if len(calls) > 1:
+            raise ExecutorSaturated("Simulator queue is full")
+        return submit(*args, **kwargs)
+
+    monkeypatch.setattr(simulator_executor, "submit", saturated_after_first)
+    response = client.get("/api/v1/random/bytes", params={"length": 3 * main.BYTES_CHUNK_SIZE})
+    assert response.status_code == 200
+    assert len(response.content) == 3 * main.BYTES_CHUNK_SIZE
+    assert len(calls) == 1
@@ -7,4 +7,46 @@ def test_health_endpoint(client):
     assert response.json() == {
         "status": "healthy",
         "service": "quantum-random-number-generator"
-    } 
\ No newline at end of file
+    } 
+
+
+def test_ready_endpoint_waits_for_quantum_backend(client, monkeypatch):
+    """Test para verificar que /ready responde 503 hasta que Qiskit está cargado."""
+    from src import main
+    from src.quantum_backend import QuantumBackend
+
+    backend = QuantumBackend(circuit_widths=(1,))
+    monkeypatch.setattr(main, "quantum", backend)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    backend.load()
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_shared_pool_workers_are_ready_without_qiskit(client, monkeypatch):
+    """Test para verificar que los workers del pool compartido están listos sin cargar Qiskit."""
+    import dataclasses
+
+    from src import main
+    from src.quantum_backend import QuantumBackend
+
+    monkeypatch.setattr(main, "quantum", QuantumBackend(circuit_widths=(1,)))
+    monkeypatch.setattr(main, "settings", dataclasses.replace(main.settings, shared_pool_name="qrng-test"))
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["shared_pool"] == "qrng-test"
+    assert not response.json()["loaded"]
+
+
+def test_import_does_not_load_qiskit():
+    """Test para verificar que importar la app no importa Qiskit."""
+    import subprocess
+    import sys
+
+    code = "import sys, src.main; print('qiskit' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,148 @@
+import asyncio
+import datetime
+import os
+import time
+import uuid
+
+import httpx
+import pytest
+
+from src import main
+from src.ledger import DrawLedger, encode_record, lookup
+
+
+def make_record(request_id, numbers=(3, 14, 15), min_value=1, max_value=49):
+    timestamp = datetime.datetime(2024, 1, 2, 3, 4, 5, 678901)
+    return encode_record(request_id, timestamp, min_value, max_value, True, "sequential", False, "quantum_simulator", list(numbers))
+
+
+def test_ledger_round_trip(tmp_path):
+    """Test para verificar que un sorteo se recupera tal como se guardó."""
+    ledger = DrawLedger(str(tmp_path / "draws.ledger"))
+    request_id = str(uuid.uuid4())
+    ledger.append(make_record(request_id))
+    record = ledger.get(request_id)
+    assert record.numbers == [3, 14, 15]
+    assert record.timestamp == datetime.datetime(2024, 1, 2, 3, 4, 5, 678901)
+    assert (record.min_value, record.max_value, record.unique, record.source) == (1, 49, True, "quantum_simulator")
+    assert ledger.get(str(uuid.uuid4())) is None
+    ledger.close()
+
+
+def test_ledger_stores_values_beyond_int64(tmp_path):
+    """Test para verificar que se guardan números que no caben en 64 bits."""
+    ledger = DrawLedger(str(tmp_path / "draws.ledger"), sync_interval=0)
+    request_id = str(uuid.uuid4())
+    ledger.append(make_record(request_id, numbers=[1 << 70], min_value=0, max_value=1 << 80))
+    assert ledger.get(request_id).numbers == [1 << 70]
+    ledger.close()
+
+
+def test_index_grows_and_survives_reopen(tmp_path):
+    """Test para verificar que el índice crece y se conserva al reabrir el libro."""
+    path = str(tmp_path / "draws.ledger")
+    ledger = DrawLedger(path)
+    request_ids = [main.new_request_id() for _ in range(3000)]
+    for request_id in request_ids:
+        ledger.append(make_record(request_id))
+    assert ledger.index.capacity > 1024
+    ledger.close()
+
+    reopened = DrawLedger(path)
+    assert reopened.records == 3000
+    assert reopened.get(request_ids[1234]).request_id == request_ids[1234]
+    reopened.close()
+    assert lookup(path, request_ids[42]).request_id == request_ids[42]
+
+
+def test_index_is_rebuilt_and_truncated_tail_dropped(tmp_path):
+    """Test para verificar que el índice se reconstruye y que se descarta un registro incompleto."""
+    path = str(tmp_path / "draws.ledger")
+    ledger = DrawLedger(path)
+    first, second = str(uuid.uuid4()), str(uuid.uuid4())
+    ledger.append(make_record(first))
+    ledger.append(make_record(second))
+    ledger.close()
+    os.remove(path + ".idx")
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 1)
+
+    ledger = DrawLedger(path)
+    assert ledger.get(first) is not None
+    assert ledger.get(second) is None
+    # New records follow the last complete one
+    third = str(uuid.uuid4())
+    ledger.append(make_record(third))
+    assert [record.request_id for record in ledger] == [first, third]
+    ledger.close()
+
+
+def test_corrupt_record_is_detected(tmp_path):
+    """Test para verificar que un registro alterado falla la suma de comprobación."""
+    path = str(tmp_path / "draws.ledger")
+    ledger = DrawLedger(path)
+    request_id = str(uuid.uuid4())
+    ledger.append(make_record(request_id))
+    ledger.close()
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"\xff")
+    ledger = DrawLedger(path)
+    with pytest.raises(ValueError):
+        ledger.get(request_id)
+    ledger.close()
+
+
+def test_draw_can_be_fetched_by_request_id(client, valid_random_request, tmp_path, monkeypatch):
+    """Test para verificar que un sorteo se consulta por su request_id."""
+    ledger = DrawLedger(str(tmp_path / "draws.ledger"))
+    monkeypatch.setattr(main, "draw_ledger", ledger)
+    draw = client.post("/api/v1/random", json=valid_random_request).json()
+    batch = client.post("/api/v1/random/batch", json=[valid_random_request] * 2).json()
+
+    for expected in [draw, *batch]:
+        response = client.get(f"/api/v1/random/{expected['request_id']}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["numbers"] == expected["numbers"]
+        assert data["timestamp"] == expected["timestamp"]
+        assert data["source"] == expected["source"]
+        assert data["count"] == valid_random_request["count"]
+
+    assert client.get(f"/api/v1/random/{uuid.uuid4()}").status_code == 404
+    assert client.get("/api/v1/random/not-a-uuid").status_code == 404
+    # The bytes endpoint still takes precedence over the lookup route
+    assert client.get("/api/v1/random/bytes", params={"length": 4}).status_code == 200
+    ledger.close()
+
+
+def test_slow_ledger_appends_do_not_block_the_event_loop(valid_random_request, tmp_path, monkeypatch):
+    """Test para verificar que un apunte lento en el libro no bloquea al resto de peticiones."""
+    ledger = DrawLedger(str(tmp_path / "draws.ledger"))
+    append = ledger.append
+
+    def slow_append(record):
+        # Stands in for the index growing on a large ledger
+        time.sleep(0.5)
+        return append(record)
+
+    monkeypatch.setattr(ledger, "append", slow_append)
+    monkeypatch.setattr(main, "draw_ledger", ledger)
+
+    async def timed(request):
+        response = await request
+        return response, time.perf_counter()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            draw = asyncio.ensure_future(timed(client.post("/api/v1/random", json=valid_random_request)))
+            await asyncio.sleep(0.1)
+            health = await timed(client.get("/health"))
+            return await draw, health
+
+    (draw, drawn_at), (health, healthy_at) = asyncio.run(scenario())
+    assert draw.status_code == 200 and health.status_code == 200
+    assert healthy_at < drawn_at
+    assert ledger.get(draw.json()["request_id"]) is not None
+    ledger.close()
@@ -0,0 +1,49 @@
+import pytest
+
+from src.metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_counter_and_gauge_rendering():
+    """Test para verificar el formato de texto de Prometheus para contadores y gauges."""
+    registry = Registry()
+    jobs = registry.register(Counter("jobs_total", "Jobs run", ("backend",)))
+    registry.register(Gauge("fill_bytes", "Pool fill", callback=lambda: 42))
+    jobs.inc(backend="aer")
+    jobs.inc(2, backend="aer")
+    output = registry.render()
+    assert "# TYPE jobs_total counter" in output
+    assert 'jobs_total{backend="aer"} 3' in output
+    assert "fill_bytes 42" in output
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test para verificar que los buckets del histograma son acumulativos."""
+    histogram = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_count 3" in lines
+
+
+def test_metric_rejects_wrong_labels():
+    """Test para verificar que se validan los nombres de las etiquetas."""
+    counter = Counter("requests_total", "Requests", ("route",))
+    with pytest.raises(ValueError):
+        counter.inc(path="/")
+
+
+def test_metrics_endpoint_reports_draw_pipeline(client, valid_random_request):
+    """Test para verificar que /metrics expone la instrumentación del sorteo."""
+    client.post("/api/v1/random", json=valid_random_request)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'quantum_http_request_duration_seconds_count{method="POST",route="/api/v1/random",status="200"}' in body
+    assert 'quantum_draw_stage_duration_seconds_count{stage="sampling"}' in body
+    assert 'quantum_request_bits_consumed_count{endpoint="random"}' in body
+    assert "quantum_unique_draw_retries_total" in body
+    assert "quantum_classical_fallbacks_total" in body
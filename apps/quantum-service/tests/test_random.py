@@ -50,4 +50,30 @@ def test_generate_random_numbers_too_many_unique(client):
     }
     response = client.post("/api/v1/random", json=invalid_request)
     assert response.status_code == 400
-    assert "Cannot generate" in response.json()["detail"] 
\ No newline at end of file
+    assert "Cannot generate" in response.json()["detail"] 
+
+def test_generate_random_numbers_combination(client):
+    """Test para verificar el modo de sorteo por combinación."""
+    response = client.post("/api/v1/random", json={
+        "min_value": 1,
+        "max_value": 90,
+        "count": 6,
+        "unique": True,
+        "algorithm": "combination"
+    })
+    assert response.status_code == 200
+    numbers = response.json()["numbers"]
+    assert len(set(numbers)) == 6
+    assert numbers == sorted(numbers)
+
+def test_generate_random_numbers_combination_requires_unique(client):
+    """Test para verificar que el modo combinación exige números únicos."""
+    response = client.post("/api/v1/random", json={
+        "min_value": 1,
+        "max_value": 90,
+        "count": 6,
+        "unique": False,
+        "algorithm": "combination"
+    })
+    assert response.status_code == 400
+    assert "requires unique" in response.json()["detail"]
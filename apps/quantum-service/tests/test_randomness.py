@@ -0,0 +1,79 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.randomness import (
+    OnlineMonitor,
+    block_frequency_test,
+    cumulative_sums_test,
+    frequency_test,
+    range_chi_square_test,
+    run_all,
+    runs_test,
+)
+
+
+def bits(text):
+    """Convierte una cadena de ceros y unos en un array de bits."""
+    return np.array([int(c) for c in text], dtype=np.uint8)
+
+
+@pytest.mark.parametrize("test,sequence,expected", [
+    (frequency_test, "1011010101", 0.527089),
+    (runs_test, "1001101011", 0.147232),
+    (lambda b: block_frequency_test(b, block_size=3), "0110011010", 0.801252),
+    (cumulative_sums_test,
+     "1100100100001111110110101010001000100001011010001100001000110100110001001100011001100010100010111000",
+     0.219194),
+])
+def test_nist_reference_values(test, sequence, expected):
+    """Test para verificar los p-valores contra los ejemplos de NIST SP 800-22."""
+    assert test(bits(sequence))["p_value"] == pytest.approx(expected, abs=1e-5)
+
+
+def test_run_all_passes_on_urandom():
+    """Test para verificar que datos de os.urandom superan la batería de tests."""
+    report = run_all(os.urandom(1 << 17), alpha=0.0001)
+    assert report["passed"], report["failed"]
+
+
+def test_run_all_detects_bias():
+    """Test para verificar que se detectan datos sesgados."""
+    biased = bytes(b & 0xF7 for b in os.urandom(1 << 14))
+    report = run_all(biased)
+    assert not report["passed"]
+    assert "frequency" in report["failed"]
+
+
+def test_range_chi_square_detects_modulo_bias():
+    """Test para verificar que el chi-cuadrado detecta el sesgo del módulo."""
+    raw = np.frombuffer(os.urandom(60000), dtype=np.uint8)
+    assert not range_chi_square_test((raw % 100) + 1, 1, 100)["passed"]
+
+
+def test_online_monitor_reports_after_window():
+    """Test para verificar que el monitor en línea analiza la ventana muestreada."""
+    monitor = OnlineMonitor(fraction=1.0, window_bytes=4096)
+    for _ in range(4):
+        monitor.observe(os.urandom(1024))
+    deadline = time.time() + 5
+    while monitor.last_report is None and time.time() < deadline:
+        time.sleep(0.05)
+    assert monitor.status()["reports"] == 1
+    assert monitor.last_report["bytes"] == 4096
+
+
+def test_service_output_passes(client):
+    """Test para verificar que la salida del servicio no presenta sesgo."""
+    response = client.get("/api/v1/random/bytes", params={"length": 1 << 16})
+    report = run_all(response.content, alpha=0.0001)
+    assert report["passed"], report["failed"]
+
+
+def test_entropy_health_endpoint(client):
+    """Test para verificar el endpoint de salud de la entropía."""
+    response = client.get("/api/v1/entropy/health")
+    assert response.status_code == 200
+    assert "last_report" in response.json()
@@ -0,0 +1,142 @@
+import math
+import os
+from collections import Counter
+
+import pytest
+
+from src.bit_engine import BitStream
+from src.sampling import (
+    combination_bits,
+    combination_ints,
+    expected_bits,
+    uniform_int,
+    uniform_ints,
+    unique_ints,
+    unrank_combination,
+)
+
+
+@pytest.fixture
+def stream():
+    """Fixture que proporciona un flujo de bits respaldado por os.urandom."""
+    return BitStream(os.urandom)
+
+
+def test_uniform_int_rejects_out_of_range_values():
+    """Test para verificar que los valores fuera de rango se descartan en lugar de aplicar módulo."""
+    # 0b111 (7) is out of range for [0, 4], 0b011 (3) is accepted
+    stream = BitStream(os.urandom, initial=bytes([0b11101100]))
+    assert uniform_int(stream, 0, 4) == 3
+    assert stream.bits_consumed == 6
+
+
+def test_read_bits_array_matches_scalar_reads():
+    """Test para verificar que la lectura vectorizada coincide con la lectura bit a bit."""
+    data = os.urandom(64)
+    scalar = BitStream(os.urandom, initial=data)
+    vector = BitStream(os.urandom, initial=data)
+    expected = [scalar.read_bits(13) for _ in range(30)]
+    assert vector.read_bits_array(13, 30).tolist() == expected
+
+
+def test_uniform_ints_in_range(stream):
+    """Test para verificar que los números generados están dentro del rango."""
+    numbers = uniform_ints(stream, -5, 10, 5000)
+    assert len(numbers) == 5000
+    assert min(numbers) >= -5 and max(numbers) <= 10
+    # Every value should show up in a sample this large
+    assert set(numbers) == set(range(-5, 11))
+
+
+def test_uniform_ints_are_unbiased(stream):
+    """Test para verificar que no hay sesgo hacia los valores bajos del rango."""
+    counts = Counter(uniform_ints(stream, 0, 5, 60000))
+    expected = 10000
+    chi_square = sum((counts[v] - expected) ** 2 / expected for v in range(6))
+    # 5 degrees of freedom, p = 0.001
+    assert chi_square < 20.5
+
+
+def test_uniform_ints_with_large_range(stream):
+    """Test para verificar rangos que no caben en enteros de 64 bits."""
+    low, high = 0, 2 ** 80
+    numbers = uniform_ints(stream, low, high, 20)
+    assert all(low <= n <= high for n in numbers)
+
+
+@pytest.mark.parametrize("low,high,count", [(1, 90, 6), (1, 10, 10), (1, 100, 70), (0, 2 ** 70, 50)])
+def test_unique_ints(stream, low, high, count):
+    """Test para verificar que los sorteos únicos no repiten números."""
+    numbers = unique_ints(stream, low, high, count)
+    assert len(numbers) == count
+    assert len(set(numbers)) == count
+    assert all(low <= n <= high for n in numbers)
+
+
+def test_unique_ints_full_permutation(stream):
+    """Test para verificar que pedir todo el rango devuelve una permutación."""
+    numbers = unique_ints(stream, 1, 50, 50)
+    assert sorted(numbers) == list(range(1, 51))
+
+
+def test_unique_ints_too_many(stream):
+    """Test para verificar que no se pueden pedir más números únicos que el tamaño del rango."""
+    with pytest.raises(ValueError):
+        unique_ints(stream, 1, 5, 6)
+
+
+def test_expected_bits():
+    """Test para verificar la estimación de bits necesarios."""
+    # 8 values need exactly 3 bits each with no rejection
+    assert expected_bits(0, 7, 10, unique=False) == 30
+    assert expected_bits(1, 90, 6, unique=True) > 6 * 7
+
+
+def test_expected_bits_for_huge_ranges():
+    """Test para verificar la estimación con rangos enormes sin desbordamiento."""
+    assert expected_bits(0, 2**60, 2, unique=True) >= 2 * 61
+    assert expected_bits(0, 10**400, 3, unique=True) == expected_bits(0, 10**400, 3, unique=False) > 3 * 1328
+
+
+def test_random_endpoint_huge_unique_range(client):
+    """Test para verificar que se atienden sorteos únicos en rangos mayores que un float."""
+    response = client.post("/api/v1/random", json={"min_value": 0, "max_value": 10**400, "count": 3, "unique": True})
+    assert response.status_code == 200
+    numbers = response.json()["numbers"]
+    assert len(set(numbers)) == 3
+    assert all(0 <= number <= 10**400 for number in numbers)
+
+
+def test_unrank_combination_is_a_bijection():
+    """Test para verificar que cada rango corresponde a una combinación distinta."""
+    combinations = {tuple(unrank_combination(rank, 10, 4)) for rank in range(math.comb(10, 4))}
+    assert len(combinations) == math.comb(10, 4)
+    assert all(list(c) == sorted(set(c)) and c[-1] < 10 for c in combinations)
+
+
+def test_combination_ints(stream):
+    """Test para verificar que un sorteo por combinación devuelve números únicos y ordenados."""
+    numbers = combination_ints(stream, 1, 90, 6)
+    assert len(set(numbers)) == 6
+    assert numbers == sorted(numbers)
+    assert all(1 <= n <= 90 for n in numbers)
+
+
+def test_combination_ints_are_unbiased(stream):
+    """Test para verificar que todas las combinaciones son equiprobables."""
+    # C(6, 2) = 15 combinations
+    counts = Counter(tuple(combination_ints(stream, 0, 5, 2)) for _ in range(15000))
+    expected = 1000
+    chi_square = sum((counts[c] - expected) ** 2 / expected for c in counts)
+    assert len(counts) == 15
+    # 14 degrees of freedom, p = 0.001
+    assert chi_square < 36.1
+
+
+def test_combination_uses_one_rank_of_bits():
+    """Test para verificar que una combinación cuesta ceil(log2 C(n, k)) bits por intento."""
+    # C(90, 6) needs 30 bits; an all-zero stream gives rank 0 on the first attempt
+    stream = BitStream(lambda n: bytes(n), initial=bytes(8))
+    assert combination_ints(stream, 1, 90, 6) == [1, 2, 3, 4, 5, 6]
+    assert stream.bits_consumed == 30
+    assert combination_bits(1, 90, 6) < expected_bits(1, 90, 6, unique=True)
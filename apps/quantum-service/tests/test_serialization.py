@@ -0,0 +1,76 @@
+import json
+import uuid
+
+import pytest
+
+from src import serialization
+from src.serialization import RequestIdGenerator, dumps, encode_response
+
+
+def test_request_ids_are_unique_uuids():
+    """Test para verificar que los identificadores son únicos y tienen formato UUID."""
+    generate = RequestIdGenerator()
+    ids = [generate() for _ in range(1000)]
+    assert len(set(ids)) == 1000
+    parsed = uuid.UUID(ids[0])
+    assert str(parsed) == ids[0]
+    assert all(uuid.UUID(request_id).version == 4 for request_id in ids)
+    assert all(uuid.UUID(request_id).variant == uuid.RFC_4122 for request_id in ids)
+
+
+def test_request_ids_are_not_sequential():
+    """Test para verificar que los identificadores no se pueden deducir unos de otros."""
+    generate = RequestIdGenerator(batch=4)
+    values = [uuid.UUID(generate()).int for _ in range(9)]
+    # No shared prefix or counter: consecutive IDs differ across both halves
+    assert len({value >> 64 for value in values}) == 9
+    assert all(abs(b - a) != 1 for a, b in zip(values, values[1:]))
+
+
+def test_dumps_without_orjson(monkeypatch):
+    """Test para verificar que sin orjson se usa el codificador JSON estándar."""
+    content = {"numbers": [1, 2, 3], "source": "quantum_simulator"}
+    fast = dumps(content)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert dumps(content) == fast
+    assert json.loads(fast) == content
+
+
+def test_dumps_integers_beyond_64_bits():
+    """Test para verificar que se codifican enteros que no caben en 64 bits."""
+    content = {"numbers": [1 << 70, -(1 << 63) - 5]}
+    assert json.loads(dumps(content)) == content
+
+
+def test_msgpack_falls_back_to_json_when_unavailable(monkeypatch):
+    """Test para verificar que se responde en JSON si msgpack no está instalado."""
+    monkeypatch.setattr(serialization, "msgpack", None)
+    response = encode_response({"numbers": [1]}, "application/msgpack")
+    assert response.media_type == "application/json"
+
+
+def test_random_endpoint_msgpack(client, valid_random_request):
+    """Test para verificar la respuesta en MessagePack cuando se solicita en Accept."""
+    msgpack = pytest.importorskip("msgpack")
+    response = client.post("/api/v1/random", json=valid_random_request, headers={"Accept": "application/msgpack"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    assert len(msgpack.unpackb(response.content)["numbers"]) == valid_random_request["count"]
+
+
+@pytest.mark.parametrize("accept", [None, "application/msgpack"])
+def test_random_endpoint_range_beyond_64_bits(client, accept):
+    """Test para verificar que se responden sorteos con rangos de más de 64 bits."""
+    request = {"min_value": 0, "max_value": 2**70, "count": 3, "unique": False}
+    headers = {"Accept": accept} if accept else {}
+    response = client.post("/api/v1/random", json=request, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    numbers = response.json()["numbers"]
+    assert len(numbers) == 3
+    assert all(0 <= number <= 2**70 for number in numbers)
+
+    request = {"min_value": -(2**63) - 5, "max_value": -(2**63), "count": 2, "unique": False}
+    response = client.post("/api/v1/random/batch", json=[request])
+    assert response.status_code == 200
+    assert all(number <= -(2**63) for number in response.json()[0]["numbers"])
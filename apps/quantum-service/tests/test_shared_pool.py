@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import threading
+import time
+
+from src.shared_pool import SharedEntropyPool, SharedRingBuffer, StopFlag, run_producer
+
+
+def urandom_source(num_bytes):
+    return os.urandom(num_bytes), "os_urandom"
+
+
+def test_ring_buffer_round_trip():
+    """Test para verificar que los bytes escritos se leen en orden, también al dar la vuelta."""
+    buffer = SharedRingBuffer.create(capacity=32, chunk_size=8)
+    try:
+        consumer = SharedRingBuffer.attach(buffer.name)
+        chunks = [bytes([i]) * 8 for i in range(4)]
+        for chunk in chunks:
+            assert buffer.write_chunk(chunk, "quantum_simulator")
+        # Full: no room for another chunk
+        assert not buffer.write_chunk(b"\x09" * 8, "quantum_simulator")
+
+        data, sources = consumer.read(12)
+        assert data == chunks[0] + chunks[1][:4]
+        assert sources == ["quantum_simulator"]
+
+        assert buffer.write_chunk(b"\x05" * 8, "os_urandom")
+        data, sources = consumer.read(100)
+        assert data == chunks[1][4:] + chunks[2] + chunks[3] + b"\x05" * 8
+        assert sources == ["quantum_simulator", "os_urandom"]
+        assert consumer.stats()["bytes_consumed"] == 40
+        consumer.close()
+    finally:
+        buffer.close()
+
+
+def test_pool_falls_back_when_empty():
+    """Test para verificar que un consumidor genera la parte que falta si el pool está vacío."""
+    buffer = SharedRingBuffer.create(capacity=64, chunk_size=16)
+    try:
+        buffer.write_chunk(b"\x01" * 16, "quantum_simulator")
+        pool = SharedEntropyPool(buffer.name, fallback=urandom_source, wait_timeout=0)
+        data, source = pool.take_with_source(20)
+        assert len(data) == 20
+        assert data[:16] == b"\x01" * 16
+        assert source == "quantum_simulator+os_urandom"
+        assert pool.stats()["misses"] == 1
+        pool.stop()
+    finally:
+        buffer.close()
+
+
+def test_producer_fills_to_high_watermark():
+    """Test para verificar que el productor llena el buffer hasta la marca alta."""
+    buffer = SharedRingBuffer.create(capacity=1024, chunk_size=64)
+    stop = threading.Event()
+    producer = threading.Thread(target=run_producer, args=(buffer, urandom_source, stop, 0.25, 0.5))
+    producer.start()
+    try:
+        deadline = time.time() + 5
+        while buffer.fill() < 512 and time.time() < deadline:
+            time.sleep(0.01)
+        assert buffer.fill() == 512
+        assert buffer.refill_rate > 0
+    finally:
+        stop.set()
+        producer.join()
+        buffer.close()
+
+
+def _consume(name, size, results):
+    pool = SharedEntropyPool(name, fallback=urandom_source, wait_timeout=5)
+    data, source = pool.take_with_source(size)
+    results.put((len(data), source))
+    pool.stop()
+
+
+def test_workers_share_one_producer():
+    """Test para verificar que varios procesos consumen del mismo pool."""
+    buffer = SharedRingBuffer.create(capacity=4096, chunk_size=256)
+    stop = threading.Event()
+    producer = threading.Thread(target=run_producer, args=(buffer, lambda n: (os.urandom(n), "producer"), stop))
+    producer.start()
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    try:
+        workers = [context.Process(target=_consume, args=(buffer.name, 1000, results)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(10)
+        assert [results.get(timeout=1) for _ in workers] == [(1000, "producer")] * 3
+        assert buffer.stats()["bytes_consumed"] == 3000
+    finally:
+        stop.set()
+        producer.join()
+        buffer.close()
+
+
+def test_stop_flag_reaches_producer_and_survives_its_death():
+    """Test para verificar que la señal de parada llega al productor y no se bloquea si este ha muerto."""
+    context = multiprocessing.get_context("spawn")
+    stop = StopFlag(context)
+    producer = context.Process(target=stop.wait, args=(30,))
+    producer.start()
+    stop.set()
+    producer.join(10)
+    assert producer.exitcode == 0
+
+    stop = StopFlag(context)
+    producer = context.Process(target=stop.wait, args=(30,))
+    producer.start()
+    producer.kill()
+    producer.join(10)
+    start = time.monotonic()
+    stop.set()
+    assert stop.is_set()
+    assert time.monotonic() - start < 1
@@ -0,0 +1,109 @@
+import asyncio
+import uuid
+
+import numpy as np
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from src import main
+from src.ledger import DrawLedger
+from src.subscriptions import FlowControl
+
+
+def test_flow_control_waits_for_credit():
+    """Test para verificar que no se envían tramas sin crédito del suscriptor."""
+
+    async def scenario():
+        flow = FlowControl(rate=1000, credits=1, max_credits=10)
+        await flow.acquire()
+        waiter = asyncio.ensure_future(flow.acquire())
+        await asyncio.sleep(0.01)
+        blocked = not waiter.done()
+        flow.grant(1)
+        await asyncio.wait_for(waiter, timeout=1)
+        return blocked, flow.stats()
+
+    blocked, stats = asyncio.run(scenario())
+    assert blocked
+    assert stats["frames"] == 2 and stats["credits"] == 0
+
+
+def test_flow_control_caps_credits_and_paces_frames():
+    """Test para verificar que el crédito tiene un máximo y que se respeta la tasa."""
+
+    async def scenario():
+        flow = FlowControl(rate=50, credits=100, max_credits=5)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await flow.acquire()
+        return flow.credits, loop.time() - start
+
+    credits, elapsed = asyncio.run(scenario())
+    assert credits == 2
+    assert elapsed >= 0.035
+
+
+def test_subscription_pushes_json_draws(client, valid_random_request):
+    """Test para verificar que la suscripción envía sorteos JSON mientras hay crédito."""
+    with client.websocket_connect("/api/v1/random/subscribe") as websocket:
+        websocket.send_json({**valid_random_request, "rate": 100, "credits": 2})
+        ack = websocket.receive_json()
+        assert ack["subscribed"] and ack["credits"] == 2
+        frames = [websocket.receive_json() for _ in range(2)]
+        websocket.send_json({"credit": 1})
+        frames.append(websocket.receive_json())
+    for frame in frames:
+        assert len(frame["numbers"]) == 5
+        assert all(1 <= number <= 100 for number in frame["numbers"])
+    assert len({frame["request_id"] for frame in frames}) == 3
+
+
+def test_subscription_binary_frames(client):
+    """Test para verificar las tramas binarias de enteros y de bytes."""
+    with client.websocket_connect("/api/v1/random/subscribe") as websocket:
+        websocket.send_json({"min_value": 0, "max_value": 1000, "count": 4, "unique": False, "format": "int64", "rate": 100})
+        websocket.receive_json()
+        frame = websocket.receive_bytes()
+        numbers = np.frombuffer(frame[16:], dtype="<i8")
+        assert len(numbers) == 4 and numbers.max() <= 1000
+        assert uuid.UUID(bytes=frame[:16]).version == 4
+
+    with client.websocket_connect("/api/v1/random/subscribe") as websocket:
+        websocket.send_json({"count": 32, "format": "bytes", "rate": 100})
+        websocket.receive_json()
+        assert len(websocket.receive_bytes()) == 32
+
+
+def test_subscription_bytes_frames_ignore_range(client):
+    """Test para verificar que las tramas de bytes no validan el rango de números."""
+    with client.websocket_connect("/api/v1/random/subscribe") as websocket:
+        websocket.send_json({"count": 1024, "format": "bytes", "credits": 1})
+        assert websocket.receive_json()["subscribed"]
+        assert len(websocket.receive_bytes()) == 1024
+    with client.websocket_connect("/api/v1/random/subscribe") as websocket:
+        websocket.send_json({"count": 0, "format": "bytes"})
+        assert "error" in websocket.receive_json()
+
+
+def test_invalid_subscription_is_closed(client, invalid_random_request):
+    """Test para verificar que una suscripción inválida se cierra con un error."""
+    with client.websocket_connect("/api/v1/random/subscribe") as websocket:
+        websocket.send_json(invalid_random_request)
+        assert "min_value" in websocket.receive_json()["error"]
+        with pytest.raises(WebSocketDisconnect) as info:
+            websocket.receive_json()
+        assert info.value.code == 1008
+
+
+def test_binary_subscription_draws_are_ledgered(client, tmp_path, monkeypatch):
+    """Test para verificar que los sorteos de tramas int64 quedan registrados en el libro."""
+    ledger = DrawLedger(str(tmp_path / "draws.ledger"))
+    monkeypatch.setattr(main, "draw_ledger", ledger)
+    with client.websocket_connect("/api/v1/random/subscribe") as websocket:
+        websocket.send_json({"min_value": 0, "max_value": 1000, "count": 3, "unique": False, "format": "int64", "credits": 1})
+        websocket.receive_json()
+        frame = websocket.receive_bytes()
+    request_id = str(uuid.UUID(bytes=frame[:16]))
+    assert ledger.get(request_id).numbers == np.frombuffer(frame[16:], dtype="<i8").tolist()
+    ledger.close()
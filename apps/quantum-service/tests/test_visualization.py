@@ -0,0 +1,83 @@
+import importlib.util
+
+import pytest
+
+from src import main
+from src.visualization import ImageCache, etag_matches
+
+HAS_MATPLOTLIB = importlib.util.find_spec("matplotlib") is not None
+
+
+@pytest.fixture
+def image_cache(monkeypatch):
+    cache = ImageCache(max_entries=4)
+    monkeypatch.setattr(main, "image_cache", cache)
+    return cache
+
+
+def test_circuit_diagram_as_text(client, image_cache):
+    """Test para verificar el diagrama del circuito en formato de texto."""
+    response = client.get("/api/v1/quantum-circuit/image/circuit", params={"width": 2, "format": "txt"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text.count("H") == 2
+    assert response.headers["ETag"]
+
+
+def test_histogram_counts_every_shot(client, image_cache):
+    """Test para verificar que el histograma incluye todos los resultados y disparos."""
+    response = client.get("/api/v1/quantum-circuit/image/histogram", params={"width": 2, "shots": 400, "format": "txt"})
+    lines = response.text.splitlines()
+    assert lines[0] == "Measurement results for 400 shots"
+    assert [line.split()[0] for line in lines[1:]] == ["00", "01", "10", "11"]
+    assert sum(int(line.split()[-1]) for line in lines[1:]) == 400
+
+
+def test_images_are_rendered_once_and_revalidated(client, image_cache):
+    """Test para verificar que las imágenes se reutilizan y que If-None-Match devuelve 304."""
+    params = {"width": 1, "shots": 100, "format": "txt"}
+    first = client.get("/api/v1/quantum-circuit/image/histogram", params=params)
+    second = client.get("/api/v1/quantum-circuit/image/histogram", params=params)
+    assert first.content == second.content
+    assert image_cache.stats()["renders"] == 1
+
+    etag = first.headers["ETag"]
+    revalidated = client.get("/api/v1/quantum-circuit/image/histogram", params=params, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+
+
+def test_image_cache_is_bounded():
+    """Test para verificar que la caché descarta las imágenes menos usadas."""
+    cache = ImageCache(max_entries=2)
+    for key in range(3):
+        cache.get(key, lambda: (b"image", "image/png"))
+    assert cache.peek(0) is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_etag_matching():
+    """Test para verificar la comparación de ETags de If-None-Match."""
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"a"')
+
+
+def test_png_requires_matplotlib(client, image_cache):
+    """Test para verificar que PNG se sirve con matplotlib y devuelve 503 sin él."""
+    response = client.get("/api/v1/quantum-circuit/image/circuit", params={"width": 1, "format": "png"})
+    if HAS_MATPLOTLIB:
+        assert response.status_code == 200
+        assert response.content.startswith(b"\x89PNG")
+    else:
+        assert response.status_code == 503
+        assert "matplotlib" in response.json()["detail"]
+
+
+def test_index_page_served_from_memory(client):
+    """Test para verificar que la página principal se sirve desde memoria."""
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.content == main.INDEX_HTML